@@ -9,8 +9,19 @@ from fastapi import FastAPI
 from fastapi.responses import FileResponse, RedirectResponse
 from starlette.middleware.cors import CORSMiddleware
 
+import app.admission as admission
+import app.archives as archives
+import app.arguments as arguments
+import app.artifacts as artifacts
 import app.authentication as auth
+import app.catalog as catalog
 import app.database as db
+import app.http_client as http_client
+import app.jobs as jobs
+import app.mirrors as mirrors
+import app.prebuild as prebuild
+import app.rendering as rendering
+import app.timing as timing
 from app import api_v1, config
 
 
@@ -24,6 +35,17 @@ def create_app(**custom_parameters) -> FastAPI:
     # Set security configuration
     auth.init_app(app)
     db.init_app(app)
+    catalog.init_app(app)
+    mirrors.init_app(app)
+    http_client.init_app(app)
+    arguments.init_app(app)
+    artifacts.init_app(app)
+    archives.init_app(app)
+    rendering.init_app(app)
+    jobs.init_app(app)
+    admission.init_app(app)
+    timing.init_app(app)
+    prebuild.init_app(app)
 
     # Mount API versions to the main app
     mount_api(api_v1, app, "/api/latest")
@@ -0,0 +1,106 @@
+"""Admission control to limit concurrent project generations.
+
+Generations are admitted while below a global and a per-user limit, the
+overflow waits in a bounded queue and requests beyond it are rejected, so
+bursts of users cannot exhaust CPU, memory or temporary disk space.
+"""
+
+import asyncio
+import collections
+import logging
+from typing import AsyncGenerator
+
+from fastapi import Depends, FastAPI, Request
+
+from app import authentication, models
+from app.config import Settings
+from app.jobs import QueueFull
+
+logger = logging.getLogger(__name__)
+
+
+def init_app(app: FastAPI) -> None:
+    """Initialize generation admission control."""
+    settings: Settings = app.state.settings
+    app.state.admission = AdmissionControl(
+        settings.admission_active,
+        settings.admission_per_user,
+        settings.admission_queue,
+        settings.admission_timeout,
+    )
+
+
+def get_admission(request: Request) -> "AdmissionControl":
+    """Return the generation admission control."""
+    return request.app.state.admission
+
+
+async def admit(
+    admission: "AdmissionControl" = Depends(get_admission),
+    current_user: models.User = Depends(authentication.get_user),
+) -> AsyncGenerator:
+    """Holds a generation slot for the user until the response is sent."""
+    owner = (current_user.subject, current_user.issuer)
+    await admission.acquire(owner)
+    try:
+        yield
+    finally:
+        await admission.release(owner)
+
+
+class AdmissionControl:
+    """Global and per-user concurrency limits with a bounded wait queue."""
+
+    def __init__(self, max_active: int, max_per_user: int, max_waiting: int, timeout: int) -> None:
+        self.max_active = max_active
+        self.max_per_user = max_per_user
+        self.max_waiting = max_waiting
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+        self._users: collections.Counter = collections.Counter()
+        self._condition = asyncio.Condition()
+
+    async def acquire(self, owner: tuple[str, str]) -> None:
+        """Wait for a free slot, raise QueueFull if the queue is full or
+        the slot is not available before the timeout.
+        """
+        async with self._condition:
+            if not self._admissible(owner):
+                if self.waiting >= self.max_waiting:
+                    self.rejected += 1
+                    raise QueueFull("Too many generation requests", retry_after=5)
+                logger.debug("Queueing generation of %s, %s waiting.", owner, self.waiting)
+                self.waiting += 1
+                try:
+                    async with asyncio.timeout(self.timeout):
+                        await self._condition.wait_for(lambda: self._admissible(owner))
+                except TimeoutError as err:
+                    self.rejected += 1
+                    raise QueueFull("Too many generation requests", retry_after=5) from err
+                finally:
+                    self.waiting -= 1
+            self.active += 1
+            self._users[owner] += 1
+
+    async def release(self, owner: tuple[str, str]) -> None:
+        """Free the slot of the owner and wake up waiting requests."""
+        async with self._condition:
+            self.active -= 1
+            self._users[owner] -= 1
+            if not self._users[owner]:
+                del self._users[owner]
+            self._condition.notify_all()
+
+    def metrics(self) -> dict:
+        """Return the current admission counters."""
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+            "users": len(self._users),
+        }
+
+    def _admissible(self, owner: tuple[str, str]) -> bool:
+        return self.active < self.max_active and self._users[owner] < self.max_per_user
@@ -8,11 +8,14 @@ Create your project from cookiecutter templates via web interface:
 """
 from fastapi import APIRouter
 
-from app.api_v1.endpoints import database, project, templates
+from app.api_v1.endpoints import artifacts, database, jobs, metrics, project, templates
 from app.api_v1.exceptions import add_exception_handlers
 
 OPENAPI_VERSION = "3.0.3"
 api_router = APIRouter()
 api_router.include_router(templates.router, prefix="/templates", tags=["templates"])
 api_router.include_router(project.router, prefix="/project", tags=["project"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
+api_router.include_router(artifacts.router, prefix="/artifacts", tags=["artifacts"])
 api_router.include_router(database.router, prefix="/db", tags=["database"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
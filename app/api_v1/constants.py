@@ -38,6 +38,12 @@ class Status422(int, Enum):
     VALUE = 422
 
 
+class Status429(int, Enum):
+    """Constant for the status code 429."""
+
+    VALUE = 429
+
+
 # Status codes for 500 errors
 class Status500(int, Enum):
     """Constant for the status code 500."""
@@ -0,0 +1,79 @@
+"""Endpoints to download generated archives by their stable id."""
+
+# pylint: disable=unused-argument,missing-module-docstring
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Response, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm.exc import NoResultFound
+
+from app import archives, artifacts, authentication, models
+from app.api_v1 import parameters, schemas
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.get(
+    summary="(User) Downloads a generated project archive.",
+    operation_id="downloadArtifact",
+    path="/{artifact_id}:download",
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Project Downloaded Successfully",
+            "content": {k: {"schema": {"type": "string", "format": "binary"}} for k in archives.MEDIA_TYPES.values()},
+        },
+        status.HTTP_206_PARTIAL_CONTENT: {
+            "description": "Project Range Downloaded Successfully",
+            "content": {k: {"schema": {"type": "string", "format": "binary"}} for k in archives.MEDIA_TYPES.values()},
+        },
+        status.HTTP_401_UNAUTHORIZED: {
+            "description": "Not authenticated",
+            "model": schemas.Unauthorized,
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Artifact Not Found",
+            "model": schemas.NotFound,
+        },
+        status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE: {
+            "description": "Range Not Satisfiable",
+        },
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "Unprocessable Content",
+            "model": schemas.Unprocessable,
+        },
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {
+            "description": "Internal Server Error",
+            "model": schemas.ServerError,
+        },
+    },
+    status_code=status.HTTP_200_OK,
+    response_class=FileResponse,
+)
+async def download_artifact(
+    *,
+    artifact_id: str = parameters.artifact_id,
+    byte_range: Optional[str] = parameters.byte_range,
+    if_range: Optional[str] = parameters.if_range,
+    current_user: models.User = Depends(authentication.get_user),
+    artifact_store: artifacts.ArtifactStore = Depends(artifacts.get_artifacts),
+) -> Response:
+    """
+    Use this method to download again a generated archive, as identified
+    by the `ETag` of its generation, while it is kept in the store.
+    Interrupted downloads can be resumed with the `Range` and `If-Range`
+    headers.
+    """
+
+    logger.info("Downloading artifact %s.", artifact_id)
+    artifact = artifact_store.get(artifact_id)
+
+    logger.debug("Checking if artifact exists.")
+    if not artifact:
+        raise NoResultFound("Artifact not found")
+    with open(artifact, "rb") as file:
+        archive_format = archives.detect(file.read(4))
+
+    logger.debug("Returning stored %s file.", archive_format.filename)
+    return artifacts.file_response(artifact, archive_format, byte_range, if_range)
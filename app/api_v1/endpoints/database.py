@@ -1,17 +1,29 @@
 """Endpoints for creating and updating local database from git repository."""
 
 # pylint: disable=unused-argument,missing-module-docstring
+import asyncio
+import hashlib
 import json
 import logging
 import pathlib
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from uuid import UUID
 
 import git
-from fastapi import APIRouter, Depends, status
+from cookiecutter.exceptions import CookiecutterException
+from fastapi import APIRouter, Depends, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import NoResultFound
+from starlette.concurrency import run_in_threadpool
 
-from app import authentication, config, database, models, notifications, utils
-from app.api_v1 import schemas
+from app import arguments, authentication, catalog, config, database, generation, mirrors, models, notifications, prebuild, timing, utils
+from app.api_v1 import parameters, schemas
+from app.archives import ArchiveFormat
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -22,6 +34,10 @@ router = APIRouter()
     operation_id="createDB",
     path=":create",
     responses={
+        status.HTTP_200_OK: {
+            "description": "Database Created and Templates Warmed Up",
+            "model": list[schemas.WarmUp],
+        },
         status.HTTP_204_NO_CONTENT: {
             "description": "Database Created Successfully",
             "model": None,
@@ -48,10 +64,19 @@ async def create_database(
     session: Session = Depends(database.get_session),
     settings: database.Settings = Depends(config.get_settings),
     notification: None = Depends(notifications.db_created),
-) -> None:
+    arguments_cache: arguments.ArgumentsCache = Depends(arguments.get_arguments),
+    template_catalog: catalog.Catalog = Depends(catalog.get_catalog),
+    services: generation.Services = Depends(generation.get_services),
+    prebuilder: prebuild.Prebuilder = Depends(prebuild.get_prebuilder),
+    warmup: bool = parameters.warmup,
+    prebuild_defaults: bool = parameters.prebuild,
+) -> Optional[Response]:
     """
     Use this method to create local copy of the database from YAML files in
-    the git repository.
+    the git repository. With `warmup`, template checkouts are prepared after
+    the sync and the timing of each one is returned. With `prebuild`, the
+    archives with default options of the allowed templates are built in
+    background.
     """
     # pylint: disable=consider-using-with
 
@@ -68,8 +93,22 @@ async def create_database(
     for path in pathlib.Path(tempdir).glob("*.json"):
         _create_template(session, path)
 
+    logger.debug("Storing parsed cookiecutter.json of templates.")
+    session.flush()
+    await _store_forms(session.query(models.Template).all(), arguments_cache, settings.fields_workers)
+
     logger.debug("Commit changes to database.")
     session.commit()
+    template_catalog.bump()
+
+    if prebuild_defaults:
+        logger.debug("Scheduling default-options archive builds.")
+        _prebuild(prebuilder, _sources(session), services)
+
+    if warmup:
+        logger.debug("Warming up template checkouts.")
+        return await _warm_up(_sources(session), services.mirrors, settings.warmup_workers)
+    return None
 
 
 @router.post(
@@ -77,6 +116,10 @@ async def create_database(
     operation_id="updateDB",
     path=":update",
     responses={
+        status.HTTP_200_OK: {
+            "description": "Database Updated and Templates Warmed Up",
+            "model": list[schemas.WarmUp],
+        },
         status.HTTP_204_NO_CONTENT: {
             "description": "Database Updated Successfully",
             "model": None,
@@ -103,10 +146,19 @@ async def update_database(
     session: Session = Depends(database.get_session),
     settings: database.Settings = Depends(config.get_settings),
     notification: None = Depends(notifications.db_updated),
-) -> None:
+    arguments_cache: arguments.ArgumentsCache = Depends(arguments.get_arguments),
+    template_catalog: catalog.Catalog = Depends(catalog.get_catalog),
+    services: generation.Services = Depends(generation.get_services),
+    prebuilder: prebuild.Prebuilder = Depends(prebuild.get_prebuilder),
+    warmup: bool = parameters.warmup,
+    prebuild_defaults: bool = parameters.prebuild,
+) -> Optional[Response]:
     """
     Use this method to update local copy of the database from YAML files in
-    the git repository.
+    the git repository. With `warmup`, template checkouts are prepared after
+    the sync and the timing of each one is returned. With `prebuild`, the
+    archives with default options of the allowed templates are built in
+    background.
     """
     # pylint: disable=consider-using-with
 
@@ -143,8 +195,212 @@ async def update_database(
     session.flush()
     session.query(models.User).filter(~models.User.scores.any()).delete()
 
+    logger.debug("Storing parsed cookiecutter.json of templates.")
+    await _store_forms(session.query(models.Template).all(), arguments_cache, settings.fields_workers)
+
     logger.debug("Commit changes to database.")
     session.commit()
+    template_catalog.bump()
+
+    if prebuild_defaults:
+        logger.debug("Scheduling default-options archive builds.")
+        _prebuild(prebuilder, _sources(session), services)
+
+    if warmup:
+        logger.debug("Warming up template checkouts.")
+        return await _warm_up(_sources(session), services.mirrors, settings.warmup_workers)
+    return None
+
+
+@router.post(
+    summary="(Admin) Purges cached cookiecutter.json files.",
+    operation_id="purgeArguments",
+    path=":purge",
+    responses={
+        status.HTTP_204_NO_CONTENT: {
+            "description": "Cache Purged Successfully",
+            "model": None,
+        },
+        status.HTTP_401_UNAUTHORIZED: {
+            "description": "Not Authenticated",
+            "model": schemas.Unauthorized,
+        },
+        status.HTTP_403_FORBIDDEN: {
+            "description": "Not Authorized",
+            "model": schemas.Forbidden,
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Template Not Found",
+            "model": schemas.NotFound,
+        },
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "Unprocessable Content",
+            "model": schemas.Unprocessable,
+        },
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {
+            "description": "Internal Server Error",
+            "model": schemas.ServerError,
+        },
+    },
+    status_code=status.HTTP_204_NO_CONTENT,
+    response_model=None,
+)
+async def purge_arguments(
+    template: Optional[UUID] = parameters.template_purge,
+    valid_secret: models.User = Depends(authentication.check_secret),
+    session: Session = Depends(database.get_session),
+    arguments_cache: arguments.ArgumentsCache = Depends(arguments.get_arguments),
+) -> None:
+    """
+    Use this method to drop the cached cookiecutter.json of a template, or
+    of all templates, so the next request downloads it again.
+    """
+
+    logger.info("Purging cached cookiecutter.json files.")
+    if template is None:
+        arguments_cache.purge()
+        return
+
+    logger.debug("Fetching template with id: %s.", template)
+    instance = session.get(models.Template, template)
+
+    logger.debug("Checking if template exists.")
+    if not instance:
+        raise NoResultFound("Template not found")
+    arguments_cache.purge(instance.gitLink, instance.gitCheckout)
+
+
+@router.post(
+    summary="(Admin) Refreshes stored template fields.",
+    operation_id="refreshFields",
+    path=":refresh",
+    responses={
+        status.HTTP_204_NO_CONTENT: {
+            "description": "Fields Refreshed Successfully",
+            "model": None,
+        },
+        status.HTTP_401_UNAUTHORIZED: {
+            "description": "Not Authenticated",
+            "model": schemas.Unauthorized,
+        },
+        status.HTTP_403_FORBIDDEN: {
+            "description": "Not Authorized",
+            "model": schemas.Forbidden,
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Template Not Found",
+            "model": schemas.NotFound,
+        },
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "Unprocessable Content",
+            "model": schemas.Unprocessable,
+        },
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {
+            "description": "Internal Server Error",
+            "model": schemas.ServerError,
+        },
+    },
+    status_code=status.HTTP_204_NO_CONTENT,
+    response_model=None,
+)
+async def refresh_fields(
+    template: Optional[UUID] = parameters.template_refresh,
+    valid_secret: models.User = Depends(authentication.check_secret),
+    session: Session = Depends(database.get_session),
+    settings: database.Settings = Depends(config.get_settings),
+    arguments_cache: arguments.ArgumentsCache = Depends(arguments.get_arguments),
+    template_catalog: catalog.Catalog = Depends(catalog.get_catalog),
+) -> None:
+    """
+    Use this method to fetch again the cookiecutter.json of a template, or
+    of all templates, and store the parsed fields served to the web form.
+    """
+
+    logger.info("Refreshing stored template fields.")
+    if template is None:
+        templates = session.query(models.Template).all()
+    else:
+        logger.debug("Fetching template with id: %s.", template)
+        templates = [x for x in [session.get(models.Template, template)] if x]
+
+        logger.debug("Checking if template exists.")
+        if not templates:
+            raise NoResultFound("Template not found")
+
+    logger.debug("Storing parsed cookiecutter.json of templates.")
+    await _store_forms(templates, arguments_cache, settings.fields_workers)
+
+    logger.debug("Commit changes to database.")
+    session.commit()
+    template_catalog.bump()
+
+
+async def _store_forms(templates: list[models.Template], arguments_cache: arguments.ArgumentsCache, workers: int) -> None:
+    semaphore = asyncio.Semaphore(workers)
+    forms = await asyncio.gather(*(_fetch_form(arguments_cache, semaphore, x.gitLink, x.gitCheckout) for x in templates))
+    for template, (fields, fields_hash) in zip(templates, forms):
+        if template.fieldsHash != fields_hash:
+            logger.debug("Storing fields of template %s.", template.repoFile)
+            template.fields, template.fieldsHash = fields, fields_hash
+
+
+async def _fetch_form(arguments_cache: arguments.ArgumentsCache, semaphore: asyncio.Semaphore, git_link: str, git_checkout: Optional[str]) -> tuple:
+    """Return the parsed CutterForm and hash of cookiecutter.json, (None, None)
+    if not available so fields are fetched when requested.
+    """
+    try:
+        async with semaphore:
+            data = await arguments_cache.fetch(git_link, git_checkout, max_age=0)
+        fields = utils.parse_fields(data)
+    except Exception as err:  # pylint: disable=broad-except
+        logger.warning("Fields of '%s' at '%s' not stored: %s", git_link, git_checkout, err)
+        return None, None
+    return fields, hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+def _sources(session: Session) -> list[generation.Source]:
+    """Return the id, repoFile, gitLink and gitCheckout of all templates."""
+    columns = models.Template.id, models.Template.repoFile, models.Template.gitLink, models.Template.gitCheckout
+    return [generation.Source(*x) for x in session.query(*columns)]
+
+
+async def _warm_up(sources: list[generation.Source], mirror_cache: mirrors.MirrorCache, workers: int) -> Response:
+    """Prepare the template checkouts and return the timing of each one."""
+    results = await run_in_threadpool(_warm_up_templates, sources, mirror_cache, workers)
+    return JSONResponse(jsonable_encoder(results), status_code=status.HTTP_200_OK)
+
+
+def _warm_up_templates(sources: list[generation.Source], mirror_cache: mirrors.MirrorCache, workers: int) -> list[schemas.WarmUp]:
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="warmup") as executor:
+        return list(executor.map(lambda x: _warm_up_template(mirror_cache, *x), sources))
+
+
+def _warm_up_template(mirror_cache: mirrors.MirrorCache, uuid, repo_file, git_link, git_checkout) -> schemas.WarmUp:
+    start, error = time.perf_counter(), None
+    try:
+        with mirror_cache.checkout(git_link, git_checkout) as checkout:
+            utils.load_arguments(checkout.path)
+    except CookiecutterException as err:
+        error = err.args[0]
+    except Exception as err:  # pylint: disable=broad-except
+        error = f"{err}"
+    if error:
+        logger.warning("Warm up of template %s failed: %s", repo_file, error)
+    seconds = time.perf_counter() - start
+    return schemas.WarmUp(id=uuid, repoFile=repo_file, seconds=seconds, error=error)
+
+
+def _prebuild(prebuilder: prebuild.Prebuilder, sources: list[generation.Source], services: generation.Services) -> None:
+    """Schedule the default-options archive builds, not observed in the
+    latencies of the user generations.
+    """
+    latencies = timing.UntrackedLatencies()
+    prebuilder.submit(sources, lambda x: _prebuild_template(x, services, latencies))
+
+
+def _prebuild_template(source, services: generation.Services, latencies: timing.Latencies) -> None:
+    archive = ArchiveFormat.ZIP, None  # Same as generations without format
+    generation.build_project(source, {"": {}}, archive, services, latencies)
 
 
 def _create_template(session: Session, repo_file: pathlib.Path) -> None:
@@ -0,0 +1,138 @@
+"""Endpoints to follow and download project generation jobs."""
+
+# pylint: disable=unused-argument,missing-module-docstring
+import logging
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Response, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm.exc import NoResultFound
+
+from app import archives, artifacts, authentication, jobs, models
+from app.api_v1 import parameters, schemas
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.get(
+    summary="(User) Downloads the project generated by a job.",
+    operation_id="downloadJob",
+    path="/{uuid}:download",
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Project Downloaded Successfully",
+            "content": {k: {"schema": {"type": "string", "format": "binary"}} for k in archives.MEDIA_TYPES.values()},
+        },
+        status.HTTP_206_PARTIAL_CONTENT: {
+            "description": "Project Range Downloaded Successfully",
+            "content": {k: {"schema": {"type": "string", "format": "binary"}} for k in archives.MEDIA_TYPES.values()},
+        },
+        status.HTTP_401_UNAUTHORIZED: {
+            "description": "Not authenticated",
+            "model": schemas.Unauthorized,
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Job or Result Not Found",
+            "model": schemas.NotFound,
+        },
+        status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE: {
+            "description": "Range Not Satisfiable",
+        },
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "Unprocessable Content",
+            "model": schemas.Unprocessable,
+        },
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {
+            "description": "Internal Server Error",
+            "model": schemas.ServerError,
+        },
+    },
+    status_code=status.HTTP_200_OK,
+    response_class=FileResponse,
+)
+async def download_job(
+    *,
+    uuid: UUID = parameters.job_uuid,
+    byte_range: Optional[str] = parameters.byte_range,
+    if_range: Optional[str] = parameters.if_range,
+    current_user: models.User = Depends(authentication.get_user),
+    job_queue: jobs.JobQueue = Depends(jobs.get_jobs),
+    artifact_store: artifacts.ArtifactStore = Depends(artifacts.get_artifacts),
+) -> Response:
+    """
+    Use this method to download the archive generated by a finished job
+    until the job expires. Interrupted downloads can be resumed with the
+    `Range` and `If-Range` headers.
+    """
+
+    logger.info("Downloading project generated by job %s.", uuid)
+    job = _get_job(job_queue, uuid, current_user)
+
+    logger.debug("Checking if job result is available.")
+    if job.status != jobs.JobStatus.DONE:
+        raise NoResultFound("Job result not available")
+    artifact_key, archive_format = job.result
+    artifact = artifact_store.get(artifact_key)
+    if not artifact:
+        raise NoResultFound("Job result expired")
+
+    logger.debug("Returning stored %s file.", archive_format.filename)
+    return artifacts.file_response(artifact, archive_format, byte_range, if_range)
+
+
+@router.get(
+    summary="(User) Shows the status of a project generation job.",
+    operation_id="getJob",
+    path="/{uuid}",
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Job Retrieved Successfully",
+            "model": schemas.Job,
+        },
+        status.HTTP_401_UNAUTHORIZED: {
+            "description": "Not authenticated",
+            "model": schemas.Unauthorized,
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Job Not Found",
+            "model": schemas.NotFound,
+        },
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "Unprocessable Content",
+            "model": schemas.Unprocessable,
+        },
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {
+            "description": "Internal Server Error",
+            "model": schemas.ServerError,
+        },
+    },
+    status_code=status.HTTP_200_OK,
+    response_model=schemas.Job,
+)
+async def get_job(
+    *,
+    uuid: UUID = parameters.job_uuid,
+    current_user: models.User = Depends(authentication.get_user),
+    job_queue: jobs.JobQueue = Depends(jobs.get_jobs),
+) -> schemas.Job:
+    """
+    Use this method to retrieve the status and timings of a generation job.
+    """
+
+    logger.info("Getting job %s.", uuid)
+    job = _get_job(job_queue, uuid, current_user)
+
+    logger.debug("Returning job.")
+    return job
+
+
+def _get_job(job_queue: jobs.JobQueue, uuid: UUID, current_user: models.User) -> jobs.Job:
+    logger.debug("Fetching job with id: %s.", uuid)
+    job = job_queue.get(uuid)
+
+    logger.debug("Checking if job exists and belongs to user.")
+    if not job or job.owner != (current_user.subject, current_user.issuer):
+        raise NoResultFound("Job not found")
+    return job
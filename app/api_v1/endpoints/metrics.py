@@ -0,0 +1,109 @@
+"""Endpoints to monitor the application load and caches."""
+
+# pylint: disable=unused-argument,missing-module-docstring
+import logging
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, status
+
+from app import admission, arguments, authentication, http_client, jobs, mirrors, prebuild, rendering, timing
+from app.api_v1 import parameters, schemas
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.get(
+    summary="(Admin) Shows the application metrics.",
+    operation_id="getMetrics",
+    path="",
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Metrics Retrieved Successfully",
+            "model": schemas.Metrics,
+        },
+        status.HTTP_401_UNAUTHORIZED: {
+            "description": "Not Authenticated",
+            "model": schemas.Unauthorized,
+        },
+        status.HTTP_403_FORBIDDEN: {
+            "description": "Not Authorized",
+            "model": schemas.Forbidden,
+        },
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {
+            "description": "Internal Server Error",
+            "model": schemas.ServerError,
+        },
+    },
+    status_code=status.HTTP_200_OK,
+    response_model=schemas.Metrics,
+)
+async def get_metrics(
+    valid_secret: None = Depends(authentication.check_secret),
+    admission_control: admission.AdmissionControl = Depends(admission.get_admission),
+    arguments_cache: arguments.ArgumentsCache = Depends(arguments.get_arguments),
+    outbound: http_client.HttpClient = Depends(http_client.get_http_client),
+    job_queue: jobs.JobQueue = Depends(jobs.get_jobs),
+    mirror_cache: mirrors.MirrorCache = Depends(mirrors.get_mirrors),
+    prebuilder: prebuild.Prebuilder = Depends(prebuild.get_prebuilder),
+    renderer: rendering.Renderer = Depends(rendering.get_renderer),
+) -> schemas.Metrics:
+    """
+    Use this method to retrieve the generation load, queue depths, cache
+    hit rates, template repository fetches and archive prebuilds.
+    """
+
+    logger.info("Getting application metrics.")
+    return {
+        "admission": admission_control.metrics(),
+        "arguments": arguments_cache.metrics(),
+        "http": outbound.metrics(),
+        "jobs": job_queue.metrics(),
+        "mirrors": mirror_cache.metrics(),
+        "prebuild": prebuilder.metrics(),
+        "rendering": renderer.metrics(),
+    }
+
+
+@router.get(
+    summary="(Admin) Shows the generation latency histograms.",
+    operation_id="getLatency",
+    path="/latency",
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Latency Histograms Retrieved Successfully",
+            "model": list[schemas.LatencyHistogram],
+        },
+        status.HTTP_401_UNAUTHORIZED: {
+            "description": "Not Authenticated",
+            "model": schemas.Unauthorized,
+        },
+        status.HTTP_403_FORBIDDEN: {
+            "description": "Not Authorized",
+            "model": schemas.Forbidden,
+        },
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "Unprocessable Content",
+            "model": schemas.Unprocessable,
+        },
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {
+            "description": "Internal Server Error",
+            "model": schemas.ServerError,
+        },
+    },
+    status_code=status.HTTP_200_OK,
+    response_model=list[schemas.LatencyHistogram],
+)
+async def get_latency(
+    template: Optional[UUID] = parameters.template_filter,
+    valid_secret: None = Depends(authentication.check_secret),
+    latencies: timing.Latencies = Depends(timing.get_latencies),
+) -> list[schemas.LatencyHistogram]:
+    """
+    Use this method to retrieve the latency histograms of each generation
+    phase per template, as cumulative counts per bucket in milliseconds.
+    """
+
+    logger.info("Getting generation latency histograms.")
+    return latencies.snapshot(f"{template}" if template else None)
@@ -1,24 +1,31 @@
 """Endpoints for the project generation from the cookiecutter template."""
 
 # pylint: disable=unused-argument,missing-module-docstring
+import asyncio
 import logging
-import shutil
 import tempfile
+from typing import Optional
 from uuid import UUID
 
-from cookiecutter.main import cookiecutter
-from fastapi import APIRouter, Body, Depends, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Body, Depends, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.exc import NoResultFound
 
-from app import authentication, database, models, utils
+from app import admission, archives, arguments, artifacts, authentication, catalog, config, database, generation, jobs, models, timing, utils
 from app.api_v1 import parameters, schemas
 from app.api_v1.schemas import Input
+from app.archives import ArchiveFormat
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+#: Maximum number of project variants generated in a single batch
+MAX_VARIANTS = 50
+
+#: Maximum number of templates in a single fields request
+MAX_TEMPLATES = 100
+
 
 @router.get(
     summary="(Public) Fetches fields of the cookiecutter template.",
@@ -29,6 +36,9 @@ router = APIRouter()
             "description": "Fields Fetched Successfully",
             "model": schemas.CutterForm,
         },
+        status.HTTP_304_NOT_MODIFIED: {
+            "description": "Catalog Not Modified",
+        },
         status.HTTP_404_NOT_FOUND: {
             "description": "Template Not Found",
             "model": schemas.NotFound,
@@ -51,15 +61,25 @@ router = APIRouter()
 )
 async def fetch_fields(
     *,
+    response: Response,
     session: Session = Depends(database.get_session),
     uuid: UUID = parameters.template_uuid,
+    if_none_match: Optional[str] = parameters.if_none_match,
+    arguments_cache: arguments.ArgumentsCache = Depends(arguments.get_arguments),
+    template_catalog: catalog.Catalog = Depends(catalog.get_catalog),
 ) -> list[dict]:
     """
     Use this method to fetch fields of the cookiecutter template to build the
-    web form.
+    web form. Fields are stored when the database is synced, templates not
+    stored are fetched from the repository.
     """
 
     logger.info("Fetching fields of the cookiecutter template.")
+    logger.debug("Checking if the catalog changed since the cached response.")
+    headers = template_catalog.headers()
+    if catalog.not_modified(headers["ETag"], if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
     logger.debug("Fetching template with id: %s.", uuid)
     template = session.get(models.Template, uuid)
 
@@ -67,11 +87,61 @@ async def fetch_fields(
     if not template:
         raise NoResultFound("Template not found")
 
-    logger.debug("Fetching cookiecutter.json file.")
-    data = utils.fetch_arguments(template)
+    logger.debug("Caching only fields stored, fetched ones may change.")
+    if template.fields is not None:
+        response.headers.update(headers)
 
-    logger.debug("Returning CutterForm dict from json")
-    return utils.parse_fields(data)
+    logger.debug("Returning CutterForm dict of the template.")
+    return await _fields(template, arguments_cache)
+
+
+@router.post(
+    summary="(Public) Fetches fields of several cookiecutter templates.",
+    operation_id="fetchFieldsBulk",
+    path=":fields",
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Fields Fetched Successfully",
+            "model": schemas.FieldsMap,
+        },
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "Unprocessable Content",
+            "model": schemas.Unprocessable,
+        },
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {
+            "description": "Internal Server Error",
+            "model": schemas.ServerError,
+        },
+    },
+    status_code=status.HTTP_200_OK,
+    response_model=schemas.FieldsMap,
+)
+async def fetch_fields_bulk(
+    *,
+    session: Session = Depends(database.get_session),
+    uuids: list[UUID] = Body(min_length=1, max_length=MAX_TEMPLATES),
+    settings: config.Settings = Depends(config.get_settings),
+    arguments_cache: arguments.ArgumentsCache = Depends(arguments.get_arguments),
+) -> dict:
+    """
+    Use this method to fetch fields of a list of cookiecutter templates. The
+    response maps each UUID to the fields of the template, or to the error
+    details when the template is not found or its fields are not available.
+    """
+
+    logger.info("Fetching fields of %s cookiecutter templates.", len(uuids))
+    logger.debug("Fetching templates with ids: %s.", uuids)
+    uuids = list(dict.fromkeys(uuids))  # Remove duplicates keeping order
+    templates = {x.id: x for x in session.query(models.Template).filter(models.Template.id.in_(uuids))}
+
+    logger.debug("Fetching fields of found templates concurrently.")
+    semaphore = asyncio.Semaphore(settings.fields_workers)
+    found = [x for x in uuids if x in templates]
+    forms = await asyncio.gather(*(_bulk_fields(templates[x], arguments_cache, semaphore) for x in found))
+
+    logger.debug("Returning CutterForm or error details for each template.")
+    not_found = {"type": "not_found", "loc": ["body", "uuids"], "msg": "Template not found"}
+    return {x: not_found for x in uuids} | dict(zip(found, forms))
 
 
 @router.post(
@@ -81,7 +151,7 @@ async def fetch_fields(
     responses={
         status.HTTP_200_OK: {
             "description": "Project Generated Successfully",
-            "content": {"application/zip": {"schema": {"type": "string", "format": "binary"}}},
+            "content": {k: {"schema": {"type": "string", "format": "binary"}} for k in archives.MEDIA_TYPES.values()},
         },
         status.HTTP_401_UNAUTHORIZED: {
             "description": "Not authenticated",
@@ -95,57 +165,241 @@ async def fetch_fields(
             "description": "Unprocessable Content",
             "model": schemas.Unprocessable,
         },
+        status.HTTP_429_TOO_MANY_REQUESTS: {
+            "description": "Too Many Requests",
+            "model": schemas.TooManyRequests,
+        },
         status.HTTP_500_INTERNAL_SERVER_ERROR: {
             "description": "Internal Server Error",
             "model": schemas.ServerError,
         },
     },
     status_code=status.HTTP_200_OK,
-    response_class=FileResponse,
+    response_class=StreamingResponse,
 )
-async def generate_project(
+def generate_project(
     *,
     session: Session = Depends(database.get_session),
     tempdir: tempfile.TemporaryDirectory = Depends(utils.temp_folder),
     uuid: UUID = parameters.template_uuid,
     options_in: dict[str, Input] = Body(),
+    archive_format: Optional[ArchiveFormat] = parameters.archive_format,
+    compression_level: Optional[int] = parameters.compression_level,
+    accept: Optional[str] = parameters.accept,
     current_user: models.User = Depends(authentication.get_user),
-) -> FileResponse:
+    admission_slot: None = Depends(admission.admit),
+    services: generation.Services = Depends(generation.get_services),
+    timer: timing.Timer = Depends(timing.get_timer),
+    latencies: timing.Latencies = Depends(timing.get_latencies),
+) -> Response:
     """
     Use this method to generate software project using the specific template.
-    Generated project is returned as `.zip` file.
+    Generated project is returned as `.zip` file or the archive format
+    requested, identical requests for the same template revision return the
+    same file and `ETag`.
     """
+    # Not async, so mirror and render waits run in the threadpool, not the event loop
 
     logger.info("Generating software project from the template.")
     logger.debug("Fetching template with id: %s.", uuid)
+    with timer.phase("template"):
+        template = session.get(models.Template, uuid)
+
+    logger.debug("Checking if template exists.")
+    if not template:
+        raise NoResultFound("Template not found")
+
+    logger.debug("Rendering project unless previously generated.")
+    variants, archive = {"": options_in}, (archives.negotiate(archive_format, accept), compression_level)
+    artifact_key, artifact, entries = generation.render(template, variants, archive, f"{tempdir}/project", services, timer)
+    return _response(template, services, artifact_key, artifact, entries, archive, timer, latencies)
+
+
+@router.post(
+    summary="(User) Generate several software project variants from the template.",
+    operation_id="generateProjects",
+    path="/{uuid}:batch",
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Projects Generated Successfully",
+            "content": {k: {"schema": {"type": "string", "format": "binary"}} for k in archives.MEDIA_TYPES.values()},
+        },
+        status.HTTP_401_UNAUTHORIZED: {
+            "description": "Not authenticated",
+            "model": schemas.Unauthorized,
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Template Not Found",
+            "model": schemas.NotFound,
+        },
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "Unprocessable Content",
+            "model": schemas.Unprocessable,
+        },
+        status.HTTP_429_TOO_MANY_REQUESTS: {
+            "description": "Too Many Requests",
+            "model": schemas.TooManyRequests,
+        },
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {
+            "description": "Internal Server Error",
+            "model": schemas.ServerError,
+        },
+    },
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+)
+def generate_projects(
+    *,
+    session: Session = Depends(database.get_session),
+    tempdir: tempfile.TemporaryDirectory = Depends(utils.temp_folder),
+    uuid: UUID = parameters.template_uuid,
+    options_list: list[dict[str, Input]] = Body(min_length=1, max_length=MAX_VARIANTS),
+    archive_format: Optional[ArchiveFormat] = parameters.archive_format,
+    compression_level: Optional[int] = parameters.compression_level,
+    accept: Optional[str] = parameters.accept,
+    current_user: models.User = Depends(authentication.get_user),
+    admission_slot: None = Depends(admission.admit),
+    services: generation.Services = Depends(generation.get_services),
+    timer: timing.Timer = Depends(timing.get_timer),
+    latencies: timing.Latencies = Depends(timing.get_latencies),
+) -> Response:
+    """
+    Use this method to generate one software project for each set of options
+    using the specific template. Generated projects are returned in a single
+    `.zip` file, or the archive format requested, with one `variant_<n>`
+    folder per set of options.
+    """
+
+    logger.info("Generating software project variants from the template.")
+    logger.debug("Fetching template with id: %s.", uuid)
+    with timer.phase("template"):
+        template = session.get(models.Template, uuid)
+
+    logger.debug("Checking if template exists.")
+    if not template:
+        raise NoResultFound("Template not found")
+
+    logger.debug("Rendering project variants unless previously generated.")
+    variants = {f"variant_{i}": options_in for i, options_in in enumerate(options_list, start=1)}
+    archive = (archives.negotiate(archive_format, accept), compression_level)
+    artifact_key, artifact, entries = generation.render(template, variants, archive, f"{tempdir}/project", services, timer)
+    return _response(template, services, artifact_key, artifact, entries, archive, timer, latencies)
+
+
+@router.post(
+    summary="(User) Submits a job to generate software project from the template.",
+    operation_id="submitProject",
+    path="/{uuid}:submit",
+    responses={
+        status.HTTP_202_ACCEPTED: {
+            "description": "Project Generation Submitted",
+            "model": schemas.Job,
+        },
+        status.HTTP_401_UNAUTHORIZED: {
+            "description": "Not authenticated",
+            "model": schemas.Unauthorized,
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Template Not Found",
+            "model": schemas.NotFound,
+        },
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "Unprocessable Content",
+            "model": schemas.Unprocessable,
+        },
+        status.HTTP_429_TOO_MANY_REQUESTS: {
+            "description": "Too Many Requests",
+            "model": schemas.TooManyRequests,
+        },
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {
+            "description": "Internal Server Error",
+            "model": schemas.ServerError,
+        },
+    },
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=schemas.Job,
+)
+async def submit_project(
+    *,
+    response: Response,
+    session: Session = Depends(database.get_session),
+    uuid: UUID = parameters.template_uuid,
+    options_in: dict[str, Input] = Body(),
+    archive_format: Optional[ArchiveFormat] = parameters.archive_format,
+    compression_level: Optional[int] = parameters.compression_level,
+    current_user: models.User = Depends(authentication.get_user),
+    services: generation.Services = Depends(generation.get_services),
+    latencies: timing.Latencies = Depends(timing.get_latencies),
+    job_queue: jobs.JobQueue = Depends(jobs.get_jobs),
+) -> schemas.Job:
+    """
+    Use this method to generate software project using the specific template
+    in background. Poll the returned job and download the `.zip` file, or
+    the archive format requested, when the job is done.
+    """
+
+    logger.info("Submitting software project generation job.")
+    logger.debug("Fetching template with id: %s.", uuid)
     template = session.get(models.Template, uuid)
 
     logger.debug("Checking if template exists.")
     if not template:
         raise NoResultFound("Template not found")
 
-    logger.debug("Parse boolean fields into cookiecutter format.")
-    data = utils.fetch_arguments(template)
-    bool_fields = [k for k, v in data.items() if isinstance(v, bool)]
-    for key in filter(lambda k: k in options_in, bool_fields):
-        options_in[key] = utils.str2bool(options_in[key])
-
-    logger.debug("Generating project into memory zip.")
-    cookiecutter(
-        template=template.gitLink,
-        checkout=template.gitCheckout,
-        no_input=True,
-        extra_context=options_in,
-        output_dir=f"{tempdir}/project",
-    )
+    logger.debug("Submitting job with template detached from session.")
+    source = generation.Source(template.id, template.repoFile, template.gitLink, template.gitCheckout)
+    owner = (current_user.subject, current_user.issuer)
+    archive = (archive_format or ArchiveFormat.ZIP, compression_level)
+    job = job_queue.submit(owner, generation.build_project, source, {"": options_in}, archive, services, latencies, job_queue.ttl)
+
+    logger.debug("Returning job.")
+    response.headers["Location"] = f"/api/v1/jobs/{job.id}"
+    return job
 
-    logger.debug("Creating zip file from project folder.")
-    shutil.make_archive(f"{tempdir}/project", "zip", f"{tempdir}/project", logger=logger)
 
-    logger.debug("Returning cookiecutter.json file.")
-    return FileResponse(
-        f"{tempdir}/project.zip",
-        media_type="application/zip",
-        filename="project.zip",
-        headers={"Access-Control-Expose-Headers": "Content-Disposition"},
+async def _fields(template, arguments_cache) -> list[dict]:
+    """Return the fields stored at database sync if available, else the
+    parsed cookiecutter.json fetched from the repository.
+    """
+    if template.fields is not None:
+        return template.fields
+    logger.debug("Fetching cookiecutter.json file of %s.", template.id)
+    data = await arguments_cache.fetch(template.gitLink, template.gitCheckout)
+    return utils.parse_fields(data)
+
+
+async def _bulk_fields(template, arguments_cache, semaphore) -> list[dict] | dict:
+    """Return the fields of a template, or the error details as returned by
+    the exception handlers when they cannot be fetched or parsed.
+    """
+    try:
+        async with semaphore:
+            return await _fields(template, arguments_cache)
+    except NotImplementedError as err:
+        logger.debug("Not implemented error: %s", err)
+        return {"type": "not_implemented", "loc": ["gitLink", "gitCheckout", "cookiecutter.json"], "msg": err.args[0]}
+    except Exception as err:  # pylint: disable=broad-except
+        logger.error("Fields of template %s not available: %s", template.id, err)
+        return {"type": "server_error", "loc": ["server"], "msg": "Internal Server Error"}
+
+
+def _response(template, services, artifact_key, artifact, entries, archive, timer, latencies) -> Response:
+    archive_format, level = archive
+    if artifact:
+        logger.debug("Returning stored %s file.", archive_format.filename)
+        response = artifacts.file_response(artifact, archive_format)
+        response.headers["Server-Timing"] = timer.header()
+        latencies.observe(f"{template.id}", timer)
+        return response
+
+    logger.debug("Streaming %s file from rendered project into store.", archive_format.filename)
+    chunks = timer.timed("archive", archives.stream(entries, archive_format, level, services.deflater))
+    return StreamingResponse(
+        latencies.track(f"{template.id}", timer, services.artifacts.store(artifact_key, chunks)),
+        media_type=archive_format.media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{archive_format.filename}"',
+            "Server-Timing": timer.header(),  # Archive is timed while streaming, only logged
+            **artifacts.headers(artifact_key),
+        },
     )
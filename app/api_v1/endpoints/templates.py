@@ -1,18 +1,19 @@
 """Endpoints to explore and score templates."""
 
 # pylint: disable=unused-argument,missing-module-docstring
+import itertools
 import logging
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-import sqlalchemy as sa
-from fastapi import APIRouter, Body, Depends, Response, status
+from fastapi import APIRouter, Body, Depends, Request, Response, status
+from fastapi.exceptions import RequestValidationError
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.exc import NoResultFound
 
-from app import authentication, database, models, utils
+from app import authentication, catalog, database, models, utils
 from app.api_v1 import parameters, schemas
-from app.api_v1.schemas import Score, SortBy
+from app.api_v1.schemas import Cursor, Keyword, Score, SortBy
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -27,6 +28,9 @@ router = APIRouter()
             "description": "Templates Retrieved Successfully",
             "model": schemas.Templates,
         },
+        status.HTTP_304_NOT_MODIFIED: {
+            "description": "Catalog Not Modified",
+        },
         status.HTTP_422_UNPROCESSABLE_ENTITY: {
             "description": "Unprocessable Content",
             "model": schemas.Unprocessable,
@@ -40,44 +44,51 @@ router = APIRouter()
     response_model=schemas.Templates,
 )
 async def list_templates(
+    request: Request,
+    response: Response,
     session: Session = Depends(database.get_session),
     tags: List[str] = parameters.tags,
-    keywords: List[str] = parameters.keywords,
+    keywords: List[Keyword] = parameters.keywords,
     sort_by: SortBy = parameters.sort_by,
+    limit: Optional[int] = parameters.limit,
+    next_cursor: Optional[Cursor] = parameters.next_cursor,
+    if_none_match: Optional[str] = parameters.if_none_match,
+    template_catalog: catalog.Catalog = Depends(catalog.get_catalog),
 ) -> schemas.Templates:
     """
     Use this method to get a list of available templates. The response
-    returns a pagination object with the templates.
+    returns a pagination object with the templates. When `limit` is set and
+    more templates are available, the `Link` header of the response has the
+    URL of the next page.
     """
 
     logger.info("Listing templates with score average.")
-    search = session.query(models.Template)
-
-    logger.debug("Filtering templates by tags: %s.", tags)
-    if tags:  # Tags are case insensitive (always lower)
-        search = search.join(models.Template.tag_associations).join(models.TagAssociation.tag)
-        search = search.filter(models.Tag.name.in_(set(t.lower() for t in tags)))
-        search = search.group_by(models.Template.id)
-        search = search.having(sa.func.count(models.Tag.id) == len(set(tags)))  # pylint: disable=E1102
-
-    logger.debug("Filtering templates by keywords: %s.", keywords)
-    for keyword in keywords:  # Search must include at least each keyword in one field
-        search = search.filter(
-            sa.or_(  # Keyword can be in title or summary
-                sa.func.lower(models.Template.summary).contains(keyword.lower()),
-                sa.func.lower(models.Template.title).contains(keyword.lower()),
-            )
-        )
-
-    logger.debug("Sorting templates by: %s.", sort_by)
-    for sort in sort_by.split(","):
-        if sort[0] == "-":
-            search = search.order_by(sa.nullslast(sa.desc(sort[1:])))
-        else:
-            search = search.order_by(sa.nullslast(sa.asc(sort[1:])))
-
-    logger.debug("Returning templates.")
-    return search.all()
+    logger.debug("Checking if the catalog changed since the cached response.")
+    version = template_catalog.version()
+    headers = template_catalog.headers(version)
+    if catalog.not_modified(headers["ETag"], if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+
+    logger.debug("Reading cursor of the page: %s.", next_cursor)
+    cursor_sort, cursor = utils.decode_cursor(next_cursor) if next_cursor else (sort_by, None)
+    if cursor_sort != sort_by:
+        raise RequestValidationError([_cursor_error("Cursor of a different sort_by.", next_cursor)])
+
+    logger.debug("Filtering templates by tags %s and keywords %s.", tags, keywords)
+    snapshot = template_catalog.snapshot(session, version)
+    # Tags are case insensitive, keywords match words in title or summary
+    results = snapshot.search(session, tags, keywords, utils.sort_keys(sort_by), cursor)
+
+    logger.debug("Returning templates sorted by: %s.", sort_by)
+    if not limit:
+        return [record for record, _ in results]
+    page = list(itertools.islice(results, limit + 1))
+    if len(page) > limit:
+        next_url = request.url.include_query_params(next=utils.encode_cursor(sort_by, page[limit - 1][1]))
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+        response.headers["Access-Control-Expose-Headers"] = "ETag, Link"
+    return [record for record, _ in page[:limit]]
 
 
 @router.get(
@@ -89,6 +100,9 @@ async def list_templates(
             "description": "Template Retrieved Successfully",
             "model": schemas.Template,
         },
+        status.HTTP_304_NOT_MODIFIED: {
+            "description": "Catalog Not Modified",
+        },
         status.HTTP_404_NOT_FOUND: {
             "description": "Template Not Found",
             "model": schemas.NotFound,
@@ -106,22 +120,32 @@ async def list_templates(
     response_model=schemas.Template,
 )
 async def get_template(
+    response: Response,
     uuid: UUID = parameters.template_uuid,
     session: Session = Depends(database.get_session),
+    if_none_match: Optional[str] = parameters.if_none_match,
+    template_catalog: catalog.Catalog = Depends(catalog.get_catalog),
 ) -> schemas.Template:
     """
     Use this method to retrieve details about the specific template.
     """
 
     logger.info("Getting template %s.", uuid)
+    logger.debug("Checking if the catalog changed since the cached response.")
+    version = template_catalog.version()
+    headers = template_catalog.headers(version)
+    if catalog.not_modified(headers["ETag"], if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
     logger.debug("Fetching template with id: %s.", uuid)
-    template = session.get(models.Template, uuid)
+    template = template_catalog.snapshot(session, version).by_id.get(uuid)
 
     logger.debug("Checking if template exists")
     if not template:
         raise NoResultFound("Template not found")
 
     logger.debug("Returning template")
+    response.headers.update(headers)
     return template
 
 
@@ -160,6 +184,7 @@ async def rate_template(
     score: Score = Body(),
     current_user: models.User = Depends(authentication.get_user),
     session: Session = Depends(database.get_session),
+    template_catalog: catalog.Catalog = Depends(catalog.get_catalog),
 ) -> schemas.Template:
     """
     Use this method to update the score/rating of the specific template.
@@ -194,7 +219,13 @@ async def rate_template(
 
     logger.debug("Commit changes to database.")
     session.commit()
+    template_catalog.rescore(template.id, template.score)
 
     logger.debug("Returning template.")
     response.headers["Location"] = f"/api/v1/templates/{template.id}"
     return template
+
+
+def _cursor_error(msg: str, cursor: str) -> dict:
+    """Return the validation error details of a cursor."""
+    return {"type": "value_error", "loc": ("query", "next"), "msg": msg, "input": cursor}
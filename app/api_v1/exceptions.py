@@ -8,6 +8,8 @@ from flaat.exceptions import FlaatForbidden, FlaatUnauthenticated
 from sqlalchemy.orm.exc import NoResultFound
 from cookiecutter.exceptions import CookiecutterException
 
+from app.jobs import QueueFull
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,13 +38,24 @@ async def forbidden(request: Request, exc: FlaatForbidden):
 async def not_found(request: Request, exc: NoResultFound):
     """Handle not found exceptions."""
     logger.debug("Template %s not found: %s", request.path_params, exc)
-    info = {"type": "not_found", "loc": ["path", "uuid"], "msg": exc.args[0]}
+    info = {"type": "not_found", "loc": ["path", next(iter(request.path_params), "uuid")], "msg": exc.args[0]}
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
         detail=[info],
     )
 
 
+async def too_many_requests(request: Request, exc: QueueFull):
+    """Handle queue full exceptions."""
+    logger.warning("Queue full: %s", exc)
+    info = {"type": "too_many_requests", "loc": ["server"], "msg": exc.args[0]}
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        headers={"Retry-After": f"{exc.retry_after}"},
+        detail=[info],
+    )
+
+
 async def server_error(request: Request, exc: Exception):
     """Handle server error exceptions (default exceptions)."""
     if isinstance(exc, HTTPException):  # Catch only not defined exceptions
@@ -77,5 +90,6 @@ def add_exception_handlers(api: FastAPI):
     api.add_exception_handler(FlaatUnauthenticated, unauthorized)
     api.add_exception_handler(FlaatForbidden, forbidden)
     api.add_exception_handler(NoResultFound, not_found)
+    api.add_exception_handler(QueueFull, too_many_requests)
     api.add_exception_handler(Exception, server_error)
     api.add_exception_handler(NotImplementedError, not_implemented)
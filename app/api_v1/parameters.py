@@ -1,7 +1,7 @@
 """Parameters for the API endpoints."""
 
 # pylint: disable=missing-module-docstring
-from fastapi import Query, Path
+from fastapi import Header, Query, Path
 
 #: Query parameter for the tags filter
 tags = Query(
@@ -15,7 +15,12 @@ tags = Query(
 #: Query parameter for the list of keywords
 keywords = Query(
     title="Keywords",
-    description="List of keywords (string subsets).",
+    description=(
+        "List of keywords to find in the title or summary, templates should include all keywords. "
+        "The words of a keyword match whole words in sequence, except the last one that also matches words starting with it. "
+        "Text inside a word does not match, e.g. 'templ' finds 'template' but 'plate' does not. "
+        "Keywords without letters or digits are not valid."
+    ),
     default=[],
     json_schema_extra={"type": "array", "items": {"type": "string"}},
 )
@@ -24,14 +29,142 @@ keywords = Query(
 #: Query parameter for the sort order
 sort_by = Query(
     title="Sort by",
-    description="Order to return the results (comma separated). Generic fields are ['±id', '±score', '±title'].",
+    description="Order to return the results (comma separated). Generic fields are ['±id', '±relevance', '±score', '±title'].",
     default="-score",
     json_schema_extra={"type": "string", "example": "+title,-score"},
 )
 
 
+#: Query parameter for the page size
+limit = Query(
+    title="Limit",
+    description="Maximum number of templates to return, all if not set.",
+    default=None,
+    ge=1,
+    le=100,
+)
+
+
+#: Query parameter for the page cursor
+next_cursor = Query(
+    title="Next",
+    description="Cursor of the page to return, as sent on the `Link` header of the previous page.",
+    alias="next",
+    default=None,
+)
+
+
 #: Query parameter for the template UUID
 template_uuid = Path(
     title="Template UUID",
     description="UUID of the template to be used for generating a new software project.",
 )
+
+
+#: Path parameter for the job UUID
+job_uuid = Path(
+    title="Job UUID",
+    description="UUID of the job generating a new software project.",
+)
+
+
+#: Path parameter for the generated artifact id
+artifact_id = Path(
+    title="Artifact ID",
+    description="Stable id of a generated archive, as returned on the `ETag` of the generation.",
+    pattern=r"^[0-9a-f]{64}$",
+)
+
+
+#: Query parameter for the archive format
+archive_format = Query(
+    title="Archive format",
+    description="Format of the generated archive, overrides the `Accept` header. Defaults to 'zip'.",
+    default=None,
+)
+
+
+#: Query parameter for the archive compression level
+compression_level = Query(
+    title="Compression level",
+    description="Compression level from 1 (fastest) to 9 (smallest), ignored by 'store' format.",
+    default=None,
+    ge=1,
+    le=9,
+)
+
+
+#: Query parameter to filter the latency histograms by template
+template_filter = Query(
+    title="Template",
+    description="UUID of the template to return the latency histograms of, all templates if not set.",
+    default=None,
+)
+
+
+#: Query parameter to select the template to purge from the cache
+template_purge = Query(
+    title="Template",
+    description="UUID of the template to purge the cached cookiecutter.json of, all templates if not set.",
+    default=None,
+)
+
+
+#: Query parameter to select the template to refresh the stored fields of
+template_refresh = Query(
+    title="Template",
+    description="UUID of the template to refresh the stored fields of, all templates if not set.",
+    default=None,
+)
+
+
+#: Query parameter to warm up template checkouts after a database sync
+warmup = Query(
+    title="Warm up",
+    description="Clone every template and load its cookiecutter.json after the sync, returning the timing of each.",
+    default=False,
+)
+
+
+#: Query parameter to build the default-options archives after a database sync
+prebuild = Query(
+    title="Prebuild",
+    description="Build in background the archive with the default options of the allowed templates after the sync.",
+    alias="prebuild",
+    default=False,
+)
+
+
+#: Header parameter to negotiate the archive format
+accept = Header(
+    title="Accept",
+    description="Media types accepted for the archive: 'application/zip', 'application/gzip' or 'application/zstd'.",
+    default=None,
+)
+
+
+#: Header parameter to download only part of an archive
+byte_range = Header(
+    title="Range",
+    description="Single range of bytes of the archive to download, for example 'bytes=1024-'.",
+    alias="Range",
+    default=None,
+)
+
+
+#: Header parameter to download the range only if the archive did not change
+if_range = Header(
+    title="If-Range",
+    description="ETag of the archive, the whole archive is downloaded if it does not match.",
+    alias="If-Range",
+    default=None,
+)
+
+
+#: Header parameter to revalidate a cached response
+if_none_match = Header(
+    title="If-None-Match",
+    description="ETag of a previous response, '304 Not Modified' is returned if the catalog did not change.",
+    alias="If-None-Match",
+    default=None,
+)
@@ -1,6 +1,7 @@
 """Schema definitions for the API."""
 
 # pylint: disable=too-few-public-methods,missing-module-docstring,missing-class-docstring,redefined-builtin
+import datetime as dt
 from typing import Annotated, Any, Optional
 from uuid import UUID
 
@@ -8,12 +9,14 @@ from pydantic import BaseModel, conint, model_validator
 from pydantic.functional_validators import AfterValidator
 from typing_extensions import TypeAliasType
 
-from app import utils
+from app import jobs, utils
 from app.api_v1 import constants
 
 Score = TypeAliasType("Score", conint(ge=0, le=5))
 SortBy = TypeAliasType("SortBy", Annotated[str, AfterValidator(utils.validate_sort_by)])
+Cursor = TypeAliasType("Cursor", Annotated[str, AfterValidator(utils.validate_cursor)])
 Input = TypeAliasType("Input", Annotated[str, AfterValidator(utils.validate_input)])
+Keyword = TypeAliasType("Keyword", Annotated[str, AfterValidator(utils.validate_keyword)])
 
 
 # class SortBy(str):
@@ -88,6 +91,176 @@ class CutterField(BaseModel, from_attributes=True):
 CutterForm = list[CutterField]
 
 
+class Job(BaseModel, from_attributes=True):
+    """Generation job schema definition."""
+
+    #: Job identifier
+    id: UUID
+
+    #: Job status
+    status: jobs.JobStatus
+
+    #: Time the job was submitted
+    created: dt.datetime
+
+    #: Time the job started running (optional)
+    started: Optional[dt.datetime]
+
+    #: Time the job finished (optional)
+    finished: Optional[dt.datetime]
+
+    #: Time the job and its result expire (optional)
+    expires: Optional[dt.datetime]
+
+    #: Error message if the job failed (optional)
+    error: Optional[str]
+
+
+class WarmUp(BaseModel, from_attributes=True):
+    """Template warm up result schema definition."""
+
+    #: Template identifier
+    id: UUID
+
+    #: Template file in the repository
+    repoFile: str
+
+    #: Seconds to get the checkout and load cookiecutter.json
+    seconds: float
+
+    #: Error message if the warm up failed (optional)
+    error: Optional[str]
+
+
+class AdmissionMetrics(BaseModel, from_attributes=True):
+    """Generation admission metrics schema definition."""
+
+    #: Generations running
+    active: int
+
+    #: Generations waiting for a free slot
+    waiting: int
+
+    #: Generations rejected since start
+    rejected: int
+
+    #: Users with running generations
+    users: int
+
+
+class ArgumentsMetrics(BaseModel, from_attributes=True):
+    """Fetched cookiecutter.json cache metrics schema definition."""
+
+    hits: int
+    misses: int
+    #: Stale files revalidated with the repository
+    revalidations: int
+    #: Fetches that waited for a download already in flight
+    coalesced: int
+    entries: int
+
+
+class HostMetrics(BaseModel, from_attributes=True):
+    """Outbound requests to a host metrics schema definition."""
+
+    host: str
+    #: Requests waiting for a response
+    active: int
+    #: Requests waiting for a free connection to the host
+    waiting: int
+
+
+class HttpMetrics(BaseModel, from_attributes=True):
+    """Outbound HTTP client metrics schema definition."""
+
+    requests: int
+    errors: int
+    active: int
+    waiting: int
+    hosts: list[HostMetrics]
+
+
+class JobsMetrics(BaseModel, from_attributes=True):
+    """Background jobs metrics schema definition."""
+
+    queued: int
+    running: int
+    done: int
+    failed: int
+
+
+class RenderingMetrics(BaseModel, from_attributes=True):
+    """Compiled templates cache metrics schema definition."""
+
+    #: Memory renders of an already compiled template
+    hits: int
+
+    #: Memory renders that compiled the template
+    misses: int
+
+    #: Ratio of hits to all memory renders
+    hit_rate: float
+
+
+class FetchMetrics(BaseModel, from_attributes=True):
+    """Template repository fetches metrics schema definition."""
+
+    #: Fetches from the template repositories
+    fetches: int
+
+    #: Approximate bytes received, as growth of the local object stores
+    bytes: int
+
+    #: Seconds spent fetching
+    seconds: float
+
+
+class RepositoryMetrics(FetchMetrics):
+    """Fetches metrics of a template repository schema definition."""
+
+    gitLink: str
+
+
+class MirrorsMetrics(FetchMetrics):
+    """Template mirrors metrics schema definition."""
+
+    repositories: list[RepositoryMetrics]
+
+
+class PrebuildMetrics(BaseModel, from_attributes=True):
+    """Default-options archives prebuild metrics schema definition."""
+
+    #: Builds queued or running
+    scheduled: int
+    built: int
+    failed: int
+
+
+class Metrics(BaseModel, from_attributes=True):
+    """Application metrics schema definition."""
+
+    admission: AdmissionMetrics
+    arguments: ArgumentsMetrics
+    http: HttpMetrics
+    jobs: JobsMetrics
+    mirrors: MirrorsMetrics
+    prebuild: PrebuildMetrics
+    rendering: RenderingMetrics
+
+
+class LatencyHistogram(BaseModel, from_attributes=True):
+    """Generation phase latency histogram schema definition."""
+
+    template: str
+    phase: str
+    #: Generations observed
+    count: int
+    #: Sum of the phase durations in milliseconds
+    sum: float
+    #: Cumulative generations per upper bound in milliseconds
+    buckets: dict[str, int]
+
+
 class ErrorDetails(BaseModel, from_attributes=True):
     """Error details schema definition."""
 
@@ -96,6 +269,10 @@ class ErrorDetails(BaseModel, from_attributes=True):
     type: str
 
 
+#: Alias for the CutterForm, or the error details, of each template
+FieldsMap = dict[UUID, CutterForm | ErrorDetails]
+
+
 class Unauthorized(BaseModel, from_attributes=True):
     """Unauthorized error schema definition."""
 
@@ -136,6 +313,16 @@ class Unprocessable(BaseModel, from_attributes=True):
     detail: list[ErrorDetails]
 
 
+class TooManyRequests(BaseModel, from_attributes=True):
+    """Too many requests error schema definition."""
+
+    def __init__(self, **data: Any) -> None:
+        super().__init__(status_code=constants.Status429, **data)
+
+    status_code: constants.Status429
+    detail: list[ErrorDetails]
+
+
 class ServerError(BaseModel, from_attributes=True):
     """Server error schema definition."""
 
@@ -0,0 +1,345 @@
+"""Archive writers to pack generated projects for download.
+
+Zip entries are deflated in parallel on a pool of threads, as zlib releases
+the GIL, and written in order once compressed.
+"""
+
+import collections
+import functools
+import gzip
+import io
+import logging
+import os
+import posixpath
+import tarfile
+import zipfile
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import Enum
+from typing import Callable, Generator, Iterable, Mapping, NamedTuple, Optional
+
+import zstandard
+from fastapi import FastAPI, Request
+
+from app.config import Settings
+
+logger = logging.getLogger(__name__)
+
+#: Size of the blocks read from the project files
+CHUNK_SIZE = 1024**2
+
+#: Fixed timestamp of archive entries, so same files produce same archive
+DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+#: Files over this size are deflated while streamed instead of in parallel
+PARALLEL_MAX_SIZE = 64 * 1024**2
+
+
+def init_app(app: FastAPI) -> None:
+    """Initialize zip entries deflate pool."""
+    settings: Settings = app.state.settings
+    app.state.deflater = Deflater(settings.zip_deflate_workers, settings.zip_deflate_window)
+    app.add_event_handler("shutdown", app.state.deflater.shutdown)
+
+
+def get_deflater(request: Request) -> "Deflater":
+    """Return the zip entries deflate pool."""
+    return request.app.state.deflater
+
+
+class Deflater:
+    """Pool of threads to deflate zip entries in parallel. Each archive
+    holds up to `window` bytes of files being deflated ahead of its output.
+    """
+
+    def __init__(self, workers: Optional[int], window: int) -> None:
+        self.window = window
+        self._executor = ThreadPoolExecutor(max_workers=workers or os.cpu_count(), thread_name_prefix="deflate")
+
+    def submit(self, chunks: Callable[[], Iterable[bytes]], level: Optional[int]) -> Future:
+        """Submit the chunks of a file, the future returns the deflated
+        content with its CRC and size.
+        """
+        return self._executor.submit(_deflate, chunks, level)
+
+    def shutdown(self) -> None:
+        """Cancel queued deflates and stop worker threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ArchiveFormat(str, Enum):
+    """Constants for the archive formats."""
+
+    ZIP = "zip"
+    STORE = "store"
+    TAR_GZ = "tar.gz"
+    TAR_ZST = "tar.zst"
+
+    @property
+    def media_type(self) -> str:
+        """Media type of the archive format."""
+        return MEDIA_TYPES[self]
+
+    @property
+    def filename(self) -> str:
+        """Download file name for the archive format."""
+        return f"project.{'zip' if self == ArchiveFormat.STORE else self.value}"
+
+
+#: Media types of each format, the first ones are preferred on negotiation
+MEDIA_TYPES = {
+    ArchiveFormat.ZIP: "application/zip",
+    ArchiveFormat.TAR_GZ: "application/gzip",
+    ArchiveFormat.TAR_ZST: "application/zstd",
+    ArchiveFormat.STORE: "application/zip",
+}
+
+
+#: Leading bytes of each archive media type, zip and store are the same
+MAGIC_NUMBERS = {
+    b"PK": ArchiveFormat.ZIP,
+    b"\x1f\x8b": ArchiveFormat.TAR_GZ,
+    b"\x28\xb5\x2f\xfd": ArchiveFormat.TAR_ZST,
+}
+
+
+def detect(header: bytes) -> ArchiveFormat:
+    """Return the archive format from the leading bytes of an archive."""
+    for magic, archive_format in MAGIC_NUMBERS.items():
+        if header.startswith(magic):
+            return archive_format
+    raise ValueError("Unknown archive format")
+
+
+def negotiate(archive_format: Optional[ArchiveFormat], accept: Optional[str]) -> ArchiveFormat:
+    """Return the requested format or the preferred by the Accept header.
+    Ranges with a quality of 0 or not valid are ignored.
+    """
+    if archive_format:
+        return archive_format
+    ranges = []  # List of (quality, order, media_type)
+    for order, item in enumerate((accept or "").split(",")):
+        media_type, *params = [x.strip() for x in item.split(";")]
+        try:
+            quality = float(next((x[2:] for x in params if x.startswith("q=")), "1"))
+        except ValueError:
+            logger.debug("Ignoring Accept range with bad quality: %s", item)
+            continue
+        if 0 < quality <= 1:
+            ranges.append((-quality, order, media_type.lower()))
+    for _, _, media_type in sorted(ranges):
+        for option, option_type in MEDIA_TYPES.items():
+            if media_type == option_type:
+                return option
+    return ArchiveFormat.ZIP
+
+
+class Entry(NamedTuple):
+    """Folder or file to pack into an archive."""
+
+    name: str  # Path relative to the archive root
+    mode: int  # File type and permissions as in `os.stat`
+    size: int
+    chunks: Optional[Callable[[], Iterable[bytes]]]  # None for folders
+
+
+def folder_entries(folder: str) -> Generator[Entry, None, None]:
+    """Generator that yields the archive entries of a folder on disk."""
+    for path in walk(folder):
+        stat = os.stat(path)
+        name = os.path.relpath(path, folder)
+        if os.path.isdir(path):
+            yield Entry(name, stat.st_mode, 0, None)
+        else:
+            yield Entry(name, stat.st_mode, stat.st_size, functools.partial(_read, path))
+
+
+def memory_entries(files: Mapping[str, tuple[Optional[bytes], int]]) -> Generator[Entry, None, None]:
+    """Generator that yields the archive entries of an in-memory file map.
+    The map values are (content, mode) tuples, with None content for folders.
+    Entries follow the same order as `folder_entries`.
+    """
+    children = collections.defaultdict(list)
+    for name in files:
+        children[posixpath.dirname(name)].append(name)
+
+    def visit(parent: str) -> Generator[Entry, None, None]:
+        dirs = sorted(x for x in children[parent] if files[x][0] is None)
+        for name in dirs:
+            yield Entry(name, files[name][1], 0, None)
+        for name in sorted(x for x in children[parent] if files[x][0] is not None):
+            content, mode = files[name]
+            yield Entry(name, mode, len(content), functools.partial(iter, [content]))
+        for name in dirs:
+            yield from visit(name)
+
+    return visit("")
+
+
+def stream(
+    entries: Iterable[Entry], archive_format: ArchiveFormat, level: Optional[int] = None, deflater: Optional[Deflater] = None
+) -> Generator[bytes, None, None]:
+    """Generator that yields the archive chunks of the entries in a format.
+    Zip entries are deflated in parallel if a deflater is given.
+    """
+    if archive_format == ArchiveFormat.ZIP:
+        return stream_zip(entries, zipfile.ZIP_DEFLATED, level, deflater)
+    if archive_format == ArchiveFormat.STORE:
+        return stream_zip(entries, zipfile.ZIP_STORED)
+    return stream_tar(entries, archive_format, level)
+
+
+def stream_zip(
+    entries: Iterable[Entry], compression: int = zipfile.ZIP_DEFLATED, level: Optional[int] = None, deflater: Optional[Deflater] = None
+) -> Generator[bytes, None, None]:
+    """Generator that yields zip chunks of the entries while they are read.
+    Timestamps are fixed, so the same entries produce the same output.
+    """
+    logger.debug("Streaming zip archive.")
+    buffer = _ChunkBuffer()
+    parallel = deflater is not None and compression == zipfile.ZIP_DEFLATED
+    with zipfile.ZipFile(buffer, "w", compression, compresslevel=level) as archive:
+        for entry, deflated in _deflated(entries, level, deflater) if parallel else ((x, None) for x in entries):
+            zinfo = zipfile.ZipInfo(entry.name if entry.chunks else f"{entry.name}/", DATE_TIME)
+            zinfo.external_attr = (entry.mode & 0xFFFF) << 16
+            if entry.chunks is None:
+                zinfo.external_attr |= 0x10  # MS-DOS directory flag
+                archive.writestr(zinfo, b"")
+                continue
+            zinfo.file_size = entry.size
+            zinfo.compress_type = compression
+            zinfo._compresslevel = level  # pylint: disable=protected-access
+            if deflated:
+                _write_deflated(archive, zinfo, *deflated.result())
+                yield from buffer.drain()
+                continue
+            with archive.open(zinfo, "w") as target:
+                for block in entry.chunks():
+                    target.write(block)
+                    yield from buffer.drain()
+            yield from buffer.drain()
+    logger.debug("Closing zip archive.")
+    yield from buffer.drain()
+
+
+def _deflated(entries: Iterable[Entry], level: Optional[int], deflater: Deflater) -> Generator[tuple[Entry, Optional[Future]], None, None]:
+    """Generator that yields the entries in order with the future of their
+    deflated content, None for folders and files too large to hold in memory.
+    """
+    pending: collections.deque = collections.deque()
+    window = 0
+    try:
+        for entry in entries:
+            future = None
+            if entry.chunks is not None and entry.size <= PARALLEL_MAX_SIZE:
+                future = deflater.submit(entry.chunks, level)
+                window += entry.size
+            pending.append((entry, future))
+            while pending and (pending[0][1] is None or window > deflater.window):
+                entry, future = pending.popleft()
+                window -= entry.size if future else 0
+                yield entry, future
+        while pending:
+            yield pending.popleft()
+    finally:
+        for _, future in pending:
+            if future:
+                future.cancel()  # Archive not consumed to the end
+
+
+def _deflate(chunks: Callable[[], Iterable[bytes]], level: Optional[int]) -> tuple[bytes, int, int]:
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION if level is None else level, zlib.DEFLATED, -15)
+    blocks, crc, size = [], 0, 0
+    for block in chunks():
+        crc, size = zlib.crc32(block, crc), size + len(block)
+        blocks.append(compressor.compress(block))
+    blocks.append(compressor.flush())
+    return b"".join(blocks), crc, size
+
+
+def _write_deflated(archive: zipfile.ZipFile, zinfo: zipfile.ZipInfo, data: bytes, crc: int, size: int) -> None:
+    """Write an entry deflated in advance, as `ZipFile.open` would do it
+    but with size and CRC known, so no data descriptor is needed.
+    """
+    # pylint: disable=protected-access
+    zinfo.CRC, zinfo.compress_size, zinfo.file_size = crc, len(data), size
+    zinfo.header_offset = archive.fp.tell()
+    archive._writecheck(zinfo)
+    archive._didModify = True
+    archive.fp.write(zinfo.FileHeader())
+    archive.fp.write(data)
+    archive.start_dir = archive.fp.tell()
+    archive.filelist.append(zinfo)
+    archive.NameToInfo[zinfo.filename] = zinfo
+
+
+def stream_tar(entries: Iterable[Entry], archive_format: ArchiveFormat, level: Optional[int] = None) -> Generator[bytes, None, None]:
+    """Generator that yields compressed tar chunks of the entries while they are read.
+    Owners and timestamps are fixed, so the same entries produce the same output.
+    """
+    logger.debug("Streaming tar archive.")
+    buffer = _ChunkBuffer()
+    with _compressor(buffer, archive_format, level) as target:
+        for entry in entries:
+            tarinfo = tarfile.TarInfo(entry.name)
+            tarinfo.mode = entry.mode & 0o7777
+            if entry.chunks is None:
+                tarinfo.type = tarfile.DIRTYPE
+                target.write(tarinfo.tobuf(tarfile.PAX_FORMAT))
+                continue
+            tarinfo.size = entry.size
+            target.write(tarinfo.tobuf(tarfile.PAX_FORMAT))
+            for block in entry.chunks():
+                target.write(block)
+                yield from buffer.drain()
+            target.write(tarfile.NUL * (-tarinfo.size % tarfile.BLOCKSIZE))
+            yield from buffer.drain()
+        target.write(tarfile.NUL * 2 * tarfile.BLOCKSIZE)  # End of archive
+    logger.debug("Closing tar archive.")
+    yield from buffer.drain()
+
+
+def _compressor(buffer: io.RawIOBase, archive_format: ArchiveFormat, level: Optional[int]):
+    if archive_format == ArchiveFormat.TAR_GZ:
+        return gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=level or 6, mtime=0)
+    if archive_format == ArchiveFormat.TAR_ZST:
+        return zstandard.ZstdCompressor(level=level or 3).stream_writer(buffer, closefd=False)
+    raise NotImplementedError(f"Archive format '{archive_format}' not supported.")
+
+
+def walk(folder: str) -> Generator[str, None, None]:
+    """Generator that yields folders and files inside a folder in sorted order."""
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        for name in dirs:
+            yield os.path.join(root, name)
+        for name in sorted(files):
+            yield os.path.join(root, name)
+
+
+def _read(path: str) -> Generator[bytes, None, None]:
+    with open(path, "rb") as source:
+        while block := source.read(CHUNK_SIZE):
+            yield block
+
+
+class _ChunkBuffer(io.RawIOBase):
+    """Unseekable stream collecting the archive bytes until drained."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> Generator[bytes, None, None]:
+        """Yield the collected bytes, if any, and empty the buffer."""
+        if self._chunks:
+            data = b"".join(self._chunks)
+            self._chunks.clear()
+            yield data
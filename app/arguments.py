@@ -0,0 +1,162 @@
+"""Cache of the `cookiecutter.json` files fetched from template repositories.
+
+Parsed files are kept by (`gitLink`, `gitCheckout`) for a time to live, after
+which they are revalidated with `If-None-Match` and `If-Modified-Since`, so
+unchanged files are not downloaded again. When the repository host is down,
+stale files are served instead of failing. Concurrent requests for a file
+being downloaded wait for that download instead of starting their own.
+"""
+
+import asyncio
+import collections
+import functools
+import logging
+import threading
+import time
+from typing import Optional
+
+import httpx
+from fastapi import FastAPI, Request
+
+from app.config import Settings
+from app.http_client import HttpClient
+
+logger = logging.getLogger(__name__)
+
+
+def init_app(app: FastAPI) -> None:
+    """Initialize cookiecutter.json cache."""
+    settings: Settings = app.state.settings
+    app.state.arguments = ArgumentsCache(app.state.http_client, settings.arguments_ttl, settings.arguments_size)
+
+
+def get_arguments(request: Request) -> "ArgumentsCache":
+    """Return the cookiecutter.json cache."""
+    return request.app.state.arguments
+
+
+class CachedArguments:
+    """Parsed cookiecutter.json with its validators."""
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, data: dict, etag: Optional[str], last_modified: Optional[str]) -> None:
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched = time.time()
+
+
+class ArgumentsCache:
+    """LRU cache of parsed cookiecutter.json files with time to live."""
+
+    def __init__(self, http_client: HttpClient, ttl: int, max_entries: int) -> None:
+        self.http_client = http_client
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.coalesced = 0
+        self._entries: collections.OrderedDict = collections.OrderedDict()
+        self._flights: dict[tuple, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    async def fetch(self, git_link: str, git_checkout: Optional[str], max_age: Optional[int] = None) -> dict:
+        """Return the parsed cookiecutter.json of a template repository,
+        revalidated if older than `max_age` or the cache time to live.
+        Concurrent fetches of the same file share a single download.
+        The returned dict is shared between requests and must not be modified.
+        """
+        key = git_link, git_checkout
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+            if entry and time.time() - entry.fetched <= (self.ttl if max_age is None else max_age):
+                self.hits += 1
+                return entry.data
+            flight = self._flights.get(key)
+            if flight:
+                self.coalesced += 1
+            else:
+                if entry:
+                    self.revalidations += 1
+                else:
+                    self.misses += 1
+                flight = self._flights[key] = asyncio.ensure_future(self._refresh(key, entry))
+                flight.add_done_callback(functools.partial(self._landed, key))
+
+        # Shielded so a cancelled request does not cancel the others
+        return await asyncio.shield(flight)
+
+    def purge(self, git_link: Optional[str] = None, git_checkout: Optional[str] = None) -> int:
+        """Remove the entries of a repository, all if not set, and return
+        the number of entries removed.
+        """
+        with self._lock:
+            keys = [k for k in self._entries if git_link is None or k == (git_link, git_checkout)]
+            for key in keys:
+                del self._entries[key]
+        logger.info("Purged %s cached cookiecutter.json files.", len(keys))
+        return len(keys)
+
+    def metrics(self) -> dict:
+        """Return the cache counters."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "coalesced": self.coalesced,
+                "entries": len(self._entries),
+            }
+
+    async def _refresh(self, key: tuple, entry: Optional[CachedArguments]) -> dict:
+        try:
+            entry = await _download(self.http_client, _url(*key), entry)
+        except httpx.HTTPError as err:
+            if not entry or isinstance(err, httpx.HTTPStatusError) and err.response.status_code < 500:
+                raise
+            logger.warning("Revalidation of '%s' failed, serving stale: %s", key[0], err)
+            return entry.data
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry.data
+
+    def _landed(self, key: tuple, flight: asyncio.Future) -> None:
+        with self._lock:
+            del self._flights[key]
+        if not flight.cancelled():
+            flight.exception()  # Mark as retrieved, waiters raise it
+
+
+def _url(git_link: str, git_checkout: Optional[str]) -> str:
+    url = f"{git_link}/raw/{git_checkout}/cookiecutter.json"
+    if not url.lower().startswith("http"):
+        raise ValueError(f"Bad url for '{git_link}'.")
+    return url
+
+
+async def _download(http_client: HttpClient, url: str, stale: Optional[CachedArguments]) -> CachedArguments:
+    """Download and parse cookiecutter.json, only if changed when a stale
+    entry is provided.
+    """
+    headers = {}
+    if stale and stale.etag:
+        headers["If-None-Match"] = stale.etag
+    if stale and stale.last_modified:
+        headers["If-Modified-Since"] = stale.last_modified
+
+    logger.debug("Load and parse request into json, %s.", url)
+    response = await http_client.get(url, headers=headers)
+    if stale and response.status_code == 304:
+        logger.debug("cookiecutter.json at %s not modified.", url)
+        return CachedArguments(stale.data, stale.etag, stale.last_modified)
+    response.raise_for_status()
+    validators = response.headers.get("ETag"), response.headers.get("Last-Modified")
+    return CachedArguments(response.json(), *validators)
@@ -0,0 +1,203 @@
+"""Content addressed store of generated project archives.
+
+Archives are stored under the hash of the inputs that produced them, so
+repeated generations with the same template revision and options are served
+from the store instead of rendering the project again. The hash is also the
+stable id and strong ETag used to resume downloads with `Range` requests.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Generator, Iterable, Optional
+
+from fastapi import FastAPI, Request, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
+
+from app.archives import CHUNK_SIZE, ArchiveFormat
+from app.config import Settings
+
+logger = logging.getLogger(__name__)
+
+
+def init_app(app: FastAPI) -> None:
+    """Initialize generated artifacts store."""
+    settings: Settings = app.state.settings
+    path = settings.artifacts_path or os.path.join(tempfile.gettempdir(), "artifacts")
+    app.state.artifacts = ArtifactStore(path, settings.artifacts_age, settings.artifacts_size, settings.artifacts_retention)
+
+
+def get_artifacts(request: Request) -> "ArtifactStore":
+    """Return the generated artifacts store."""
+    return request.app.state.artifacts
+
+
+def headers(key: str) -> dict[str, str]:
+    """Return the response headers for an artifact download."""
+    return {
+        "ETag": f'"{key}"',
+        "Vary": "Accept",
+        "Content-Location": f"../artifacts/{key}:download",  # Relative to the API version
+        "Access-Control-Expose-Headers": "Content-Disposition, Content-Location, ETag, Server-Timing",
+    }
+
+
+def file_response(
+    artifact: Path,
+    archive_format: ArchiveFormat,
+    byte_range: Optional[str] = None,
+    if_range: Optional[str] = None,
+) -> Response:
+    """Return the response to download a stored artifact. Only the bytes in
+    `byte_range` are returned if `if_range` is not set or matches the ETag.
+    """
+    media_type, filename = archive_format.media_type, archive_format.filename
+    response_headers = {**headers(artifact.name), "Accept-Ranges": "bytes"}
+    size = artifact.stat().st_size
+    first_last = _byte_range(byte_range, size) if byte_range else None
+    if not first_last or if_range not in (None, response_headers["ETag"]):
+        return FileResponse(artifact, media_type=media_type, filename=filename, headers=response_headers)
+
+    first, last = first_last
+    if first > last:
+        logger.debug("Range %s not satisfiable for %s bytes.", byte_range, size)
+        response_headers["Content-Range"] = f"bytes */{size}"
+        return Response(status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE, headers=response_headers)
+
+    logger.debug("Returning bytes %s-%s of %s.", first, last, artifact.name)
+    response_headers["Content-Range"] = f"bytes {first}-{last}/{size}"
+    response_headers["Content-Length"] = str(last - first + 1)
+    response_headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return StreamingResponse(
+        _read_range(artifact, first, last),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers=response_headers,
+    )
+
+
+def _byte_range(value: str, size: int) -> Optional[tuple[int, int]]:
+    """Return the first and last byte of a single range, None if the header
+    is not valid, so it is ignored. First is over last if not satisfiable.
+    """
+    match = re.fullmatch(r"bytes=(\d*)-(\d*)", value.strip())
+    if not match or match.groups() == ("", ""):
+        return None  # Multiple ranges or other units are not supported
+    first, last = match.groups()
+    if not first:  # Suffix range with the last bytes
+        return (max(size - int(last), 0), size - 1) if int(last) else (size, size - 1)
+    if last and int(last) < int(first):
+        return None
+    return int(first), min(int(last), size - 1) if last else size - 1
+
+
+def _read_range(path: Path, first: int, last: int) -> Generator[bytes, None, None]:
+    with open(path, "rb") as file:
+        file.seek(first)
+        remaining = last - first + 1
+        while remaining > 0 and (chunk := file.read(min(CHUNK_SIZE, remaining))):
+            remaining -= len(chunk)
+            yield chunk
+
+
+class ArtifactStore:
+    """On disk store of generated archives with age and size eviction.
+    Archives used within the retention window are not evicted over size, so
+    interrupted downloads can be resumed. Pinned archives, such as job
+    results, are not evicted until their pin expires.
+    """
+
+    def __init__(self, path: str, max_age: int, max_size: int, retention: int = 0) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self.max_size = max_size
+        self.retention = retention
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        """Return the content address for the generation inputs."""
+        data = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Path]:
+        """Return the stored archive path for a key, None if not stored."""
+        path = self.path / key
+        try:
+            os.utime(path)  # Mark last use
+        except FileNotFoundError:
+            logger.debug("Artifact %s not in store.", key)
+            return None
+        logger.debug("Artifact %s found in store.", key)
+        return path
+
+    def pin(self, key: str, seconds: int) -> None:
+        """Protect a stored archive from eviction for some seconds."""
+        pin, until = self.path / f".{key}.pin", time.time() + seconds
+        pin.touch()
+        os.utime(pin, (until, until))  # Pin expires at its modification time
+        logger.debug("Artifact %s pinned for %s seconds.", key, seconds)
+
+    def store(self, key: str, chunks: Iterable[bytes], pin: int = 0) -> Generator[bytes, None, None]:
+        """Generator that yields the chunks while writing them into the store.
+        The artifact is only stored if all the chunks are consumed, pinned
+        for `pin` seconds if set.
+        """
+        file_descriptor, part = tempfile.mkstemp(prefix=".", suffix=".part", dir=self.path)
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                for chunk in chunks:
+                    file.write(chunk)
+                    yield chunk
+            logger.debug("Storing artifact %s.", key)
+            os.replace(part, self.path / key)
+            if pin:
+                self.pin(key, pin)
+        finally:
+            if os.path.exists(part):
+                os.unlink(part)
+        self.evict()
+
+    def save(self, key: str, chunks: Iterable[bytes], pin: int = 0) -> None:
+        """Write all the chunks into the store."""
+        for _ in self.store(key, chunks, pin):
+            pass
+
+    def evict(self) -> None:
+        """Remove expired artifacts and least recently used over size."""
+        now, total, artifacts, pinned = time.time(), 0, [], set()
+        for pin in self.path.glob(".*.pin"):
+            try:
+                if pin.stat().st_mtime > now:
+                    pinned.add(pin.name[1:-4])
+                    continue
+            except FileNotFoundError:
+                continue  # Removed by another worker
+            pin.unlink(missing_ok=True)
+        for path in self.path.iterdir():
+            if path.name.startswith("."):
+                continue  # Skip artifacts being written and pins
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # Evicted by another worker
+            if path.name in pinned:
+                total += stat.st_size
+                continue  # Result of a job not expired
+            if now - stat.st_mtime > max(self.max_age, self.retention):
+                logger.debug("Evicting expired artifact %s.", path.name)
+                path.unlink(missing_ok=True)
+                continue
+            total += stat.st_size
+            artifacts.append((stat.st_mtime, stat.st_size, path))
+        for last_use, size, path in sorted(artifacts):
+            if total <= self.max_size or now - last_use < self.retention:
+                break
+            logger.debug("Evicting artifact %s.", path.name)
+            path.unlink(missing_ok=True)
+            total -= size
@@ -0,0 +1,310 @@
+"""Version and in-memory snapshot of the template catalog for public reads.
+
+The version changes each time the templates, their scores or their fields
+are committed, weak ETags derived from it let clients and CDNs revalidate
+listings, templates and fields with `If-None-Match` and get a `304` without
+a database query. The version is kept on disk so all workers share it.
+
+Listings and templates are served from an immutable snapshot of the catalog
+with the common sort orders prebuilt. Each worker builds a new snapshot when
+the version changes, ratings only patch the score of the rated template.
+Keywords are still matched and ranked by the full text index of the database,
+and titles sorted by their rank in the database collation.
+"""
+
+import bisect
+import fcntl
+import functools
+import itertools
+import logging
+import os
+import secrets
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, Optional
+from uuid import UUID
+
+import sqlalchemy as sa
+from fastapi import FastAPI, Request
+from sqlalchemy.orm import Session
+
+from app import models, utils
+from app.config import Settings
+
+logger = logging.getLogger(__name__)
+
+
+def init_app(app: FastAPI) -> None:
+    """Initialize catalog version, changed on start as the database may
+    have been migrated or modified while stopped.
+    """
+    settings: Settings = app.state.settings
+    path = settings.catalog_path or os.path.join(tempfile.gettempdir(), "catalog")
+    app.state.catalog = Catalog(path, settings.catalog_cache_control)
+    app.state.catalog.bump()
+
+
+def get_catalog(request: Request) -> "Catalog":
+    """Return the catalog version."""
+    return request.app.state.catalog
+
+
+#: Sort orders kept with each snapshot, other ones are sorted per request
+PREBUILT_SORTS = ("+id", "-id", "+score", "-score", "+title", "-title")
+PREBUILT_KEYS = frozenset(tuple(utils.sort_keys(x)) for x in PREBUILT_SORTS)
+
+
+class Catalog:
+    """Catalog version shared between workers through a file."""
+
+    def __init__(self, path: str, cache_control: str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.cache_control = cache_control
+        self._snapshot: Optional[Snapshot] = None
+        self._lock = threading.Lock()
+
+    def version(self) -> str:
+        """Return the current catalog version."""
+        try:
+            return self.path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return self.bump()
+
+    def bump(self) -> str:
+        """Set a new catalog version after a commit and return it, the
+        snapshot is built again on the next read.
+        """
+        return self._swap()[1]
+
+    def rescore(self, template_id: UUID, score: Optional[float]) -> str:
+        """Set a new catalog version after a rating commit and return it.
+        The score is patched into the snapshot if it was the latest version,
+        else the snapshot is built again on the next read.
+        """
+        previous, version = self._swap()
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot and snapshot.version == previous and template_id in snapshot.by_id:
+                self._snapshot = snapshot.rescore(version, template_id, score)
+        return version
+
+    def headers(self, version: Optional[str] = None) -> dict[str, str]:
+        """Return the caching headers of a catalog version, by default the
+        current one. Read it before the database so a concurrent commit is
+        never missed.
+        """
+        return {"ETag": f'W/"{version or self.version()}"', "Cache-Control": self.cache_control}
+
+    def snapshot(self, session: Session, version: Optional[str] = None) -> "Snapshot":
+        """Return the snapshot of the catalog at `version`, by default the
+        current one, building it from the database if it changed.
+        """
+        version = version or self.version()
+        snapshot = self._snapshot
+        if snapshot and snapshot.version == version:
+            return snapshot
+        with self._lock:
+            if self._snapshot and self._snapshot.version == version:
+                return self._snapshot
+            self._snapshot = Snapshot.build(session, version)  # Replaced at once
+            return self._snapshot
+
+    def _swap(self) -> tuple[Optional[str], str]:
+        """Set a new catalog version and return the replaced one with it."""
+        version = secrets.token_hex(8)
+        with open(self.path.with_suffix(".lock"), "a", encoding="utf-8") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)  # Released on close
+            previous = self.path.read_text(encoding="utf-8") if self.path.exists() else None
+            with tempfile.NamedTemporaryFile("w", dir=self.path.parent, delete=False, encoding="utf-8") as file:
+                file.write(version)
+            os.replace(file.name, self.path)  # Atomic, readers never see a partial version
+        logger.debug("Catalog version changed to %s.", version)
+        return previous, version
+
+
+def not_modified(etag: str, if_none_match: Optional[str]) -> bool:
+    """Return True if the `If-None-Match` header matches the ETag using weak
+    comparison.
+    """
+    if not if_none_match:
+        return False
+    etags = [x.strip().removeprefix("W/") for x in if_none_match.split(",")]
+    return "*" in etags or etag.removeprefix("W/") in etags
+
+
+class TemplateRecord:
+    """Read-only template of a snapshot with the rank of its title."""
+
+    # pylint: disable=too-few-public-methods,too-many-instance-attributes
+
+    __slots__ = ("id", "repoFile", "title", "summary", "tags", "picture", "gitLink", "feedback", "gitCheckout", "score", "title_rank")
+
+    def __init__(self, row: sa.Row, tags: frozenset[str]) -> None:
+        self.id, self.repoFile, self.title, self.summary = row.id, row.repoFile, row.title, row.summary
+        self.picture, self.gitLink, self.feedback, self.gitCheckout = row.picture, row.gitLink, row.feedback, row.gitCheckout
+        self.score = row.score
+        self.title_rank = row.title_rank  # Position of the title in the database collation
+        self.tags = tags
+
+    def replace(self, **changes) -> "TemplateRecord":
+        """Return a copy of the template with some attributes changed."""
+        record = object.__new__(TemplateRecord)
+        for name in self.__slots__:
+            setattr(record, name, changes.get(name, getattr(self, name)))
+        return record
+
+
+class Snapshot:
+    """Immutable catalog of templates at a version, with the templates in
+    the prebuilt sort orders.
+    """
+
+    def __init__(self, version: str, records: list[TemplateRecord], orders: Optional[dict] = None) -> None:
+        self.version = version
+        self.records = tuple(records)
+        self.by_id = {x.id: x for x in records}
+        self._title_ranks = {x.title: x.title_rank for x in records}
+        if orders is None:
+            orders = {x: tuple(sorted(self.records, key=_sort_key(x, {}))) for x in PREBUILT_KEYS}
+        self._orders: dict[tuple, tuple[TemplateRecord, ...]] = orders
+
+    @classmethod
+    def build(cls, session: Session, version: str) -> "Snapshot":
+        """Return the snapshot of the templates in the database."""
+        start = time.perf_counter()
+        template, tag = models.Template, models.Tag
+        tags: dict[UUID, set[str]] = {}
+        for template_id, name in session.execute(sa.select(models.TagAssociation.template_id, tag.name).join(tag)):
+            tags.setdefault(template_id, set()).add(name)
+        title_rank = sa.func.dense_rank().over(order_by=template.title).label("title_rank")
+        columns = [template.id, template.repoFile, template.title, template.summary, template.picture]
+        columns += [template.gitLink, template.feedback, template.gitCheckout, template.score, title_rank]
+        records = [TemplateRecord(x, frozenset(tags.get(x.id, ()))) for x in session.execute(sa.select(*columns))]
+        logger.info("Built catalog snapshot %s of %s templates in %.3f seconds.", version, len(records), time.perf_counter() - start)
+        return cls(version, records)
+
+    def rescore(self, version: str, template_id: UUID, score: Optional[float]) -> "Snapshot":
+        """Return the snapshot at a new version with the score of a template
+        changed, moving it in the prebuilt orders instead of sorting them.
+        """
+        old = self.by_id[template_id]
+        new = old.replace(score=score)
+        orders = {}
+        for keys, order in self._orders.items():
+            sort_key, records = _sort_key(keys, {}), list(order)
+            del records[bisect.bisect_left(records, sort_key(old), key=sort_key)]  # Keys end by id, unique
+            bisect.insort(records, new, key=sort_key)
+            orders[keys] = tuple(records)
+        return Snapshot(version, [new if x is old else x for x in self.records], orders)
+
+    def search(
+        self,
+        session: Session,
+        tags: list[str],
+        keywords: list[str],
+        keys: list[tuple[str, str]],
+        cursor: Optional[list] = None,
+    ) -> Iterator[tuple[TemplateRecord, list]]:
+        """Return an iterator of the templates with all tags and keywords, in
+        the order of the sort keys after the cursor values, with their sort
+        values. Keywords are matched and ranked with the full text index.
+        """
+        relevance = _relevance(session, keywords) if utils.search_query(keywords) else None
+        order_keys = tuple(keys if relevance is not None else [x for x in keys if x[1] != "relevance"])  # Same relevance for all
+        if relevance is not None:
+            order = sorted((self.by_id[x] for x in relevance if x in self.by_id), key=_sort_key(order_keys, relevance))
+        elif order_keys in self._orders:
+            order = self._orders[order_keys]
+        else:  # Not prebuilt, sorted for this request only
+            order = sorted(self.records, key=_sort_key(order_keys, {}))
+
+        start = 0
+        if cursor is not None:
+            values = dict(zip((field for _, field in keys), cursor))
+            values["id"] = UUID(values["id"])
+            if "title" in values:
+                values["title"] = self._title_rank(session, values["title"])
+            cursor_key = tuple(_key(option, values[field]) for option, field in order_keys)
+            start = bisect.bisect_right(order, cursor_key, key=_sort_key(order_keys, relevance or {}))
+
+        tags_set = {x.lower() for x in tags}
+        return (
+            (record, [_value(record, field, relevance or {}) for _, field in keys])
+            for record in itertools.islice(order, start, None)
+            if tags_set <= record.tags
+        )
+
+    def _title_rank(self, session: Session, title: str) -> float:
+        """Return the rank of a cursor title, between the ranks of the titles
+        around it in the database collation if no template has it.
+        """
+        if title in self._title_ranks:
+            return self._title_ranks[title]
+        lower = sa.select(sa.func.count(sa.distinct(models.Template.title))).where(models.Template.title < title)
+        return session.scalar(lower) + 0.5
+
+
+def _relevance(session: Session, keywords: list[str]) -> dict[UUID, float]:
+    """Return the ids of the templates matching all keywords with their
+    `ts_rank`, queried on the full text index.
+    """
+    query = sa.func.to_tsquery("simple", utils.search_query(keywords))
+    rank = sa.cast(sa.func.ts_rank(models.Template.search, query), sa.Float)
+    return dict(session.execute(sa.select(models.Template.id, rank).where(models.Template.search.op("@@")(query))).all())
+
+
+@functools.total_ordering
+class _Descending:
+    """Value compared in reverse order."""
+
+    # pylint: disable=too-few-public-methods
+
+    __slots__ = ("value",)
+
+    def __init__(self, value) -> None:
+        self.value = value
+
+    def __eq__(self, other) -> bool:
+        return self.value == other.value
+
+    def __lt__(self, other) -> bool:
+        return other.value < self.value
+
+
+def _key(option: str, value) -> tuple:
+    """Return the sort key of a value with nulls last in both orders."""
+    if value is None:
+        return (True, 0)
+    return (False, value if option == "+" else _Descending(value))
+
+
+def _sort_key(keys, relevance: dict):
+    def sort_key(record: TemplateRecord) -> tuple:
+        return tuple(_key(option, _rank(record, field, relevance)) for option, field in keys)
+
+    return sort_key
+
+
+def _rank(record: TemplateRecord, field: str, relevance: dict):
+    """Return the value compared to sort a template, titles by their rank
+    in the database collation.
+    """
+    if field == "title":
+        return record.title_rank
+    if field == "id":
+        return record.id
+    if field == "relevance":
+        return relevance.get(record.id, 0.0)
+    return getattr(record, field)
+
+
+def _value(record: TemplateRecord, field: str, relevance: dict):
+    """Return the sort value of a template as stored in a cursor."""
+    if field == "id":
+        return f"{record.id}"
+    if field == "relevance":
+        return relevance.get(record.id, 0.0)
+    return getattr(record, field)
@@ -72,6 +72,57 @@ class Settings(BaseSettings, case_sensitive=False):
             raise ValueError("notifications_sender is required if notifications_target is set")
         return self
 
+    # Local mirrors of template repositories, defaults to system temp folder
+    mirrors_path: Optional[str] = None
+    mirrors_ttl: int = 300  # Seconds before a mirror is refreshed
+    mirrors_size: int = 2 * 1024**3  # Bytes before mirrors are evicted
+
+    warmup_workers: int = 8  # Templates warmed up at the same time after a sync
+    fields_workers: int = 8  # cookiecutter.json fetched at the same time for bulk fields and syncs
+
+    # Outbound HTTP client for template metadata fetches
+    http_connections: int = 100  # Connections open at the same time
+    http_per_host: int = 10  # Requests at the same time to a host
+    http_timeout: float = 10.0  # Seconds to connect, read, write or wait for a connection
+
+    # Cache of the cookiecutter.json files fetched from repositories
+    arguments_ttl: int = 300  # Seconds before a file is revalidated
+    arguments_size: int = 1024  # Files kept before the least used is dropped
+
+    # Version of the catalog for HTTP caching, defaults to system temp folder
+    catalog_path: Optional[str] = None
+    catalog_cache_control: str = "public, no-cache"  # Cache-Control of public reads
+
+    # Store of generated archives, defaults to system temp folder
+    artifacts_path: Optional[str] = None
+    artifacts_age: int = 24 * 3600  # Seconds unused before an archive expires
+    artifacts_size: int = 5 * 1024**3  # Bytes before archives are evicted
+    artifacts_retention: int = 3600  # Seconds a used archive is kept over size
+
+    # Template rendering processes, defaults to number of CPUs (0 renders in thread)
+    render_processes: Optional[int] = None
+    render_tasks: int = 100  # Renders before a process is recycled
+    render_cache: int = 256 * 1024**2  # Bytes of compiled templates per process
+
+    # Parallel deflate of zip entries, defaults to number of CPUs
+    zip_deflate_workers: Optional[int] = None
+    zip_deflate_window: int = 64 * 1024**2  # Bytes of files deflated ahead per archive
+
+    # Background generation jobs
+    jobs_workers: int = 4  # Jobs running at the same time
+    jobs_queue: int = 100  # Jobs queued or running before rejecting new ones
+    jobs_ttl: int = 3600  # Seconds a finished job and its result are kept
+
+    # Default-options archives built after a database sync
+    prebuild_workers: int = 1  # Archives built at the same time
+    prebuild_templates: list[str] = []  # Template ids or repoFiles, all if empty
+
+    # Admission control of synchronous generations
+    admission_active: int = 8  # Generations running at the same time
+    admission_per_user: int = 2  # Generations running at the same time per user
+    admission_queue: int = 32  # Generations waiting before rejecting new ones
+    admission_timeout: int = 30  # Seconds a generation waits for a free slot
+
 
 def set_settings(app: FastAPI, **custom_parameters: dict) -> None:
     """Set the settings object on the application."""
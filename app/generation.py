@@ -0,0 +1,106 @@
+"""Generation of projects from the local mirrors of the templates.
+
+Projects are rendered from a checkout of the template revision, unless the
+archive of the same revision, options and format is in the artifacts store.
+Used by the generation endpoints, the background jobs and the prebuilds.
+"""
+
+import contextlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Iterable, NamedTuple, Optional
+from uuid import UUID
+
+from fastapi import Depends
+
+from app import archives, artifacts, mirrors, rendering, timing, utils
+from app.archives import ArchiveFormat
+
+logger = logging.getLogger(__name__)
+
+
+class Source(NamedTuple):
+    """Template fields used to generate a project, detached from the session."""
+
+    id: UUID
+    repoFile: str
+    gitLink: str
+    gitCheckout: Optional[str]
+
+
+class Services(NamedTuple):
+    """Application services used to generate a project."""
+
+    mirrors: mirrors.MirrorCache
+    artifacts: artifacts.ArtifactStore
+    renderer: rendering.Renderer
+    deflater: archives.Deflater
+
+
+def get_services(
+    mirror_cache: mirrors.MirrorCache = Depends(mirrors.get_mirrors),
+    artifact_store: artifacts.ArtifactStore = Depends(artifacts.get_artifacts),
+    renderer: rendering.Renderer = Depends(rendering.get_renderer),
+    deflater: archives.Deflater = Depends(archives.get_deflater),
+) -> Services:
+    """Return the services to generate projects."""
+    return Services(mirror_cache, artifact_store, renderer, deflater)
+
+
+def render(template: Any, variants: dict[str, dict], archive: tuple, output_dir: str, services: Services, timer: timing.Timer) -> tuple[str, Optional[Path], Iterable[archives.Entry]]:
+    """Render the project variants of a template, each under its key folder.
+    Return the artifact key, the stored archive if previously generated and
+    the entries to archive otherwise.
+    """
+    logger.debug("Rendering project from local mirror of the template.")
+    with contextlib.ExitStack() as stack:
+        with timer.phase("checkout"):
+            checkout = stack.enter_context(services.mirrors.checkout(template.gitLink, template.gitCheckout))
+
+        logger.debug("Parse boolean fields into cookiecutter format.")
+        with timer.phase("arguments"):
+            data = utils.load_arguments(checkout.path)
+            bool_fields = [k for k, v in data.items() if isinstance(v, bool)]
+            for options_in in variants.values():
+                for key in filter(lambda k: k in options_in, bool_fields):
+                    options_in[key] = utils.str2bool(options_in[key])
+
+        logger.debug("Looking for a previously generated project.")
+        with timer.phase("lookup"):
+            options = {k: utils.normalize_options(data, v) for k, v in variants.items()}
+            artifact_key = services.artifacts.key(template.id, checkout.revision, options, *archive)
+            artifact = services.artifacts.get(artifact_key)
+        if artifact:
+            return artifact_key, artifact, []
+
+        if rendering.in_memory(f"{checkout.path}", data):
+            logger.debug("Generating %s project variants into memory.", len(variants))
+            with timer.phase("render"):
+                files = services.renderer.render_files(f"{checkout.path}", checkout.revision, variants)
+            return artifact_key, None, archives.memory_entries(files)
+
+        logger.debug("Generating %s project variants into %s.", len(variants), output_dir)
+        outputs = {os.path.join(output_dir, k): v for k, v in variants.items()}
+        with timer.phase("render"):
+            services.renderer.render_all(f"{checkout.path}", outputs)
+        return artifact_key, None, archives.folder_entries(output_dir)
+
+
+def build_project(template: Any, variants: dict[str, dict], archive: tuple, services: Services, latencies: timing.Latencies, pin: int = 0) -> tuple[str, ArchiveFormat]:
+    """Render the project variants into the artifacts store without a
+    response, return the artifact key and the archive format. The archive
+    is kept in the store for `pin` seconds if set, as a job result.
+    """
+    timer = timing.Timer()
+    with tempfile.TemporaryDirectory() as tempdir:
+        artifact_key, artifact, entries = render(template, variants, archive, f"{tempdir}/project", services, timer)
+        if artifact and pin:
+            services.artifacts.pin(artifact_key, pin)
+        if not artifact:
+            logger.debug("Writing archive from rendered project into store.")
+            chunks = archives.stream(entries, *archive, services.deflater)
+            services.artifacts.save(artifact_key, timer.timed("archive", chunks), pin)
+        latencies.observe(f"{template.id}", timer)
+        return artifact_key, archive[0]
@@ -0,0 +1,79 @@
+"""Shared asynchronous HTTP client for outbound template metadata fetches.
+
+A single pooled client is created with the application, so connections to
+the repository hosts are kept alive between requests instead of repeating
+the TCP and TLS handshakes, and the fetches do not block the event loop.
+"""
+
+import asyncio
+import collections
+import logging
+from typing import Optional
+
+import httpx
+from fastapi import FastAPI, Request
+
+from app.config import Settings
+
+logger = logging.getLogger(__name__)
+
+
+def init_app(app: FastAPI) -> None:
+    """Initialize outbound HTTP client."""
+    settings: Settings = app.state.settings
+    app.state.http_client = HttpClient(settings.http_connections, settings.http_per_host, settings.http_timeout)
+    app.add_event_handler("shutdown", app.state.http_client.aclose)
+
+
+def get_http_client(request: Request) -> "HttpClient":
+    """Return the outbound HTTP client."""
+    return request.app.state.http_client
+
+
+class HttpClient:
+    """Pooled keep-alive client with total and per-host connection limits."""
+
+    def __init__(self, max_connections: int, max_per_host: int, timeout: float) -> None:
+        self.max_per_host = max_per_host
+        self.requests = 0
+        self.errors = 0
+        self._active: collections.Counter = collections.Counter()
+        self._waiting: collections.Counter = collections.Counter()
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self._client = httpx.AsyncClient(limits=limits, timeout=timeout, follow_redirects=True)
+
+    async def get(self, url: str, headers: Optional[dict[str, str]] = None) -> httpx.Response:
+        """Send a GET request waiting for a free connection to the host."""
+        host = httpx.URL(url).host
+        semaphore = self._hosts.setdefault(host, asyncio.Semaphore(self.max_per_host))
+        self._waiting[host] += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting[host] -= 1
+        self._active[host] += 1
+        self.requests += 1
+        try:
+            return await self._client.get(url, headers=headers)
+        except httpx.HTTPError:
+            self.errors += 1
+            raise
+        finally:
+            self._active[host] -= 1
+            semaphore.release()
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        await self._client.aclose()
+
+    def metrics(self) -> dict:
+        """Return the request counters and the pool usage per host."""
+        hosts = [{"host": k, "active": self._active[k], "waiting": self._waiting[k]} for k in self._hosts]
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "active": sum(x["active"] for x in hosts),
+            "waiting": sum(x["waiting"] for x in hosts),
+            "hosts": hosts,
+        }
@@ -0,0 +1,128 @@
+"""Background jobs to generate projects without holding HTTP connections.
+
+Jobs run on a bounded pool of threads inside the application process, their
+status is kept in memory until their time to live expires.
+"""
+
+import datetime as dt
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Any, Callable, Optional
+
+from cookiecutter.exceptions import CookiecutterException
+from fastapi import FastAPI, Request
+
+from app.config import Settings
+
+logger = logging.getLogger(__name__)
+
+
+def init_app(app: FastAPI) -> None:
+    """Initialize background jobs queue."""
+    settings: Settings = app.state.settings
+    app.state.jobs = JobQueue(settings.jobs_workers, settings.jobs_queue, settings.jobs_ttl)
+    app.add_event_handler("shutdown", app.state.jobs.shutdown)
+
+
+def get_jobs(request: Request) -> "JobQueue":
+    """Return the background jobs queue."""
+    return request.app.state.jobs
+
+
+class JobStatus(str, Enum):
+    """Constants for the job status."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class QueueFull(Exception):
+    """Raised when a queue cannot accept more work."""
+
+    def __init__(self, message: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Job:
+    """Background job status and result."""
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, owner: tuple[str, str]) -> None:
+        self.id = uuid.uuid4()  # pylint: disable=invalid-name
+        self.owner = owner
+        self.status = JobStatus.QUEUED
+        self.created = dt.datetime.now(dt.timezone.utc)
+        self.started: Optional[dt.datetime] = None
+        self.finished: Optional[dt.datetime] = None
+        self.expires: Optional[dt.datetime] = None
+        self.error: Optional[str] = None
+        self.result: Any = None
+
+
+class JobQueue:
+    """Bounded queue of jobs executed by a pool of worker threads."""
+
+    def __init__(self, workers: int, max_jobs: int, ttl: int) -> None:
+        self.max_jobs = max_jobs
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jobs")
+        self._jobs: dict[uuid.UUID, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, owner: tuple[str, str], function: Callable, *args) -> Job:
+        """Queue a function call as job, raise QueueFull if no space left."""
+        with self._lock:
+            self._purge()
+            active = [x for x in self._jobs.values() if x.finished is None]
+            if len(active) >= self.max_jobs:
+                raise QueueFull("Too many jobs in queue", retry_after=10)
+            job = Job(owner)
+            self._jobs[job.id] = job
+        logger.debug("Submitting job %s.", job.id)
+        self._executor.submit(self._run, job, function, *args)
+        return job
+
+    def get(self, job_id: uuid.UUID) -> Optional[Job]:
+        """Return the job with the id, None if unknown or expired."""
+        with self._lock:
+            self._purge()
+            return self._jobs.get(job_id, None)
+
+    def metrics(self) -> dict:
+        """Return the number of jobs on each status."""
+        with self._lock:
+            self._purge()
+            statuses = [x.status for x in self._jobs.values()]
+        return {x.value: statuses.count(x) for x in JobStatus}
+
+    def shutdown(self) -> None:
+        """Cancel queued jobs and stop worker threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: Job, function: Callable, *args) -> None:
+        job.status, job.started = JobStatus.RUNNING, dt.datetime.now(dt.timezone.utc)
+        status, error = JobStatus.DONE, None
+        try:
+            job.result = function(*args)
+        except CookiecutterException as err:
+            logger.error("Job %s cookiecutter error: %s", job.id, err)
+            status, error = JobStatus.FAILED, err.args[0]
+        except Exception as err:  # pylint: disable=broad-except
+            logger.error("Job %s error: %s", job.id, err)
+            status, error = JobStatus.FAILED, "Internal Server Error"
+        job.finished = dt.datetime.now(dt.timezone.utc)
+        job.expires = job.finished + dt.timedelta(seconds=self.ttl)
+        job.status, job.error = status, error
+
+    def _purge(self) -> None:
+        now = dt.datetime.now(dt.timezone.utc)
+        for job in [x for x in self._jobs.values() if x.expires and x.expires < now]:
+            logger.debug("Removing expired job %s.", job.id)
+            del self._jobs[job.id]
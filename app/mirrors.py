@@ -0,0 +1,237 @@
+"""Local mirror cache of the template repositories used to generate projects.
+
+Each `gitLink` is kept as a bare repository that only fetches the objects
+missing for the requested ref, and each (`gitLink`, `gitCheckout`) pair is a
+worktree of it. The mirrors live on disk so they are shared between requests
+and workers, file locks protect them from concurrent refresh and eviction.
+"""
+
+import contextlib
+import fcntl
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Generator, NamedTuple, Optional
+
+import git
+from cookiecutter.exceptions import RepositoryCloneFailed
+from fastapi import FastAPI, Request
+
+from app.config import Settings
+
+logger = logging.getLogger(__name__)
+
+
+def init_app(app: FastAPI) -> None:
+    """Initialize template mirrors configuration."""
+    settings: Settings = app.state.settings
+    path = settings.mirrors_path or os.path.join(tempfile.gettempdir(), "mirrors")
+    app.state.mirrors = MirrorCache(path, settings.mirrors_ttl, settings.mirrors_size)
+
+
+def get_mirrors(request: Request) -> "MirrorCache":
+    """Return the template mirrors cache."""
+    return request.app.state.mirrors
+
+
+class Checkout(NamedTuple):
+    """Local checkout of a template repository."""
+
+    path: Path
+    revision: str
+
+
+class FetchStats:
+    """Fetches of a repository with bytes received and time spent."""
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self) -> None:
+        self.fetches = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+
+class MirrorCache:
+    """On disk cache of template checkouts keyed by (gitLink, gitCheckout)."""
+
+    def __init__(self, path: str, ttl: int, max_size: int) -> None:
+        self.path = Path(path)
+        (self.path / "checkouts").mkdir(parents=True, exist_ok=True)
+        (self.path / "repos").mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_size = max_size
+        self.stats: dict[str, FetchStats] = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mirrors")
+        self._scheduled: set[str] = set()
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def checkout(self, git_link: str, git_checkout: Optional[str]) -> Generator[Checkout, None, None]:
+        """Context manager that yields the local checkout of a template.
+        The checkout is protected from refresh and eviction while in use.
+        """
+        key = _key(git_link, git_checkout)
+        while True:
+            with self._locked(self.path / "checkouts" / key, fcntl.LOCK_SH) as entry:
+                if (entry / "revision").exists():
+                    os.utime(entry.with_suffix(".lock"))  # Mark last use
+                    if time.time() - _fetched(entry) > self.ttl:
+                        self._schedule(key, self._refresh, key, git_link, git_checkout)
+                    logger.debug("Using mirror %s for '%s'.", entry, git_link)
+                    yield Checkout(entry / "repo", _revision(entry))
+                    return
+            with self._locked(self.path / "checkouts" / key, fcntl.LOCK_EX) as entry:
+                if not (entry / "revision").exists():
+                    self._create(entry, git_link, git_checkout)
+            self._schedule("evict", self._evict)
+
+    def metrics(self) -> dict:
+        """Return the fetch counters in total and per repository."""
+        with self._lock:
+            repositories = [{"gitLink": k, **vars(v)} for k, v in self.stats.items()]
+        return {
+            "fetches": sum(x["fetches"] for x in repositories),
+            "bytes": sum(x["bytes"] for x in repositories),
+            "seconds": sum(x["seconds"] for x in repositories),
+            "repositories": repositories,
+        }
+
+    @contextlib.contextmanager
+    def _locked(self, path: Path, operation: int) -> Generator[Path, None, None]:
+        with open(path.with_suffix(".lock"), "a", encoding="utf-8") as lock_file:
+            fcntl.flock(lock_file, operation)
+            try:
+                yield path
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _schedule(self, name: str, function, *args) -> None:
+        with self._lock:
+            if name in self._scheduled:
+                return
+            self._scheduled.add(name)
+        self._executor.submit(self._run, name, function, *args)
+
+    def _run(self, name: str, function, *args) -> None:
+        try:
+            function(*args)
+        except Exception as err:  # pylint: disable=broad-except
+            logger.warning("Background mirror task '%s' failed: %s", name, err)
+        finally:
+            with self._lock:
+                self._scheduled.discard(name)
+
+    def _create(self, entry: Path, git_link: str, git_checkout: Optional[str]) -> None:
+        logger.info("Creating mirror of '%s' at '%s'.", git_link, git_checkout)
+        shutil.rmtree(entry, ignore_errors=True)
+        entry.mkdir()
+        try:
+            with self._locked(self._repo_path(git_link), fcntl.LOCK_EX) as repo_path:
+                commit = self._fetch(repo_path, git_link, git_checkout)
+                repo = git.Repo(repo_path)
+                repo.git.worktree("prune")  # Forget evicted worktrees
+                repo.git.worktree("add", "--detach", f"{entry / 'repo'}", commit)
+            _write_metadata(entry)
+        except git.GitCommandError as err:
+            logger.debug("Clone error: %s", err)
+            shutil.rmtree(entry, ignore_errors=True)
+            raise RepositoryCloneFailed(f"Failed to clone '{git_link}' at '{git_checkout}'.") from err
+
+    def _refresh(self, key: str, git_link: str, git_checkout: Optional[str]) -> None:
+        with self._locked(self.path / "checkouts" / key, fcntl.LOCK_EX) as entry:
+            if not (entry / "revision").exists() or time.time() - _fetched(entry) <= self.ttl:
+                return  # Evicted or refreshed by another worker
+            logger.info("Refreshing mirror %s.", entry)
+            with self._locked(self._repo_path(git_link), fcntl.LOCK_EX) as repo_path:
+                commit = self._fetch(repo_path, git_link, git_checkout)
+            git.Repo(entry / "repo").git.checkout("--detach", commit)
+            _write_metadata(entry)
+
+    def _fetch(self, repo_path: Path, git_link: str, git_checkout: Optional[str]) -> str:
+        """Fetch only the objects missing for the ref, return its commit."""
+        if not repo_path.exists():
+            repo = git.Repo.init(repo_path, bare=True)
+            repo.create_remote("origin", git_link)
+        repo = git.Repo(repo_path)
+        size, start = _objects_size(repo_path), time.perf_counter()
+        try:  # Branches, tags and (when the server allows) commits
+            repo.git.fetch("--no-tags", "origin", git_checkout or "HEAD")
+            commit = repo.git.rev_parse("FETCH_HEAD^{commit}")
+        except git.GitCommandError:
+            logger.debug("Fetch of '%s' failed, fetching all refs.", git_checkout)
+            repo.git.fetch("--tags", "origin", "+refs/heads/*:refs/remotes/origin/*")
+            commit = repo.git.rev_parse(f"{git_checkout}^{{commit}}")
+        received, seconds = _objects_size(repo_path) - size, time.perf_counter() - start
+        logger.info("Fetched %s bytes of '%s' in %.3f seconds.", received, git_link, seconds)
+        with self._lock:
+            stats = self.stats.setdefault(git_link, FetchStats())
+            stats.fetches, stats.bytes, stats.seconds = stats.fetches + 1, stats.bytes + received, stats.seconds + seconds
+        return commit
+
+    def _repo_path(self, git_link: str) -> Path:
+        return self.path / "repos" / f"{hashlib.sha256(git_link.encode()).hexdigest()}.git"
+
+    def _evict(self) -> None:
+        entries = [x for x in (self.path / "checkouts").iterdir() if x.is_dir()]
+        repos = [x for x in (self.path / "repos").iterdir() if x.is_dir()]
+        total = sum(_size(x) for x in entries) + sum(_objects_size(x) for x in repos)
+        for entry in sorted(entries, key=lambda x: x.with_suffix(".lock").stat().st_mtime):
+            if total <= self.max_size:
+                break
+            try:
+                with self._locked(entry, fcntl.LOCK_EX | fcntl.LOCK_NB):
+                    logger.info("Evicting mirror %s.", entry)
+                    total -= _size(entry)
+                    shutil.rmtree(entry, ignore_errors=True)
+            except BlockingIOError:
+                continue  # Mirror in use, try next one
+        for repo_path in repos:
+            if total <= self.max_size:
+                break
+            try:
+                with self._locked(repo_path, fcntl.LOCK_EX | fcntl.LOCK_NB):
+                    git.Repo(repo_path).git.worktree("prune")
+                    if any((repo_path / "worktrees").glob("*")):
+                        continue  # Repository with checkouts left
+                    logger.info("Evicting repository %s.", repo_path)
+                    total -= _objects_size(repo_path)
+                    shutil.rmtree(repo_path, ignore_errors=True)
+            except BlockingIOError:
+                continue  # Repository in use, try next one
+
+
+def _key(git_link: str, git_checkout: Optional[str]) -> str:
+    return hashlib.sha256(f"{git_link}@{git_checkout}".encode()).hexdigest()
+
+
+def _write_metadata(entry: Path) -> None:
+    size = sum(x.stat().st_size for x in (entry / "repo").rglob("*") if x.is_file())
+    (entry / "size").write_text(str(size), encoding="utf-8")
+    (entry / "fetched").write_text(str(time.time()), encoding="utf-8")
+    (entry / "revision").write_text(git.Repo(entry / "repo").head.commit.hexsha, encoding="utf-8")
+
+
+def _fetched(entry: Path) -> float:
+    return float((entry / "fetched").read_text(encoding="utf-8"))
+
+
+def _revision(entry: Path) -> str:
+    return (entry / "revision").read_text(encoding="utf-8")
+
+
+def _size(entry: Path) -> int:
+    try:
+        return int((entry / "size").read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return 0
+
+
+def _objects_size(repo_path: Path) -> int:
+    return sum(x.stat().st_size for x in (repo_path / "objects").rglob("*") if x.is_file())
@@ -6,20 +6,27 @@ See SQLAlchemy documentation for information on how to work with the models.
 # pylint: disable=missing-class-docstring,E1102
 # pylint: disable=missing-function-docstring
 from datetime import datetime
+from typing import Optional
 from uuid import uuid4
 
 import sqlalchemy as sa
 from sqlalchemy import orm, sql
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from sqlalchemy.ext import associationproxy as ap
 from sqlalchemy.ext.hybrid import hybrid_property
 
 from app.database import Base, UniqueMixin
 
 
+#: Full text search document of a template, words of the title rank first
+SEARCH_DOCUMENT = "setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', summary), 'B')"
+
+
 class Template(Base):
     """Template model definition."""
 
+    __table_args__ = (sa.Index("ix_template_search", "search", postgresql_using="gin"),)
+
     id: orm.Mapped[UUID] = orm.mapped_column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid4)
     created: orm.Mapped[datetime] = orm.mapped_column(sa.DateTime(timezone=True), server_default=sql.func.now(), nullable=False)
     modified: orm.Mapped[datetime] = orm.mapped_column(sa.DateTime(timezone=True), server_default=sql.func.now(), server_onupdate=sql.func.now(), nullable=False)
@@ -32,6 +39,9 @@ class Template(Base):
     gitCheckout: orm.Mapped[str] = orm.mapped_column(nullable=True)
     scores: orm.Mapped[list["Score"]] = orm.relationship(cascade="all, delete", passive_deletes=True)
     score: orm.Mapped[float] = orm.mapped_column(nullable=True)
+    fields: orm.Mapped[Optional[list]] = orm.mapped_column(JSONB, nullable=True)  # Parsed CutterForm
+    fieldsHash: orm.Mapped[Optional[str]] = orm.mapped_column(nullable=True)  # Hash of cookiecutter.json
+    search: orm.Mapped[Optional[str]] = orm.mapped_column(TSVECTOR, sa.Computed(SEARCH_DOCUMENT, persisted=True), deferred=True)
     tag_associations: orm.Mapped[set["TagAssociation"]] = orm.relationship(back_populates="template", cascade="all, delete-orphan")
     tags: ap.AssociationProxy[set["Tag"]] = ap.association_proxy("tag_associations", "name", creator=lambda x: TagAssociation(name=x))
 
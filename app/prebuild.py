@@ -0,0 +1,92 @@
+"""Background builds of the default-options archives of the templates.
+
+Most generations use the defaults of `cookiecutter.json`, so after a database
+sync the archive for the default options can be built ahead of time and
+requests with default options are served from the artifacts store. The
+archives are addressed by template revision, so a changed `gitLink`,
+`gitCheckout` or resolved commit is never answered with an old archive.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable
+
+from fastapi import FastAPI, Request
+
+from app.config import Settings
+
+logger = logging.getLogger(__name__)
+
+
+def init_app(app: FastAPI) -> None:
+    """Initialize default-options archives prebuilder."""
+    settings: Settings = app.state.settings
+    app.state.prebuilder = Prebuilder(settings.prebuild_workers, settings.prebuild_templates)
+    app.add_event_handler("shutdown", app.state.prebuilder.shutdown)
+
+
+def get_prebuilder(request: Request) -> "Prebuilder":
+    """Return the default-options archives prebuilder."""
+    return request.app.state.prebuilder
+
+
+class Prebuilder:
+    """Bounded pool of threads building the archives of allowed templates.
+    An empty allow-list allows all the templates. Builds are scheduled once
+    per template revision (id, gitLink and gitCheckout).
+    """
+
+    def __init__(self, workers: int, allowlist: Iterable[str]) -> None:
+        self.allowlist = set(allowlist)
+        self.built = 0
+        self.failed = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prebuild")
+        self._scheduled: set[tuple] = set()
+        self._lock = threading.Lock()
+
+    def allowed(self, source: Any) -> bool:
+        """Return True if the template id or repoFile is allowed."""
+        return not self.allowlist or bool({f"{source.id}", source.repoFile} & self.allowlist)
+
+    def submit(self, sources: Iterable[Any], build: Callable[[Any], Any]) -> int:
+        """Schedule the build of the allowed templates not already
+        scheduled at the same revision, return the number of builds scheduled.
+        """
+        scheduled = 0
+        for source in filter(self.allowed, sources):
+            with self._lock:
+                if _key(source) in self._scheduled:
+                    continue
+                self._scheduled.add(_key(source))
+            self._executor.submit(self._run, source, build)
+            scheduled += 1
+        logger.info("Scheduled %s default-options archive builds.", scheduled)
+        return scheduled
+
+    def metrics(self) -> dict:
+        """Return the prebuild counters."""
+        with self._lock:
+            return {"scheduled": len(self._scheduled), "built": self.built, "failed": self.failed}
+
+    def shutdown(self) -> None:
+        """Cancel scheduled builds without waiting for the running ones."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, source: Any, build: Callable[[Any], Any]) -> None:
+        try:
+            build(source)
+            logger.debug("Default-options archive of %s built.", source.repoFile)
+            with self._lock:
+                self.built += 1
+        except Exception as err:  # pylint: disable=broad-except
+            logger.warning("Prebuild of template %s failed: %s", source.repoFile, err)
+            with self._lock:
+                self.failed += 1
+        finally:
+            with self._lock:
+                self._scheduled.discard(_key(source))
+
+
+def _key(source: Any) -> tuple:
+    return f"{source.id}", source.gitLink, source.gitCheckout
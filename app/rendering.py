@@ -0,0 +1,288 @@
+"""Rendering of cookiecutter templates outside the application event loop.
+
+Templates are rendered in a pool of worker processes, so a slow render does
+not block other requests and generation throughput scales with the cores.
+Templates without hooks are rendered into memory instead of disk.
+"""
+
+import collections
+import fnmatch
+import logging
+import multiprocessing
+import os
+import re
+import stat
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple, Optional
+
+from binaryornot.check import is_binary
+from cookiecutter.config import get_user_config
+from cookiecutter.exceptions import EmptyDirNameException, UndefinedVariableInTemplate
+from cookiecutter.find import find_template
+from cookiecutter.generate import generate_context
+from cookiecutter.main import cookiecutter
+from cookiecutter.prompt import prompt_for_config
+from cookiecutter.utils import create_env_with_context
+from fastapi import FastAPI, Request
+from jinja2 import FileSystemLoader, Template
+from jinja2.exceptions import UndefinedError
+
+from app.config import Settings
+
+logger = logging.getLogger(__name__)
+
+#: Compiled templates of the rendering process, see `init_worker`
+_cache: Optional["TemplateCache"] = None
+
+
+def init_app(app: FastAPI) -> None:
+    """Initialize template rendering pool."""
+    settings: Settings = app.state.settings
+    app.state.renderer = Renderer(settings.render_processes, settings.render_tasks, settings.render_cache)
+    app.add_event_handler("shutdown", app.state.renderer.shutdown)
+
+
+def get_renderer(request: Request) -> "Renderer":
+    """Return the template renderer."""
+    return request.app.state.renderer
+
+
+class Renderer:
+    """Pool of processes to render templates, recycled after `max_tasks`.
+    Each process keeps compiled templates for memory renders up to `cache_size`
+    bytes, hits and misses of all processes are counted here.
+    """
+
+    def __init__(self, processes: Optional[int], max_tasks: int, cache_size: int) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._executor = None
+        if processes != 0:  # Zero processes renders in the calling thread
+            context = multiprocessing.get_context("spawn")  # Required to recycle
+            self._executor = ProcessPoolExecutor(processes, context, init_worker, (cache_size,), max_tasks_per_child=max_tasks)
+        else:
+            init_worker(cache_size)
+
+    def render_all(self, template_dir: str, outputs: dict[str, dict]) -> list[str]:
+        """Render a template into each output folder with its extra context.
+        Renders run in parallel when the pool has more than one process.
+        """
+        if self._executor is None:
+            return [render(template_dir, k, v) for k, v in outputs.items()]
+        logger.debug("Submitting %s renders of %s to process pool.", len(outputs), template_dir)
+        futures = [self._executor.submit(render, template_dir, k, v) for k, v in outputs.items()]
+        return [future.result() for future in futures]
+
+    def render_files(self, template_dir: str, revision: str, variants: dict[str, dict]) -> dict[str, "RenderedFile"]:
+        """Render a template revision into memory once per variant extra context.
+        Returns a single file map with each variant under its key folder.
+        """
+        if self._executor is None:
+            results = [render_memory(template_dir, revision, v) for v in variants.values()]
+        else:
+            logger.debug("Submitting %s memory renders of %s to process pool.", len(variants), template_dir)
+            futures = [self._executor.submit(render_memory, template_dir, revision, v) for v in variants.values()]
+            results = [future.result() for future in futures]
+        files = {}
+        for prefix, (result, hit) in zip(variants, results):
+            if prefix:  # Variant folder as created by cookiecutter
+                files[prefix] = RenderedFile(None, FOLDER_MODE)
+            files.update({os.path.join(prefix, k): v for k, v in result.items()})
+            with self._lock:
+                self.hits, self.misses = self.hits + hit, self.misses + (not hit)
+        return files
+
+    def metrics(self) -> dict:
+        """Return the compiled templates cache counters."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0}
+
+    def shutdown(self) -> None:
+        """Shutdown the rendering processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def render(template_dir: str, output_dir: str, extra_context: dict) -> str:
+    """Render a cookiecutter template without user input."""
+    return cookiecutter(
+        template=template_dir,
+        no_input=True,
+        extra_context=extra_context,
+        output_dir=output_dir,
+    )
+
+
+#: Mode of the folders created on memory renders
+FOLDER_MODE = stat.S_IFDIR | 0o755
+
+
+class RenderedFile(NamedTuple):
+    """Content and mode of a rendered file, content is None for folders."""
+
+    content: Optional[bytes]
+    mode: int
+
+
+def in_memory(template_dir: str, context: dict) -> bool:
+    """Return True if the template can be rendered without cookiecutter,
+    it has no hooks, nested templates or custom Jinja extensions.
+    """
+    if os.path.isdir(os.path.join(template_dir, "hooks")):
+        return False
+    return not {"template", "templates", "_extensions"} & set(context)
+
+
+def init_worker(cache_size: int) -> None:
+    """Create the compiled templates cache of the rendering process."""
+    global _cache  # pylint: disable=global-statement
+    _cache = TemplateCache(cache_size)
+
+
+def render_memory(template_dir: str, revision: str, extra_context: dict) -> tuple[dict[str, RenderedFile], bool]:
+    """Render a cookiecutter template without user input into a file map.
+    Paths and contents are rendered as `cookiecutter` would write them.
+    Returns the file map and if the compiled template was cached.
+    """
+    logger.debug("Generating context of %s.", template_dir)
+    config = get_user_config()
+    context_file = os.path.join(template_dir, "cookiecutter.json")
+    context = generate_context(context_file, config["default_context"], extra_context)
+    context["_cookiecutter"] = {k: v for k, v in context["cookiecutter"].items() if not k.startswith("_")}
+    context["cookiecutter"].update(prompt_for_config(context, no_input=True))
+    context["cookiecutter"].update(_template=template_dir, _repo_dir=template_dir, _checkout=None)
+    context["cookiecutter"]["_output_dir"] = os.path.abspath(".")
+
+    compiled = _cache.get(template_dir, revision)
+    if compiled is None:
+        compiled = CompiledTemplate(template_dir, context)
+        _cache.add(template_dir, revision, compiled)
+        return compiled.render(context), False
+    return compiled.render(context), True
+
+
+class TemplateCache:
+    """LRU cache of compiled templates per (template, revision), bounded by
+    the approximate size of their sources in bytes.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._templates: collections.OrderedDict = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, template_dir: str, revision: str) -> Optional["CompiledTemplate"]:
+        """Return the compiled template revision, None if not cached."""
+        with self._lock:
+            compiled = self._templates.get((template_dir, revision), None)
+            if compiled is not None:
+                self._templates.move_to_end((template_dir, revision))
+            return compiled
+
+    def add(self, template_dir: str, revision: str, compiled: "CompiledTemplate") -> None:
+        """Cache a compiled template revision and evict least recently used."""
+        with self._lock:
+            self._templates[(template_dir, revision)] = compiled
+            total = sum(x.size for x in self._templates.values())
+            while total > self.max_size and self._templates:
+                _, evicted = self._templates.popitem(last=False)
+                total -= evicted.size
+
+
+class _Node(NamedTuple):
+    path: Template  # Compiled path relative to the project folder
+    suffix: str  # Path inside folders copied without render
+    infile: str
+    mode: int
+    content: Optional[bytes]  # None for folders and rendered files
+    template: Optional[Template]  # None for folders and copied files
+    newline: Optional[str]
+
+
+class CompiledTemplate:
+    """Template tree loaded into memory with paths and contents compiled,
+    so renders of the same revision only pay for rendering.
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, template_dir: str, context: dict) -> None:
+        logger.debug("Compiling template %s.", template_dir)
+        env = create_env_with_context(context)
+        root = find_template(template_dir, env)
+        env.loader = FileSystemLoader([root, os.path.join(root, "../templates")])
+        copy_patterns = context["cookiecutter"].get("_copy_without_render", [])
+        newline = context["cookiecutter"].get("_new_lines", None)
+        self.project_dir = env.from_string(os.path.basename(root))
+        self.nodes: list[_Node] = []
+        self.size = 0
+
+        for path, dirs, names in os.walk(root):
+            relpath = os.path.relpath(path, root)
+            for name in list(dirs):
+                infile = os.path.normpath(os.path.join(relpath, name))
+                if not any(fnmatch.fnmatch(infile, x) for x in copy_patterns):
+                    self.nodes.append(_Node(env.from_string(infile), "", infile, FOLDER_MODE, None, None, None))
+                    continue
+                dirs.remove(name)  # Copied without render
+                for suffix, (content, mode) in _copy_tree(os.path.join(root, infile)).items():
+                    self.nodes.append(_Node(env.from_string(infile), suffix, infile, mode, content, None, None))
+                    self.size += len(content or b"")
+            for name in names:
+                infile = os.path.normpath(os.path.join(relpath, name))
+                with open(os.path.join(root, infile), "rb") as file:
+                    content, mode = file.read(), os.fstat(file.fileno()).st_mode
+                self.size += len(content)
+                if any(fnmatch.fnmatch(infile, x) for x in copy_patterns) or is_binary(os.path.join(root, infile)):
+                    self.nodes.append(_Node(env.from_string(infile), "", infile, mode, content, None, None))
+                    continue
+                template = env.get_template(infile.replace(os.path.sep, "/"))
+                line_end = newline or _newline(content.decode("utf-8"))
+                self.nodes.append(_Node(env.from_string(infile), "", infile, mode, None, template, line_end))
+
+    def render(self, context: dict) -> dict[str, RenderedFile]:
+        """Render the compiled paths and contents with the context."""
+        project_dir = _render(self.project_dir, context, "Unable to create project directory", "")
+        if not project_dir:
+            raise EmptyDirNameException("Error: directory name is empty")
+        files = {project_dir: RenderedFile(None, FOLDER_MODE)}
+        for node in self.nodes:
+            message = "Unable to create directory" if stat.S_ISDIR(node.mode) else "Unable to create file"
+            outfile = _render(node.path, context, message, node.infile)
+            outfile = os.path.normpath(os.path.join(project_dir, outfile, node.suffix))
+            if not stat.S_ISDIR(node.mode) and outfile in files:  # Rendered file name is empty
+                continue
+            if node.template is None:
+                files[outfile] = RenderedFile(node.content, node.mode)
+            else:
+                text = _render(node.template, context, "Unable to create file", node.infile)
+                files[outfile] = RenderedFile(text.replace("\n", node.newline).encode("utf-8"), node.mode)
+        return files
+
+
+def _render(template: Template, context: dict, message: str, infile: str) -> str:
+    try:
+        return template.render(**context)
+    except UndefinedError as err:
+        raise UndefinedVariableInTemplate(f"{message} '{infile}'", err, context) from err
+
+
+def _copy_tree(source: str) -> dict[str, RenderedFile]:
+    files = {}
+    for path, _, names in os.walk(source):
+        folder = os.path.relpath(path, source)
+        files[os.path.normpath(folder) if folder != "." else ""] = RenderedFile(None, os.stat(path).st_mode)
+        for name in names:
+            with open(os.path.join(path, name), "rb") as file:
+                content, mode = file.read(), os.fstat(file.fileno()).st_mode
+            files[os.path.normpath(os.path.join(folder, name))] = RenderedFile(content, mode)
+    return files
+
+
+def _newline(text: str) -> str:
+    """Return the line ending of the first line, as detected by `open`."""
+    match = re.search("\r\n|\r|\n", text)
+    return match.group() if match else os.linesep
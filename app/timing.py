@@ -0,0 +1,128 @@
+"""Timing of the project generation phases.
+
+Each generation measures its phases with a `Timer`, the timings are sent on
+the `Server-Timing` header, logged as `phase=milliseconds` pairs and
+aggregated into latency histograms per template and phase.
+"""
+
+import bisect
+import contextlib
+import logging
+import threading
+import time
+from typing import Generator, Iterable, Optional
+
+from fastapi import FastAPI, Request
+
+logger = logging.getLogger(__name__)
+
+#: Upper bounds in milliseconds of the histogram buckets, last one is +Inf
+BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+def init_app(app: FastAPI) -> None:
+    """Initialize generation latency histograms."""
+    app.state.latencies = Latencies()
+
+
+def get_latencies(request: Request) -> "Latencies":
+    """Return the generation latency histograms."""
+    return request.app.state.latencies
+
+
+def get_timer() -> "Timer":
+    """Return a new timer for the request phases."""
+    return Timer()
+
+
+class Timer:
+    """Durations of the phases of a single generation."""
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.phases: dict[str, float] = {}
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Generator[None, None, None]:
+        """Context manager that adds the time spent inside to the phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def timed(self, name: str, chunks: Iterable[bytes]) -> Generator[bytes, None, None]:
+        """Generator that adds the time spent producing the chunks to the phase."""
+        iterator = iter(chunks)
+        while True:
+            with self.phase(name):
+                chunk = next(iterator, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    def header(self) -> str:
+        """Return the phases in `Server-Timing` header format."""
+        phases = {**self.phases, "total": time.perf_counter() - self.start}
+        return ", ".join(f"{k};dur={v * 1000:.1f}" for k, v in phases.items())
+
+    def log(self, template_id: str) -> None:
+        """Log the phases in milliseconds as `phase=milliseconds` pairs."""
+        phases = {**self.phases, "total": time.perf_counter() - self.start}
+        timings = " ".join(f"{k}={v * 1000:.1f}" for k, v in phases.items())
+        logger.info("Generation of template %s timings: %s", template_id, timings)
+
+
+class Histogram:
+    """Count of observations per latency bucket with their sum."""
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+
+
+class Latencies:
+    """Latency histograms per template and generation phase."""
+
+    def __init__(self) -> None:
+        self._histograms: dict[tuple[str, str], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, template_id: str, timer: Timer) -> None:
+        """Add the phases of a finished generation and log them."""
+        timer.log(template_id)
+        with self._lock:
+            for name, seconds in timer.phases.items():
+                histogram = self._histograms.setdefault((template_id, name), Histogram())
+                histogram.counts[bisect.bisect_left(BUCKETS, seconds * 1000)] += 1
+                histogram.sum += seconds * 1000
+
+    def track(self, template_id: str, timer: Timer, chunks: Iterable[bytes]) -> Generator[bytes, None, None]:
+        """Generator that yields the chunks and observes the timer at the end."""
+        yield from chunks
+        self.observe(template_id, timer)
+
+    def snapshot(self, template_id: Optional[str] = None) -> list[dict]:
+        """Return the histograms with cumulative bucket counts, optionally
+        only the ones of a template.
+        """
+        with self._lock:
+            items = [(k, list(v.counts), v.sum) for k, v in self._histograms.items()]
+        histograms = []
+        for (template, name), counts, total in sorted(items):
+            if template_id and template != template_id:
+                continue
+            cumulative = [sum(counts[: i + 1]) for i in range(len(counts))]
+            buckets = dict(zip([*map(str, BUCKETS), "+Inf"], cumulative))
+            histograms.append({"template": template, "phase": name, "count": cumulative[-1], "sum": total, "buckets": buckets})
+        return histograms
+
+
+class UntrackedLatencies(Latencies):
+    """Latencies only logged, for generations not requested by users."""
+
+    def observe(self, template_id: str, timer: Timer) -> None:
+        """Log the phases of a finished generation without adding them."""
+        timer.log(template_id)
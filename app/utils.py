@@ -1,9 +1,12 @@
 """Utility functions for the app."""
 
+import base64
+import binascii
 import json
 import logging
+import re
 import tempfile
-import urllib
+import uuid
 from typing import Generator
 
 logger = logging.getLogger(__name__)
@@ -65,18 +68,97 @@ def validate_sort_by_field(option, field):
     """Validate sort by field."""
     if option not in ("+", "-"):
         raise ValueError(f"Invalid sort by option '{option}'.")
-    if field not in ("id", "score", "title"):
+    if field not in ("id", "relevance", "score", "title"):
         raise ValueError(f"Invalid sort by field '{field}'.")
     return (option, field)
 
 
 def validate_sort_by(value: str) -> str:
     """Validate sort by string."""
-    for item in value.split(","):
-        validate_sort_by_field(item[0], item[1:])
+    fields = [validate_sort_by_field(item[0], item[1:])[1] for item in value.split(",")]
+    for field in {x for x in fields if fields.count(x) > 1}:
+        raise ValueError(f"Repeated sort by field '{field}'.")
     return value
 
 
+def validate_keyword(value: str) -> str:
+    """Validate keyword has words to search."""
+    if not search_phrases([value]):
+        raise ValueError(f"Keyword '{value}' has no words to search.")
+    return value
+
+
+def search_phrases(keywords: list[str]) -> list[list[str]]:
+    """Return the lowercase words of each keyword, skipping keywords
+    without words.
+    """
+    phrases = [re.findall(r"[^\W_]+", keyword.lower()) for keyword in keywords]
+    return [words for words in phrases if words]
+
+
+def search_query(keywords: list[str]) -> str:
+    """Return the full text search query matching all keywords, the words
+    of each keyword in sequence and the last one as a prefix.
+    """
+    return " & ".join(f"({' <-> '.join(words)}:*)" for words in search_phrases(keywords))
+
+
+def encode_cursor(sort_by: str, values: list) -> str:
+    """Encode the sort order and the sort values of the last item of a page
+    into an opaque cursor.
+    """
+    data = json.dumps([sort_by, values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, list]:
+    """Decode a cursor into the sort order and the sort values."""
+    try:
+        sort_by, values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        validate_sort_by(sort_by)
+    except (AttributeError, binascii.Error, IndexError, TypeError, ValueError) as err:
+        raise ValueError("Invalid cursor.") from err
+    if not isinstance(values, list) or len(values) != len(sort_keys(sort_by)):
+        raise ValueError("Invalid cursor.")
+    if not all(_cursor_value(field, value) for (_, field), value in zip(sort_keys(sort_by), values)):
+        raise ValueError("Invalid cursor.")
+    return sort_by, values
+
+
+#: Types of the cursor values of each sort field, score can be null
+CURSOR_TYPES = {"id": str, "relevance": (int, float), "score": (int, float, type(None)), "title": str}
+
+
+def _cursor_value(field: str, value) -> bool:
+    """Return True if the value has the type of the sort field."""
+    if isinstance(value, bool) or not isinstance(value, CURSOR_TYPES[field]):
+        return False
+    if field == "id":
+        try:
+            uuid.UUID(value)
+        except ValueError:
+            return False
+    return True
+
+
+def validate_cursor(value: str) -> str:
+    """Validate cursor string."""
+    decode_cursor(value)
+    return value
+
+
+def sort_keys(sort_by: str) -> list[tuple[str, str]]:
+    """Return the (option, field) sort keys, ending by id so the order of
+    items is unique. Keys after id are dropped as they never apply.
+    """
+    keys = []
+    for item in sort_by.split(","):
+        keys.append((item[0], item[1:]))
+        if item[1:] == "id":
+            return keys
+    return [*keys, ("+", "id")]
+
+
 def validate_input(value: str) -> str:
     """Sanitize input string."""
     if "{" in value or "}" in value or "%" in value or "#" in value:
@@ -100,18 +182,17 @@ def unique(session, cls, hashfunc, queryfunc, args, kwds):
         return obj
 
 
-def fetch_arguments(template):
-    """Fetch cookiecutter.json from template object."""
-    logger.debug("Fetching cookiecutter.json file.")
-    url = f"{template.gitLink}/raw/{template.gitCheckout}/cookiecutter.json"
-    if url.lower().startswith("http"):
-        req = urllib.request.Request(url)
-    else:
-        raise ValueError(f"Bad url in '{template}'.") from None
+def load_arguments(template_dir):
+    """Load cookiecutter.json from a local template checkout."""
+    logger.debug("Loading cookiecutter.json file from %s.", template_dir)
+    with open(f"{template_dir}/cookiecutter.json", "r", encoding="utf-8") as file:
+        return json.load(file)
+
 
-    logger.debug("Load and parse request into json, %s.", req)
-    with urllib.request.urlopen(req) as response:  # nosec (validated above)
-        return json.load(response)
+def normalize_options(fields_data, options):
+    """Sort options and drop the ones equal to cookiecutter.json defaults."""
+    defaults = {k: v[0] if isinstance(v, list) else v for k, v in fields_data.items()}
+    return {k: options[k] for k in sorted(options) if k not in defaults or options[k] != defaults[k]}
 
 
 def str2bool(string):
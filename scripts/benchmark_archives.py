@@ -0,0 +1,63 @@
+"""Compare CPU time and size of the archive formats on a synthetic project.
+
+Usage: python scripts/benchmark_archives.py [--files 200] [--binary 20]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from app.archives import ArchiveFormat, folder_entries, stream  # noqa: E402 pylint: disable=wrong-import-position
+
+LEVELS = {
+    ArchiveFormat.STORE: [None],
+    ArchiveFormat.ZIP: [1, 6, 9],
+    ArchiveFormat.TAR_GZ: [1, 6, 9],
+    ArchiveFormat.TAR_ZST: [1, 3, 9],
+}
+
+
+def make_project(folder: str, text_files: int, binary_files: int) -> int:
+    """Write a project of source-like text files and random binary files."""
+    rand, size = random.Random(0), 0
+    words = ["def", "class", "return", "import", "self", "value", "project", "=", "(", ")", ":"]
+    for i in range(text_files):
+        path = os.path.join(folder, f"package_{i % 10}", f"module_{i}.py")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        lines = (" ".join(rand.choices(words, k=12)) for _ in range(400))
+        with open(path, "w", encoding="utf-8") as file:
+            size += file.write("\n".join(lines))
+    for i in range(binary_files):
+        path = os.path.join(folder, "data", f"blob_{i}.bin")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            size += file.write(rand.randbytes(256 * 1024))
+    return size
+
+
+def main() -> None:
+    """Print CPU time, output size and ratio for each format and level."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=200, help="Number of text files")
+    parser.add_argument("--binary", type=int, default=20, help="Number of 256KiB binary files")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        total = make_project(folder, args.files, args.binary)
+        print(f"Project: {args.files} text + {args.binary} binary files, {total / 1024**2:.1f} MiB")
+        print(f"{'format':<10}{'level':>6}{'cpu (s)':>10}{'size (MiB)':>12}{'ratio':>8}")
+        for archive_format, levels in LEVELS.items():
+            for level in levels:
+                start, size = time.process_time(), 0
+                for chunk in stream(folder_entries(folder), archive_format, level):
+                    size += len(chunk)
+                elapsed = time.process_time() - start
+                print(f"{archive_format.value:<10}{level or '-':>6}{elapsed:>10.3f}{size / 1024**2:>12.2f}{size / total:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
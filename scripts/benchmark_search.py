@@ -0,0 +1,123 @@
+"""Compare the keywords search with `LIKE` clauses and with the full text
+search index on a synthetic catalog of templates.
+
+Templates are created in a temporary `benchmark` schema of the database
+configured with the POSTGRES_* environment variables, dropped at the end.
+
+Usage: python scripts/benchmark_search.py [--templates 100000] [--repeat 20]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+
+import sqlalchemy as sa
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from app import models, utils  # noqa: E402 pylint: disable=wrong-import-position
+from app.database import Base  # noqa: E402 pylint: disable=wrong-import-position
+
+WORDS = ["python", "rust", "deep", "learning", "model", "service", "api", "notebook", "data", "pipeline", "template"]
+WORDS += [f"word{i}" for i in range(2000)]  # Long tail vocabulary
+KEYWORDS = [["python"], ["deep", "learning"], ["word1234"], ["notebook service"], ["pipe"]]
+
+
+def database_url() -> str:
+    """Return the database URL from the environment."""
+    user, password = os.environ.get("POSTGRES_USER", "postgres"), os.environ.get("POSTGRES_PASSWORD", "")
+    host, port = os.environ.get("POSTGRES_HOST", "localhost"), os.environ.get("POSTGRES_PORT", "5432")
+    return f"postgresql://{user}:{password}@{host}:{port}/{os.environ.get('POSTGRES_DB', 'postgres')}"
+
+
+def make_catalog(connection: sa.Connection, templates: int) -> None:
+    """Insert templates with random titles and summaries."""
+    rand, table = random.Random(0), models.Template.__table__
+    for start in range(0, templates, 10000):
+        rows = [
+            {
+                "id": uuid.UUID(int=rand.getrandbits(128)),
+                "repoFile": f"template_{i}.json",
+                "title": " ".join(rand.choices(WORDS, k=4)).title(),
+                "summary": " ".join(rand.choices(WORDS, k=30)).capitalize(),
+                "gitLink": f"https://git.example.com/template_{i}",
+                "feedback": "https://feedback.example.com",
+            }
+            for i in range(start, min(start + 10000, templates))
+        ]
+        connection.execute(table.insert(), rows)
+    connection.execute(sa.text("ANALYZE template"))
+
+
+def like_search(keywords: list[str]) -> sa.Select:
+    """Return the query of the keywords search with LIKE clauses."""
+    search = sa.select(models.Template.id)
+    for keyword in keywords:
+        search = search.where(
+            sa.or_(
+                sa.func.lower(models.Template.summary).contains(keyword.lower()),
+                sa.func.lower(models.Template.title).contains(keyword.lower()),
+            )
+        )
+    return search
+
+
+def text_search(keywords: list[str]) -> sa.Select:
+    """Return the query of the keywords search with the full text index,
+    ranked by relevance.
+    """
+    query = sa.func.to_tsquery("simple", utils.search_query(keywords))
+    search = sa.select(models.Template.id).where(models.Template.search.op("@@")(query))
+    return search.order_by(sa.desc(sa.func.ts_rank(models.Template.search, query)))
+
+
+def measure(connection: sa.Connection, search: sa.Select, repeat: int) -> tuple[float, int, str]:
+    """Return the median time in milliseconds, the matches and the scan."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        matches = len(connection.execute(search).all())
+        times.append((time.perf_counter() - start) * 1000)
+    compiled = search.compile(connection)
+    plan = "\n".join(connection.exec_driver_sql(f"EXPLAIN {compiled}", compiled.params).scalars())
+    scan = "index" if "Bitmap Index Scan" in plan else "sequential"
+    return statistics.median(times), matches, scan
+
+
+def main() -> None:
+    """Print median time, matches and scan type of both searches."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--templates", type=int, default=100000, help="Number of synthetic templates")
+    parser.add_argument("--repeat", type=int, default=20, help="Executions of each query")
+    args = parser.parse_args()
+
+    engine = sa.create_engine(database_url())
+    with engine.begin() as connection:
+        connection.execute(sa.text("DROP SCHEMA IF EXISTS benchmark CASCADE"))
+        connection.execute(sa.text("CREATE SCHEMA benchmark"))
+    try:
+        with engine.connect() as connection:
+            connection.execute(sa.text("SET search_path TO benchmark"))
+            Base.metadata.create_all(connection)
+            start = time.perf_counter()
+            make_catalog(connection, args.templates)
+            connection.commit()
+            print(f"Catalog: {args.templates} templates in {time.perf_counter() - start:.1f} s")
+
+            print(f"{'keywords':<22}{'like (ms)':>11}{'scan':>12}{'fts (ms)':>10}{'scan':>8}{'matches':>10}")
+            for keywords in KEYWORDS:
+                like_time, like_matches, like_scan = measure(connection, like_search(keywords), args.repeat)
+                text_time, text_matches, text_scan = measure(connection, text_search(keywords), args.repeat)
+                print(f"{', '.join(keywords):<22}{like_time:>11.2f}{like_scan:>12}{text_time:>10.2f}{text_scan:>8}{text_matches:>10}")
+                if text_matches != like_matches:
+                    print(f"  like matches {like_matches}, substrings inside words only match with like")
+    finally:
+        with engine.begin() as connection:
+            connection.execute(sa.text("DROP SCHEMA benchmark CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
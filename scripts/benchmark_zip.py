@@ -0,0 +1,68 @@
+"""Compare wall time of the parallel zip writer with `shutil.make_archive`
+on a synthetic template with many large dataset and notebook files.
+
+Both use the default zlib compression level.
+
+Usage: python scripts/benchmark_zip.py [--files 40] [--size 8]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from app.archives import ArchiveFormat, folder_entries, stream  # noqa: E402 pylint: disable=wrong-import-position
+
+
+def make_template(folder: str, files: int, size: int) -> int:
+    """Write CSV datasets and notebooks of about `size` MiB each."""
+    rand, total = random.Random(0), 0
+    for i in range(files):
+        if i % 2:
+            path = os.path.join(folder, "data", f"dataset_{i}.csv")
+            rows = (",".join(f"{rand.gauss(0, 1):.6f}" for _ in range(8)) for _ in range(size * 1024**2 // 80))
+            content = "\n".join(rows)
+        else:
+            path = os.path.join(folder, "notebooks", f"notebook_{i}.ipynb")
+            cell = {"cell_type": "code", "source": ["import numpy as np\n", "x = np.arange(10)\n"], "outputs": []}
+            cells = [{**cell, "execution_count": n, "outputs": [{"text": [f"{rand.random()}\n"] * 20}]} for n in range(size * 400)]
+            content = json.dumps({"cells": cells, "nbformat": 4}, indent=1)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            total += file.write(content)
+    return total
+
+
+def main() -> None:
+    """Print wall time and size of both writers and the speedup."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=40, help="Number of large files")
+    parser.add_argument("--size", type=int, default=8, help="Approximate MiB per file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder, tempfile.TemporaryDirectory() as output:
+        total = make_template(os.path.join(folder, "template"), args.files, args.size)
+        print(f"Template: {args.files} files, {total / 1024**2:.1f} MiB, {os.cpu_count()} CPUs")
+
+        start = time.perf_counter()
+        archive = shutil.make_archive(os.path.join(output, "baseline"), "zip", folder)
+        baseline, baseline_size = time.perf_counter() - start, os.path.getsize(archive)
+
+        start, size = time.perf_counter(), 0
+        for chunk in stream(folder_entries(folder), ArchiveFormat.ZIP):
+            size += len(chunk)
+        parallel = time.perf_counter() - start
+
+        print(f"{'writer':<14}{'wall (s)':>10}{'size (MiB)':>12}")
+        print(f"{'make_archive':<14}{baseline:>10.3f}{baseline_size / 1024**2:>12.2f}")
+        print(f"{'parallel':<14}{parallel:>10.3f}{size / 1024**2:>12.2f}")
+        print(f"Speedup: {baseline / parallel:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -78,5 +78,21 @@ ALTER TABLE template ADD COLUMN feedback VARCHAR DEFAULT 'lorem ipsum' NOT NULL;
 
 UPDATE alembic_version SET version_num='e4cb3fa0953e' WHERE alembic_version.version_num = '04deff42e0f0';
 
+-- Running upgrade e4cb3fa0953e -> 3b9d5e27c1a4
+
+ALTER TABLE template ADD COLUMN fields JSONB;
+
+ALTER TABLE template ADD COLUMN "fieldsHash" VARCHAR;
+
+UPDATE alembic_version SET version_num='3b9d5e27c1a4' WHERE alembic_version.version_num = 'e4cb3fa0953e';
+
+-- Running upgrade 3b9d5e27c1a4 -> 7c2e4a9f1d36
+
+ALTER TABLE template ADD COLUMN search TSVECTOR GENERATED ALWAYS AS (setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', summary), 'B')) STORED;
+
+CREATE INDEX ix_template_search ON template USING gin (search);
+
+UPDATE alembic_version SET version_num='7c2e4a9f1d36' WHERE alembic_version.version_num = '3b9d5e27c1a4';
+
 COMMIT;
 
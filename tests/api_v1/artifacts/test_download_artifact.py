@@ -0,0 +1,126 @@
+"""Tests for GET /api/v1/artifacts/{artifact_id}:download endpoint."""
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+import hashlib
+
+import pytest
+
+content = b"PK" + bytes(range(256)) * 4
+artifact_options = {
+    "stored": hashlib.sha256(content).hexdigest(),
+    "unknown": "0" * 64,
+    "bad_id": "bad_id",
+}
+
+
+@pytest.fixture(scope="module")
+def artifact_id(request, client):
+    """Returns an artifact id, storing the artifact content if stored."""
+    if request.param == "stored":
+        client.app.state.artifacts.save(artifact_options["stored"], [content])
+    return artifact_options[request.param]
+
+
+@pytest.fixture(scope="module")
+def response(client, patch_session, artifact_id, headers):
+    """Performs a GET request to download an artifact."""
+    response = client.get(f"/api/v1/artifacts/{artifact_id}:download", headers=headers)
+    return response
+
+
+@pytest.mark.parametrize("artifact_id", ["stored"], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_200_ok(response, artifact_id):
+    """Tests the response status code is 200 and valid."""
+    # Assert response is valid
+    assert response.status_code == 200
+    # Assert header is valid
+    assert response.headers["content-type"] == "application/zip"
+    assert response.headers["content-disposition"] == 'attachment; filename="project.zip"'
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["etag"] == f'"{artifact_id}"'
+    # Assert content is valid
+    assert response.content == content
+
+
+@pytest.mark.parametrize("artifact_id", ["stored"], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+@pytest.mark.parametrize("byte_range, first, last", [("bytes=10-19", 10, 19), ("bytes=1000-", 1000, 1025), ("bytes=-6", 1020, 1025)])
+def test_206_partial(response, client, artifact_id, headers, byte_range, first, last):
+    """Tests a range of the artifact is returned."""
+    # Assert response is valid
+    response = client.get(f"/api/v1/artifacts/{artifact_id}:download", headers={**headers, "Range": byte_range})
+    assert response.status_code == 206
+    # Assert header is valid
+    assert response.headers["content-range"] == f"bytes {first}-{last}/{len(content)}"
+    assert response.headers["content-length"] == f"{last - first + 1}"
+    # Assert content is valid
+    end = last + 1
+    assert response.content == content[first:end]
+
+
+@pytest.mark.parametrize("artifact_id", ["stored"], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_206_if_range(response, client, artifact_id, headers):
+    """Tests a range is returned only if the ETag matches."""
+    # Assert range is returned when the artifact did not change
+    range_headers = {"Range": "bytes=100-", "If-Range": response.headers["etag"]}
+    response = client.get(f"/api/v1/artifacts/{artifact_id}:download", headers={**headers, **range_headers})
+    assert response.status_code == 206
+    assert response.content == content[100:]
+    # Assert whole artifact is returned when the ETag does not match
+    range_headers = {"Range": "bytes=100-", "If-Range": '"other"'}
+    response = client.get(f"/api/v1/artifacts/{artifact_id}:download", headers={**headers, **range_headers})
+    assert response.status_code == 200
+    assert response.content == content
+
+
+@pytest.mark.parametrize("artifact_id", ["stored"], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_416_not_satisfiable(response, client, artifact_id, headers):
+    """Tests a range out of the artifact is not satisfiable."""
+    # Assert response is valid
+    response = client.get(f"/api/v1/artifacts/{artifact_id}:download", headers={**headers, "Range": "bytes=5000-"})
+    assert response.status_code == 416
+    # Assert header is valid
+    assert response.headers["content-range"] == f"bytes */{len(content)}"
+
+
+@pytest.mark.parametrize("artifact_id", ["unknown"], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["bad-token", None], indirect=True)
+def test_401_unauthorized(response):
+    """Tests the response status code is 401 and valid."""
+    # Assert response is valid
+    assert response.status_code == 401
+    # Assert header is valid
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "authentication"
+    assert message["detail"][0]["loc"] == ["header", "bearer"]
+    assert "Not authenticated" in message["detail"][0]["msg"]
+
+
+@pytest.mark.parametrize("artifact_id", ["unknown"], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_404_not_found(response):
+    """Tests the response status code is 404 and valid."""
+    # Assert response is valid
+    assert response.status_code == 404
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "not_found"
+    assert message["detail"][0]["loc"] == ["path", "artifact_id"]
+    assert "Artifact not found" in message["detail"][0]["msg"]
+
+
+@pytest.mark.parametrize("artifact_id", ["bad_id"], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_422_validation_error(response):
+    """Tests the response status code is 422 and valid."""
+    # Assert response is valid
+    assert response.status_code == 422
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "string_pattern_mismatch"
+    assert message["detail"][0]["loc"] == ["path", "artifact_id"]
@@ -1,11 +1,17 @@
 # pylint: disable=missing-module-docstring,unused-argument
+import contextlib
+import pathlib
 import shutil
 from unittest.mock import patch
 
 import git
+import httpx
 import pytest
+from cookiecutter.exceptions import RepositoryCloneFailed
 from git import InvalidGitRepositoryError
 
+import app.mirrors
+
 
 @pytest.fixture(scope="module")
 def patch_repository(request):
@@ -28,3 +34,44 @@ def clone_patch_gen(repository_folder):
         except FileNotFoundError as err:
             raise InvalidGitRepositoryError(repository_folder) from err
     return clone_patch
+
+
+@pytest.fixture(scope="module", autouse=True)
+def patch_checkout(request):
+    """Patch fixture to replace template checkouts with cookiecutter folders."""
+    if hasattr(request, "param"):
+        with patch.object(app.mirrors.MirrorCache, "checkout", checkout_patch_gen(request.param)):
+            yield
+    else:
+        yield
+
+
+def checkout_patch_gen(folders):
+    """Patch fixture to replace template checkouts with cookiecutter folders."""
+    @contextlib.contextmanager
+    def checkout_patch(self, git_link, git_checkout):  # fmt: skip
+        """Patch fixture that yields the cookiecutter folder of the gitLink."""
+        if git_link not in folders:
+            raise RepositoryCloneFailed(f"Failed to clone '{git_link}'.")
+        yield app.mirrors.Checkout(pathlib.Path(f"tests/cookiecutters/{folders[git_link]}"), "revision")
+    return checkout_patch
+
+
+@pytest.fixture(scope="module", autouse=True)
+def patch_fields(request):
+    """Patch fixture to replace cookiecutter.json downloads with cookiecutter folders."""
+    folders = request.param if hasattr(request, "param") else {}
+    with patch.object(httpx.AsyncHTTPTransport, "handle_async_request", transport_patch_gen(folders)):
+        yield
+
+
+def transport_patch_gen(folders):
+    """Patch fixture to replace cookiecutter.json downloads with cookiecutter folders."""
+    async def transport_patch(self, req):  # fmt: skip
+        """Patch fixture that returns the cookiecutter.json of the gitLink folder."""
+        git_link = f"{req.url}".split("/raw/")[0]
+        if git_link not in folders:
+            raise httpx.ConnectError(f"Failed to fetch '{req.url}'.", request=req)
+        with open(f"tests/cookiecutters/{folders[git_link]}/cookiecutter.json", "rb") as file:
+            return httpx.Response(200, headers={"ETag": f'"{folders[git_link]}"'}, content=file.read(), request=req)
+    return transport_patch
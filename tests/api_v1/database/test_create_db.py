@@ -8,9 +8,9 @@ import pytest
 
 
 @pytest.fixture(scope="module")
-def response(client, patch_session, patch_repository, headers):
+def response(client, patch_session, patch_repository, headers, query):
     """Performs a POST request to create a database."""
-    response = client.post("/api/v1/db:create", headers=headers)
+    response = client.post("/api/v1/db:create", headers=headers, params=query)
     return response
 
 
@@ -108,6 +108,23 @@ def test_204_correct_users(response, sql_session):
     assert users == []
 
 
+@pytest.mark.parametrize("client", [{"warmup_workers": 2}], indirect=True)
+@pytest.mark.parametrize("patch_repository", ["repository_1"], indirect=True)
+@pytest.mark.parametrize("patch_checkout", [{"https://some-git-link/template_1": "cookiecutter_1"}], indirect=True)
+@pytest.mark.parametrize("query", [{"warmup": True}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["6de44315b565ea73f778282d"], indirect=True)
+def test_200_warmup(response):
+    """Tests the response status code is 200 and reports the warm up."""
+    # Assert response is valid
+    assert response.status_code == 200
+    # Assert each template warm up is reported
+    results = sorted(response.json(), key=lambda x: x["repoFile"])
+    assert [x["repoFile"] for x in results] == ["my_template_1.json", "my_template_2.json", "my_template_4.json", "my_template_5.json"]
+    assert all(x["seconds"] >= 0 for x in results)
+    assert results[0]["error"] is None
+    assert "Failed to clone" in results[1]["error"]
+
+
 @pytest.mark.parametrize("patch_repository", ["repository_1"], indirect=True)
 @pytest.mark.parametrize("authorization_bearer", [None], indirect=True)
 def test_401_unauthorized(response, sql_session):
@@ -0,0 +1,77 @@
+"""Tests for the purge_arguments endpoint."""
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app import arguments
+
+
+@pytest.fixture(scope="module")
+def response(client, patch_session, headers, query):
+    """Performs a POST request to purge the cookiecutter.json cache."""
+    cached = arguments.CachedArguments({}, None, None)
+    with patch.object(arguments, "_download", AsyncMock(return_value=cached)):
+        asyncio.run(client.app.state.arguments.fetch("https://link-to-be-patched", "main"))
+        asyncio.run(client.app.state.arguments.fetch("https://some-git-link/template", "main"))
+    response = client.post("/api/v1/db:purge", headers=headers, params=query)
+    return response
+
+
+@pytest.mark.parametrize("authorization_bearer", ["6de44315b565ea73f778282d"], indirect=True)
+def test_204_all(response, client):
+    """Tests the response status code is 204 and the cache is empty."""
+    # Assert response is valid
+    assert response.status_code == 204
+    # Assert cache is empty
+    assert client.app.state.arguments.metrics()["entries"] == 0
+
+
+@pytest.mark.parametrize("query", [{"template": "bced037a-a326-425d-aa03-5d3cbc9aa3d1"}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["6de44315b565ea73f778282d"], indirect=True)
+def test_204_template(response, client):
+    """Tests the response status code is 204 and only the template is purged."""
+    # Assert response is valid
+    assert response.status_code == 204
+    # Assert only the template entry is purged
+    assert client.app.state.arguments.metrics()["entries"] == 1
+
+
+@pytest.mark.parametrize("query", [{"template": "00000000-0000-0000-0000-000000000000"}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["6de44315b565ea73f778282d"], indirect=True)
+def test_404_not_found(response):
+    """Tests the response status code is 404 and valid."""
+    # Assert response is valid
+    assert response.status_code == 404
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "not_found"
+    assert "Template not found" in message["detail"][0]["msg"]
+
+
+@pytest.mark.parametrize("authorization_bearer", [None], indirect=True)
+def test_401_unauthorized(response):
+    """Tests the response status code is 401 and valid."""
+    # Assert response is valid
+    assert response.status_code == 401
+    # Assert header is valid
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "authentication"
+    assert message["detail"][0]["loc"] == ["header", "bearer"]
+    assert "Not authenticated" in message["detail"][0]["msg"]
+
+
+@pytest.mark.parametrize("authorization_bearer", ["bad-secret"], indirect=True)
+def test_403_forbidden(response):
+    """Tests the response status code is 403 and valid."""
+    # Asset response is valid
+    assert response.status_code == 403
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "authentication"
+    assert message["detail"][0]["loc"] == ["header", "bearer"]
+    assert "Incorrect secret" in message["detail"][0]["msg"]
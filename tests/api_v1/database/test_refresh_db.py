@@ -0,0 +1,77 @@
+"""Tests for the refresh_fields endpoint."""
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+import pytest
+
+from app import models
+
+
+@pytest.fixture(scope="module")
+def response(client, patch_session, headers, query):
+    """Performs a POST request to refresh the stored fields."""
+    response = client.post("/api/v1/db:refresh", headers=headers, params=query)
+    return response
+
+
+@pytest.mark.parametrize("patch_fields", [{"https://some-git-link/template": "cookiecutter_1"}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["6de44315b565ea73f778282d"], indirect=True)
+def test_204_all(response, sql_session):
+    """Tests the response status code is 204 and fields are stored."""
+    # Assert response is valid
+    assert response.status_code == 204
+    # Assert fields are stored only for templates with cookiecutter.json
+    templates = sql_session.query(models.Template).all()
+    stored = sorted(x.repoFile for x in templates if x.fields is not None)
+    assert stored == ["my_template_3.json", "my_template_4.json"]
+    assert all(x.fieldsHash is None for x in templates if x.fields is None)
+
+
+@pytest.mark.parametrize("client", [{"warmup_workers": 1}], indirect=True)
+@pytest.mark.parametrize("query", [{"template": "8fc20f81-e0a9-471c-8008-697ce799e73b"}], indirect=True)
+@pytest.mark.parametrize("patch_fields", [{"https://some-git-link/template": "cookiecutter_2"}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["6de44315b565ea73f778282d"], indirect=True)
+def test_204_template(response, sql_session, query):
+    """Tests the response status code is 204 and only the template is refreshed."""
+    # Assert response is valid
+    assert response.status_code == 204
+    # Assert fields are stored only for the template
+    templates = sql_session.query(models.Template).all()
+    assert [f"{x.id}" for x in templates if x.fields is not None] == [query["template"]]
+
+
+@pytest.mark.parametrize("query", [{"template": "00000000-0000-0000-0000-000000000000"}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["6de44315b565ea73f778282d"], indirect=True)
+def test_404_not_found(response):
+    """Tests the response status code is 404 and valid."""
+    # Assert response is valid
+    assert response.status_code == 404
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "not_found"
+    assert "Template not found" in message["detail"][0]["msg"]
+
+
+@pytest.mark.parametrize("authorization_bearer", [None], indirect=True)
+def test_401_unauthorized(response):
+    """Tests the response status code is 401 and valid."""
+    # Assert response is valid
+    assert response.status_code == 401
+    # Assert header is valid
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "authentication"
+    assert message["detail"][0]["loc"] == ["header", "bearer"]
+    assert "Not authenticated" in message["detail"][0]["msg"]
+
+
+@pytest.mark.parametrize("authorization_bearer", ["bad-secret"], indirect=True)
+def test_403_forbidden(response):
+    """Tests the response status code is 403 and valid."""
+    # Asset response is valid
+    assert response.status_code == 403
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "authentication"
+    assert message["detail"][0]["loc"] == ["header", "bearer"]
+    assert "Incorrect secret" in message["detail"][0]["msg"]
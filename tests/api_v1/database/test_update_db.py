@@ -1,17 +1,19 @@
 """Tests for the update_db endpoint."""
 # pylint: disable=redefined-outer-name
 # pylint: disable=unused-argument
+import time
 from uuid import UUID
 
 import pytest
 
 from app import models
+from app.archives import ArchiveFormat
 
 
 @pytest.fixture(scope="module")
-def response(client, patch_session, patch_repository, headers):
+def response(client, patch_session, patch_repository, headers, query):
     """Performs a POST request to update a database."""
-    response = client.post("/api/v1/db:update", headers=headers)
+    response = client.post("/api/v1/db:update", headers=headers, params=query)
     return response
 
 
@@ -113,6 +115,61 @@ def test_204_correct_users(response, sql_session):
     assert len(users) == 1
 
 
+@pytest.mark.parametrize("client", [{"warmup_workers": 2}], indirect=True)
+@pytest.mark.parametrize("patch_repository", ["repository_1"], indirect=True)
+@pytest.mark.parametrize("patch_checkout", [{"https://some-git-link/template_1": "cookiecutter_1"}], indirect=True)
+@pytest.mark.parametrize("query", [{"warmup": True}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["6de44315b565ea73f778282d"], indirect=True)
+def test_200_warmup(response):
+    """Tests the response status code is 200 and reports the warm up."""
+    # Assert response is valid
+    assert response.status_code == 200
+    # Assert each template warm up is reported
+    results = sorted(response.json(), key=lambda x: x["repoFile"])
+    assert [x["repoFile"] for x in results] == ["my_template_1.json", "my_template_2.json", "my_template_4.json", "my_template_5.json"]
+    assert all(x["seconds"] >= 0 for x in results)
+    assert results[0]["error"] is None
+    assert "Failed to clone" in results[1]["error"]
+
+
+@pytest.mark.parametrize("patch_repository", ["repository_1"], indirect=True)
+@pytest.mark.parametrize("patch_fields", [{"https://some-git-link/template_1": "cookiecutter_1"}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["6de44315b565ea73f778282d"], indirect=True)
+def test_204_fields(response, sql_session):
+    """Tests the parsed cookiecutter.json of each template is stored."""
+    # Assert response is valid
+    assert response.status_code == 204
+    # Assert fields are stored for the templates with cookiecutter.json
+    templates = sorted(sql_session.query(models.Template).all(), key=lambda x: x.repoFile)
+    assert [x["name"] for x in templates[0].fields] == ["text_field", "composed_var", "checkbox_field", "select_field", "no_prompt_var"]
+    assert len(templates[0].fieldsHash) == 64
+    assert all(x.fields is None and x.fieldsHash is None for x in templates[1:])
+
+
+@pytest.mark.parametrize("client", [{"prebuild_templates": ["my_template_1.json"], "render_processes": 0}], indirect=True)
+@pytest.mark.parametrize("patch_repository", ["repository_1"], indirect=True)
+@pytest.mark.parametrize("patch_checkout", [{"https://some-git-link/template_1": "cookiecutter_1"}], indirect=True)
+@pytest.mark.parametrize("query", [{"prebuild": True}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["6de44315b565ea73f778282d"], indirect=True)
+def test_204_prebuild(response, client, sql_session):
+    """Tests the default-options archive of allowed templates is built."""
+    # Assert response is valid
+    assert response.status_code == 204
+    # Assert only the allowed template is built in background
+    prebuilder = client.app.state.prebuilder
+    for _ in range(100):
+        if not prebuilder.metrics()["scheduled"]:
+            break
+        time.sleep(0.1)
+    assert prebuilder.metrics() == {"scheduled": 0, "built": 1, "failed": 0}
+    # Assert archive is stored for a generation with default options
+    template = sql_session.query(models.Template).filter_by(repoFile="my_template_1.json").one()
+    key = client.app.state.artifacts.key(template.id, "revision", {"": {}}, ArchiveFormat.ZIP, None)
+    assert client.app.state.artifacts.get(key)
+    # Assert background build is not in the generation latencies
+    assert not client.app.state.latencies.snapshot()
+
+
 @pytest.mark.parametrize("patch_repository", ["repository_1"], indirect=True)
 @pytest.mark.parametrize("authorization_bearer", [None], indirect=True)
 def test_401_unauthorized(response):
@@ -0,0 +1,52 @@
+"""Tests for GET /api/v1/jobs/{uuid}:download endpoint."""
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+import pytest
+
+
+@pytest.fixture(scope="module")
+def response(client, patch_session, template_uuid, headers):
+    """Performs a GET request to download a job result."""
+    response = client.get(f"/api/v1/jobs/{template_uuid}:download", headers=headers)
+    return response
+
+
+@pytest.mark.parametrize("template_uuid", ["unknown"], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["bad-token", None], indirect=True)
+def test_401_unauthorized(response):
+    """Tests the response status code is 401 and valid."""
+    # Assert response is valid
+    assert response.status_code == 401
+    # Assert header is valid
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "authentication"
+    assert message["detail"][0]["loc"] == ["header", "bearer"]
+    assert "Not authenticated" in message["detail"][0]["msg"]
+
+
+@pytest.mark.parametrize("template_uuid", ["unknown"], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_404_not_found(response):
+    """Tests the response status code is 404 and valid."""
+    # Assert response is valid
+    assert response.status_code == 404
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "not_found"
+    assert message["detail"][0]["loc"] == ["path", "uuid"]
+    assert "Job not found" in message["detail"][0]["msg"]
+
+
+@pytest.mark.parametrize("template_uuid", ["bad_uuid"], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_422_validation_error(response):
+    """Tests the response status code is 422 and valid."""
+    # Assert response is valid
+    assert response.status_code == 422
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "uuid_parsing"
+    assert message["detail"][0]["loc"] == ["path", "uuid"]
+    assert "Input should be a valid UUID" in message["detail"][0]["msg"]
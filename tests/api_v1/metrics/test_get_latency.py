@@ -0,0 +1,56 @@
+"""Tests for GET /api/v1/metrics/latency endpoint."""
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+import pytest
+
+from app import timing
+
+
+@pytest.fixture(scope="module")
+def response(client, patch_session, headers):
+    """Performs a GET request to fetch the latency histograms."""
+    timer = timing.Timer()
+    with timer.phase("render"):
+        pass
+    client.app.state.latencies.observe("uuid_1", timer)
+    response = client.get("/api/v1/metrics/latency", headers=headers)
+    return response
+
+
+@pytest.mark.parametrize("authorization_bearer", ["6de44315b565ea73f778282d"], indirect=True)
+def test_200_ok(response):
+    """Tests the response status code is 200 and valid."""
+    # Assert response is valid
+    assert response.status_code == 200
+    # Assert histograms are valid
+    histograms = [x for x in response.json() if x["template"] == "uuid_1"]
+    assert [x["phase"] for x in histograms] == ["render"]
+    assert histograms[0]["count"] == 1
+    assert histograms[0]["buckets"]["5"] == 1
+    assert histograms[0]["buckets"]["+Inf"] == 1
+
+
+@pytest.mark.parametrize("authorization_bearer", [None], indirect=True)
+def test_401_unauthorized(response):
+    """Tests the response status code is 401 and valid."""
+    # Assert response is valid
+    assert response.status_code == 401
+    # Assert header is valid
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "authentication"
+    assert message["detail"][0]["loc"] == ["header", "bearer"]
+    assert "Not authenticated" in message["detail"][0]["msg"]
+
+
+@pytest.mark.parametrize("authorization_bearer", ["bad-secret"], indirect=True)
+def test_403_forbidden(response):
+    """Tests the response status code is 403 and valid."""
+    # Asset response is valid
+    assert response.status_code == 403
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "authentication"
+    assert message["detail"][0]["loc"] == ["header", "bearer"]
+    assert "Incorrect secret" in message["detail"][0]["msg"]
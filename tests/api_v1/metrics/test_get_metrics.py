@@ -0,0 +1,53 @@
+"""Tests for GET /api/v1/metrics endpoint."""
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+import pytest
+
+
+@pytest.fixture(scope="module")
+def response(client, patch_session, headers):
+    """Performs a GET request to fetch the metrics."""
+    response = client.get("/api/v1/metrics", headers=headers)
+    return response
+
+
+@pytest.mark.parametrize("authorization_bearer", ["6de44315b565ea73f778282d"], indirect=True)
+def test_200_ok(response):
+    """Tests the response status code is 200 and valid."""
+    # Assert response is valid
+    assert response.status_code == 200
+    # Assert metrics are valid
+    metrics = response.json()
+    assert metrics["admission"] == {"active": 0, "waiting": 0, "rejected": 0, "users": 0}
+    assert metrics["arguments"] == {"hits": 0, "misses": 0, "revalidations": 0, "coalesced": 0, "entries": 0}
+    assert metrics["http"] == {"requests": 0, "errors": 0, "active": 0, "waiting": 0, "hosts": []}
+    assert set(metrics["jobs"]) == {"queued", "running", "done", "failed"}
+    assert metrics["mirrors"] == {"fetches": 0, "bytes": 0, "seconds": 0, "repositories": []}
+    assert metrics["prebuild"] == {"scheduled": 0, "built": 0, "failed": 0}
+    assert metrics["rendering"] == {"hits": 0, "misses": 0, "hit_rate": 0.0}
+
+
+@pytest.mark.parametrize("authorization_bearer", [None], indirect=True)
+def test_401_unauthorized(response):
+    """Tests the response status code is 401 and valid."""
+    # Assert response is valid
+    assert response.status_code == 401
+    # Assert header is valid
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "authentication"
+    assert message["detail"][0]["loc"] == ["header", "bearer"]
+    assert "Not authenticated" in message["detail"][0]["msg"]
+
+
+@pytest.mark.parametrize("authorization_bearer", ["bad-secret"], indirect=True)
+def test_403_forbidden(response):
+    """Tests the response status code is 403 and valid."""
+    # Asset response is valid
+    assert response.status_code == 403
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "authentication"
+    assert message["detail"][0]["loc"] == ["header", "bearer"]
+    assert "Incorrect secret" in message["detail"][0]["msg"]
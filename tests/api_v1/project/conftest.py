@@ -1,58 +1,65 @@
 # pylint: disable=missing-module-docstring,unused-argument
-import urllib.error
-import urllib.request
-from unittest.mock import MagicMock, patch
+import contextlib
+import hashlib
+import pathlib
+from unittest.mock import patch
 
+import httpx
 import pytest
+from cookiecutter.exceptions import RepositoryCloneFailed
 
-import app.api_v1.endpoints.project
+import app.mirrors
 
 
 @pytest.fixture(scope="module", autouse=True)
 def patch_fields_url(request):
     """Patch fixture to replace request response from cookiecutter.json."""
     if hasattr(request, "param"):
-        with patch.object(urllib.request, "Request", MagicMock()):
-            patch_function = urlopen_patch_gen(request.param)
-            with patch.object(urllib.request, "urlopen", side_effect=patch_function):
-                yield
+        patch_function = transport_patch_gen(request.param)
+        with patch.object(httpx.AsyncHTTPTransport, "handle_async_request", patch_function):
+            yield
     else:
         yield
 
 
-def urlopen_patch_gen(folder):
+def transport_patch_gen(folder):
     """Patch fixture to replace request response from cookiecutter.json."""
-    def urlopen_patch(req):  # fmt: skip
+    async def transport_patch(self, req):  # fmt: skip
         """Patch fixture that returns tests/cookiecutter/cookiecutter.json."""
         try:
-            with open(f"tests/cookiecutters/{folder}/cookiecutter.json", encoding="utf-8") as file:
-                mock = MagicMock()
-                mock.getcode.return_value = 200
-                mock.read.return_value = file.read().encode()
-                mock.__enter__.return_value = mock
-                mock.return_value = mock
-            return mock
-        except FileNotFoundError as err:
-            raise urllib.error.HTTPError(req.full_url, 404, "Not Found", None, None) from err
-    return urlopen_patch
+            with open(f"tests/cookiecutters/{folder}/cookiecutter.json", "rb") as file:
+                return httpx.Response(200, content=file.read(), request=req)
+        except FileNotFoundError:
+            return httpx.Response(404, request=req)
+    return transport_patch
 
 
 @pytest.fixture(scope="module", autouse=True)
 def patch_cookiecutter(request):
     """Patch fixture to replace cookiecutter template from a link."""
     if hasattr(request, "param"):
-        original_cookiecutter = app.api_v1.endpoints.project.cookiecutter
-        with patch.object(app.api_v1.endpoints.project, "cookiecutter", MagicMock()) as mock:
-            folder = f"tests/cookiecutters/{request.param}"
-            mock.side_effect = cookiecutter_path_gen(folder, original_cookiecutter)
+        folder = f"tests/cookiecutters/{request.param}"
+        with patch.object(app.mirrors.MirrorCache, "checkout", checkout_path_gen(folder)):
             yield
     else:
         yield
 
 
-def cookiecutter_path_gen(folder, original):
+def checkout_path_gen(folder):
     """Patch fixture to replace cookiecutter template from a link."""
-    def cookiecutter_patch(template, checkout, **kwds):  # fmt: skip
-        """Patch fixture that returns tests/cookiecutter/cookiecutter.json."""
-        original(template=folder, **kwds)
-    return cookiecutter_patch
+    @contextlib.contextmanager
+    def checkout_patch(self, git_link, git_checkout):  # fmt: skip
+        """Patch fixture that yields tests/cookiecutter folder as mirror."""
+        if not pathlib.Path(folder).exists():
+            raise RepositoryCloneFailed(f"Failed to clone '{folder}'.")
+        yield app.mirrors.Checkout(pathlib.Path(folder), folder_revision(folder))
+    return checkout_patch
+
+
+def folder_revision(folder):
+    """Returns a hash of the folder files to use as template revision."""
+    revision = hashlib.sha1(usedforsecurity=False)
+    for path in sorted(pathlib.Path(folder).rglob("*")):
+        revision.update(str(path).encode())
+        revision.update(path.read_bytes() if path.is_file() else b"")
+    return revision.hexdigest()
@@ -4,6 +4,8 @@
 # pylint: disable=unused-argument
 import pytest
 
+from app import models
+
 
 @pytest.fixture(scope="module")
 def response(client, patch_session, template_uuid, headers):
@@ -89,6 +91,56 @@ def test_200_select_field_dict(response):
     assert field["default"] == "option_1"
 
 
+@pytest.mark.parametrize("client", [{"arguments_ttl": 0}], indirect=True)
+@pytest.mark.parametrize("template_uuid", ["uuid_2"], indirect=True)
+def test_200_stored(client, sql_session, template_uuid):
+    """Tests fields stored at database sync are returned without fetching."""
+    # Assert stored fields are returned
+    template = sql_session.get(models.Template, template_uuid)
+    template.fields = [{"type": "text", "name": "stored_field", "default": "Stored", "prompt": None}]
+    sql_session.flush()
+    response = client.get(f"/api/v1/project/{template_uuid}")
+    assert response.status_code == 200
+    assert [x["name"] for x in response.json()] == ["stored_field"]
+    assert client.app.state.arguments.metrics()["misses"] == 0
+    # Assert stored fields are revalidated with the catalog version
+    headers = {"If-None-Match": response.headers["ETag"]}
+    assert client.get(f"/api/v1/project/{template_uuid}", headers=headers).status_code == 304
+
+
+@pytest.mark.parametrize("client", [{"arguments_ttl": 300}], indirect=True)
+@pytest.mark.parametrize("patch_fields_url", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
+def test_200_cached(response, client, template_uuid):
+    """Tests a repeated request is served from the cache."""
+    # Assert response is valid
+    assert response.status_code == 200
+    # Assert fetched fields are not cached by clients
+    assert "ETag" not in response.headers
+    # Assert repeated request does not download the file again
+    repeated = client.get(f"/api/v1/project/{template_uuid}")
+    assert repeated.json() == response.json()
+    metrics = client.app.state.arguments.metrics()
+    assert (metrics["misses"], metrics["hits"], metrics["revalidations"]) == (1, 1, 0)
+    # Assert file was downloaded once through the pooled client
+    metrics = client.app.state.http_client.metrics()
+    assert (metrics["requests"], metrics["errors"], metrics["active"]) == (1, 0, 0)
+
+
+@pytest.mark.parametrize("client", [{"arguments_ttl": -1}], indirect=True)
+@pytest.mark.parametrize("patch_fields_url", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
+def test_200_revalidated(response, client, template_uuid):
+    """Tests an expired file is revalidated with the repository."""
+    # Assert response is valid
+    assert response.status_code == 200
+    # Assert repeated request revalidates the file
+    repeated = client.get(f"/api/v1/project/{template_uuid}")
+    assert repeated.json() == response.json()
+    metrics = client.app.state.arguments.metrics()
+    assert (metrics["misses"], metrics["hits"], metrics["revalidations"]) == (1, 0, 1)
+
+
 @pytest.mark.parametrize("template_uuid", ["unknown"], indirect=True)
 def test_404_not_found(response):
     """Tests the response status code is 404 and valid."""
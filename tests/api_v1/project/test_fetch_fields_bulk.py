@@ -0,0 +1,137 @@
+"""Tests for the fetch_fields_bulk endpoint."""
+
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+import pytest
+
+UUID_1 = "bced037a-a326-425d-aa03-5d3cbc9aa3d1"
+UUID_2 = "ef231acb-0ff9-4391-ab18-6cb2698b0985"
+UUID_3 = "8fc20f81-e0a9-471c-8008-697ce799e73b"
+UUID_4 = "f3f35224-e35c-46a4-90d1-354646970b13"
+UNKNOWN = "00000000-0000-0000-0000-000000000000"
+
+
+@pytest.fixture(scope="module")
+def response(client, patch_session, body):
+    """Performs a POST request to fetch the fields of several templates."""
+    response = client.post("/api/v1/project:fields", json=body)
+    return response
+
+
+@pytest.mark.parametrize("client", [{"fields_workers": 2}], indirect=True)
+@pytest.mark.parametrize("patch_fields_url", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("body", [[UUID_1, UUID_3, UUID_1]], indirect=True)
+def test_200_fields(response, client, body):
+    """Tests the response maps each template to its fields."""
+    # Assert response is valid
+    assert response.status_code == 200
+    # Assert each template is returned once with its fields
+    assert list(response.json()) == list(dict.fromkeys(body))
+    assert all(len(x) == 5 for x in response.json().values())
+    assert response.json()[body[0]][0]["name"] == "text_field"
+    # Assert one download per repository through the pooled client
+    assert client.app.state.http_client.metrics()["requests"] == 2
+
+
+@pytest.mark.parametrize("client", [{"arguments_ttl": 300}], indirect=True)
+@pytest.mark.parametrize("patch_fields_url", ["cookiecutter_2"], indirect=True)
+@pytest.mark.parametrize("body", [[UUID_3, UUID_4]], indirect=True)
+def test_200_coalesced(response, client, body):
+    """Tests concurrent fetches of the same repository share one download."""
+    # Assert response is valid
+    assert response.status_code == 200
+    assert response.json()[UUID_3] == response.json()[UUID_4]
+    # Assert second fetch waited for the download of the first one
+    metrics = client.app.state.arguments.metrics()
+    assert (metrics["misses"], metrics["coalesced"], metrics["entries"]) == (1, 1, 1)
+    assert client.app.state.http_client.metrics()["requests"] == 1
+
+
+@pytest.mark.parametrize("client", [{"arguments_ttl": 300}], indirect=True)
+@pytest.mark.parametrize("patch_fields_url", ["repository_down"], indirect=True)
+@pytest.mark.parametrize("body", [[UUID_3, UUID_4]], indirect=True)
+def test_200_coalesced_error(response, client, body):
+    """Tests concurrent fetches of the same repository share the error."""
+    # Assert response is valid
+    assert response.status_code == 200
+    assert response.json()[UUID_3]["type"] == response.json()[UUID_4]["type"] == "server_error"
+    # Assert failed download was not repeated nor cached
+    metrics = client.app.state.arguments.metrics()
+    assert (metrics["misses"], metrics["coalesced"], metrics["entries"]) == (1, 1, 0)
+    assert client.app.state.http_client.metrics()["requests"] == 1
+
+
+@pytest.mark.parametrize("patch_fields_url", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("body", [[UUID_1, UNKNOWN]], indirect=True)
+def test_200_not_found(response, body):
+    """Tests a template not found is returned as error details."""
+    # Assert response is valid
+    assert response.status_code == 200
+    # Assert found template has fields and missing one an error
+    assert len(response.json()[body[0]]) == 5
+    error = response.json()[body[1]]
+    assert error["type"] == "not_found"
+    assert error["loc"] == ["body", "uuids"]
+    assert error["msg"] == "Template not found"
+
+
+@pytest.mark.parametrize("patch_fields_url", ["cookiecutter_3"], indirect=True)
+@pytest.mark.parametrize("body", [[UUID_3]], indirect=True)
+def test_200_not_implemented(response, body):
+    """Tests a template with unsupported fields is returned as error details."""
+    # Assert response is valid
+    assert response.status_code == 200
+    # Assert error details are valid
+    error = response.json()[body[0]]
+    assert error["type"] == "not_implemented"
+    assert error["loc"] == ["gitLink", "gitCheckout", "cookiecutter.json"]
+    assert f"Field type '{dict}' not supported." in error["msg"]
+
+
+@pytest.mark.parametrize("patch_fields_url", ["repository_down"], indirect=True)
+@pytest.mark.parametrize("body", [[UUID_2]], indirect=True)
+def test_200_repository_down(response, body):
+    """Tests a template not available is returned as error details."""
+    # Assert response is valid
+    assert response.status_code == 200
+    # Assert error details are valid
+    error = response.json()[body[0]]
+    assert error["type"] == "server_error"
+    assert error["loc"] == ["server"]
+    assert error["msg"] == "Internal Server Error"
+
+
+@pytest.mark.parametrize("body", [[]], indirect=True)
+def test_422_empty(response):
+    """Tests the response status code is 422 and valid."""
+    # Assert response is valid
+    assert response.status_code == 422
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "too_short"
+    assert message["detail"][0]["loc"] == ["body"]
+
+
+@pytest.mark.parametrize("body", [["bad_uuid"]], indirect=True)
+def test_422_validation_error(response):
+    """Tests the response status code is 422 and valid."""
+    # Assert response is valid
+    assert response.status_code == 422
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "uuid_parsing"
+    assert message["detail"][0]["loc"] == ["body", 0]
+    assert "Input should be a valid UUID" in message["detail"][0]["msg"]
+
+
+@pytest.mark.parametrize("patch_session", [Exception("error")], indirect=True)
+@pytest.mark.parametrize("body", [[UUID_1]], indirect=True)
+def test_500_database_error(response):
+    """Tests the response status code is 500 and valid."""
+    # Assert response is valid
+    assert response.status_code == 500
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "server_error"
+    assert message["detail"][0]["loc"] == ["server"]
+    assert message["detail"][0]["msg"] == "Internal Server Error"
@@ -2,10 +2,13 @@
 # pylint: disable=redefined-outer-name
 # pylint: disable=unused-argument
 import io
+import tarfile
 import tomllib
+import uuid
 import zipfile
 
 import pytest
+import zstandard
 
 
 @pytest.fixture(scope="module")
@@ -26,10 +29,12 @@ def test_200_ok(response, body):
     assert response.status_code == 200
     # Assert header is valid
     assert response.headers["content-type"] == "application/zip"
+    assert response.headers["content-disposition"] == 'attachment; filename="project.zip"'
     # Assert template in response is valid
     sub_folder = f"{body['text_field'].lower().replace(' ', '_')}_project"
     zip_buffer = io.BytesIO(response.content)
     with zipfile.ZipFile(zip_buffer, "r", zipfile.ZIP_DEFLATED, False) as archive:
+        assert archive.testzip() is None
         with archive.open(f"{sub_folder}/template_file.toml") as file:
             config = tomllib.load(file)
     assert config["text_field"] == body["text_field"]
@@ -60,6 +65,147 @@ def test_200_no_checkbox(response, body):
     assert not "checkbox_field" in config
 
 
+@pytest.mark.parametrize("patch_fields_url", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("patch_cookiecutter", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
+@pytest.mark.parametrize("body", [{"text_field": "Some text"}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_200_stored(response, client, template_uuid, body, headers):
+    """Tests a repeated generation returns the same stored project."""
+    # Assert response is valid
+    assert response.status_code == 200
+    # Assert repeated request returns the same archive
+    repeated = client.post(f"/api/v1/project/{template_uuid}:generate", json=body, headers=headers)
+    assert repeated.status_code == 200
+    assert repeated.headers["etag"] == response.headers["etag"]
+    assert repeated.content == response.content
+    # Assert archive can be downloaded again by its id
+    artifact_id = response.headers["etag"].strip('"')
+    assert response.headers["content-location"] == f"../artifacts/{artifact_id}:download"
+    assert repeated.headers["accept-ranges"] == "bytes"
+    # Assert generation slots are released
+    assert client.app.state.admission.metrics()["active"] == 0
+
+
+@pytest.mark.parametrize("patch_fields_url", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("patch_cookiecutter", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
+@pytest.mark.parametrize("body", [{"text_field": "Some text"}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_200_timing(response, client, template_uuid):
+    """Tests the generation phases are timed and aggregated."""
+    # Assert response is valid
+    assert response.status_code == 200
+    # Assert header is valid
+    phases = [x.split(";")[0] for x in response.headers["server-timing"].split(", ")]
+    assert phases[0] == "template" and phases[-1] == "total"
+    assert "checkout" in phases
+    # Assert histograms include the generation
+    histograms = client.app.state.latencies.snapshot(template_uuid)
+    assert {"template", "checkout", "arguments", "lookup"} <= {x["phase"] for x in histograms}
+    assert all(x["count"] == x["buckets"]["+Inf"] for x in histograms)
+
+
+@pytest.mark.parametrize("client", [{"render_processes": 0}], indirect=True)
+@pytest.mark.parametrize("patch_fields_url", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("patch_cookiecutter", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
+@pytest.mark.parametrize("body", [{"text_field": "Some text"}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_200_compiled_cache(response, client, template_uuid, headers):
+    """Tests other options render from the compiled template."""
+    # Assert response is valid
+    assert response.status_code == 200
+    # Assert new options reuse the compiled template
+    for _ in range(2):
+        body = {"text_field": f"Text {uuid.uuid4().hex}"}  # Not in artifact store
+        assert client.post(f"/api/v1/project/{template_uuid}:generate", json=body, headers=headers).status_code == 200
+    assert client.app.state.renderer.metrics()["hits"] >= 1
+
+
+@pytest.mark.parametrize("patch_fields_url", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("patch_cookiecutter", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
+@pytest.mark.parametrize("body", [{"text_field": "Some text"}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+@pytest.mark.parametrize("archive_format", ["tar.gz", "tar.zst"])
+def test_200_tar_format(response, client, template_uuid, body, headers, archive_format):
+    """Tests the project is returned in the requested tar format."""
+    # Assert response is valid
+    url = f"/api/v1/project/{template_uuid}:generate?archive_format={archive_format}"
+    response = client.post(url, json=body, headers=headers)
+    assert response.status_code == 200
+    # Assert header is valid
+    assert response.headers["content-disposition"] == f'attachment; filename="project.{archive_format}"'
+    # Assert template in response is valid
+    sub_folder = f"{body['text_field'].lower().replace(' ', '_')}_project"
+    content = response.content
+    if archive_format == "tar.zst":
+        content = zstandard.ZstdDecompressor().decompressobj().decompress(content)
+    with tarfile.open(fileobj=io.BytesIO(content), mode="r:*") as archive:
+        config = tomllib.load(archive.extractfile(f"{sub_folder}/template_file.toml"))
+    assert config["text_field"] == body["text_field"]
+
+
+@pytest.mark.parametrize("patch_fields_url", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("patch_cookiecutter", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
+@pytest.mark.parametrize("body", [{"text_field": "Some text"}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_200_accept_header(response, client, template_uuid, body, headers):
+    """Tests the archive format is negotiated from the Accept header."""
+    # Assert response is valid
+    accept = "application/zip;q=0.5, application/gzip"
+    response = client.post(f"/api/v1/project/{template_uuid}:generate", json=body, headers={**headers, "Accept": accept})
+    assert response.status_code == 200
+    # Assert header is valid
+    assert response.headers["content-type"] == "application/gzip"
+    assert response.headers["vary"] == "Accept"
+    with tarfile.open(fileobj=io.BytesIO(response.content), mode="r:gz") as archive:
+        assert archive.getnames()
+
+
+@pytest.mark.parametrize("patch_fields_url", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("patch_cookiecutter", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
+@pytest.mark.parametrize("body", [{"text_field": "Some text"}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+@pytest.mark.parametrize(
+    "accept, media_type",
+    [
+        ("application/gzip;q=abc", "application/zip"),
+        ("application/gzip;q=abc, application/zstd;q=0.5", "application/zstd"),
+        ("application/gzip;q=0", "application/zip"),
+        ("application/gzip;q=0, application/zstd;q=0.1", "application/zstd"),
+    ],
+)
+def test_200_accept_ignored(response, client, template_uuid, body, headers, accept, media_type):
+    """Tests Accept ranges with quality 0 or not valid are ignored."""
+    # Assert response is valid
+    response = client.post(f"/api/v1/project/{template_uuid}:generate", json=body, headers={**headers, "Accept": accept})
+    assert response.status_code == 200
+    # Assert header is valid
+    assert response.headers["content-type"] == media_type
+
+
+@pytest.mark.parametrize("patch_fields_url", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("patch_cookiecutter", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
+@pytest.mark.parametrize("body", [{"text_field": "Some text"}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_200_store_format(response, client, template_uuid, body, headers):
+    """Tests the store format returns an uncompressed zip file."""
+    # Assert response is valid
+    url = f"/api/v1/project/{template_uuid}:generate?archive_format=store"
+    response = client.post(url, json=body, headers=headers)
+    assert response.status_code == 200
+    # Assert header is valid
+    assert response.headers["content-type"] == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(response.content), "r") as archive:
+        assert archive.testzip() is None
+        assert all(x.compress_type == zipfile.ZIP_STORED for x in archive.infolist())
+
+
 @pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
 @pytest.mark.parametrize("body", [{"text_field": "Some text"}], indirect=True)
 @pytest.mark.parametrize("authorization_bearer", ["bad-token", None], indirect=True)
@@ -117,6 +263,20 @@ def test_422_no_body(response):
     assert "Input should be a valid UUID" in message["detail"][0]["msg"]
 
 
+@pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
+@pytest.mark.parametrize("body", [{"text_field": "Some text"}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+@pytest.mark.parametrize("query", ["archive_format=rar", "compression_level=10"])
+def test_422_bad_archive(response, client, template_uuid, body, headers, query):
+    """Tests the response status code is 422 for unknown archive options."""
+    # Assert response is valid
+    response = client.post(f"/api/v1/project/{template_uuid}:generate?{query}", json=body, headers=headers)
+    assert response.status_code == 422
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["loc"] == ["query", query.split("=")[0]]
+
+
 @pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
 @pytest.mark.parametrize("body", [{"text_field": "% Command %"}, {"text_field": "{ Field }"}], indirect=True)
 @pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
@@ -163,6 +323,37 @@ def test_422_hook_failed(response):
     assert "Hook fail message" in message["detail"][0]["msg"]
 
 
+@pytest.mark.parametrize("client", [{"admission_active": 0, "admission_queue": 0}], indirect=True)
+@pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
+@pytest.mark.parametrize("body", [{"text_field": "Some text"}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_429_queue_full(response, client):
+    """Tests the response status code is 429 when no slot can be queued."""
+    # Assert response is valid
+    assert response.status_code == 429
+    # Assert header is valid
+    assert response.headers["Retry-After"] == "5"
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "too_many_requests"
+    assert message["detail"][0]["loc"] == ["server"]
+    assert "Too many generation requests" in message["detail"][0]["msg"]
+    # Assert rejection is counted
+    assert client.app.state.admission.metrics()["rejected"] == 1
+
+
+@pytest.mark.parametrize("client", [{"admission_active": 0, "admission_timeout": 0}], indirect=True)
+@pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
+@pytest.mark.parametrize("body", [{"text_field": "Some text"}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_429_wait_timeout(response):
+    """Tests the response status code is 429 when no slot frees in time."""
+    # Assert response is valid
+    assert response.status_code == 429
+    # Assert header is valid
+    assert response.headers["Retry-After"] == "5"
+
+
 @pytest.mark.parametrize("patch_fields_url", ["cookiecutter_1"], indirect=True)
 @pytest.mark.parametrize("patch_session", [Exception("error")], indirect=True)
 @pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
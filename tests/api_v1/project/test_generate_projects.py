@@ -0,0 +1,93 @@
+"""Tests for the batch generate projects API endpoint."""
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+import io
+import tomllib
+import zipfile
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def response(client, patch_session, template_uuid, headers, body):
+    """Performs a POST request to generate project variants."""
+    response = client.post(f"/api/v1/project/{template_uuid}:batch", json=body, headers=headers)
+    return response
+
+
+@pytest.mark.parametrize("patch_fields_url", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("patch_cookiecutter", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
+@pytest.mark.parametrize("body", [[{"text_field": "Some text"}, {"text_field": "Other text", "checkbox_field": "false"}]], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_200_ok(response, body):
+    """Tests the response status code is 200 and valid."""
+    # Assert response is valid
+    assert response.status_code == 200
+    # Assert header is valid
+    assert response.headers["content-type"] == "application/zip"
+    # Assert each variant in response is valid
+    with zipfile.ZipFile(io.BytesIO(response.content), "r") as archive:
+        for index, options in enumerate(body, start=1):
+            sub_folder = f"variant_{index}/{options['text_field'].lower().replace(' ', '_')}_project"
+            with archive.open(f"{sub_folder}/template_file.toml") as file:
+                config = tomllib.load(file)
+            assert config["text_field"] == options["text_field"]
+            assert ("checkbox_field" in config) == ("checkbox_field" not in options)
+
+
+@pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
+@pytest.mark.parametrize("body", [[{"text_field": "Some text"}]], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["bad-token", None], indirect=True)
+def test_401_unauthorized(response):
+    """Tests the response status code is 401 and valid."""
+    # Assert response is valid
+    assert response.status_code == 401
+    # Assert header is valid
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "authentication"
+    assert message["detail"][0]["loc"] == ["header", "bearer"]
+    assert "Not authenticated" in message["detail"][0]["msg"]
+
+
+@pytest.mark.parametrize("template_uuid", ["unknown"], indirect=True)
+@pytest.mark.parametrize("body", [[{"text_field": "Some text"}]], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_404_not_found(response):
+    """Tests the response status code is 404 and valid."""
+    # Assert response is valid
+    assert response.status_code == 404
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "not_found"
+    assert message["detail"][0]["loc"] == ["path", "uuid"]
+    assert "Template not found" in message["detail"][0]["msg"]
+
+
+@pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
+@pytest.mark.parametrize("body", [[]], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_422_no_variants(response):
+    """Tests the response status code is 422 and valid."""
+    # Assert response is valid
+    assert response.status_code == 422
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "too_short"
+    assert message["detail"][0]["loc"] == ["body"]
+
+
+@pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
+@pytest.mark.parametrize("body", [[{"text_field": "Some text"}, {"text_field": "{ Field }"}]], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_422_unsafe_characters(response):
+    """Tests the response status code is 422 and valid."""
+    # Assert response is valid
+    assert response.status_code == 422
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "value_error"
+    assert message["detail"][0]["loc"] == ["body", 1, "text_field"]
+    assert "contains unsafe characters" in message["detail"][0]["msg"]
@@ -0,0 +1,170 @@
+"""Tests for the submit project API endpoint."""
+# pylint: disable=redefined-outer-name
+# pylint: disable=unused-argument
+import io
+import os
+import tempfile
+import time
+import tomllib
+import zipfile
+
+import pytest
+
+from app import models
+
+ARTIFACTS_PATH = os.path.join(tempfile.gettempdir(), "artifacts-over-size")
+
+
+@pytest.fixture(scope="module")
+def response(client, patch_session, template_uuid, headers, body):
+    """Performs a POST request to submit a generation job."""
+    response = client.post(f"/api/v1/project/{template_uuid}:submit", json=body, headers=headers)
+    return response
+
+
+@pytest.fixture(scope="module")
+def finished_job(client, response, headers):
+    """Polls the submitted job until it is finished."""
+    for _ in range(300):
+        job = client.get(response.headers["Location"], headers=headers).json()
+        if job["finished"]:
+            return job
+        time.sleep(0.1)
+    raise TimeoutError("Job did not finish")
+
+
+@pytest.mark.parametrize("patch_fields_url", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("patch_cookiecutter", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
+@pytest.mark.parametrize("body", [{"text_field": "Submitted text"}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_202_accepted(response):
+    """Tests the response status code is 202 and valid."""
+    # Assert response is valid
+    assert response.status_code == 202
+    # Assert job in response is valid
+    job = response.json()
+    assert response.headers["Location"] == f"/api/v1/jobs/{job['id']}"
+    assert job["status"] in ("queued", "running", "done")
+    assert job["created"] is not None
+
+
+@pytest.mark.parametrize("patch_fields_url", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("patch_cookiecutter", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
+@pytest.mark.parametrize("body", [{"text_field": "Submitted text"}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_200_download(client, finished_job, headers, body):
+    """Tests the finished job can be downloaded as project zip."""
+    # Assert job is valid
+    assert finished_job["status"] == "done"
+    assert finished_job["started"] <= finished_job["finished"] < finished_job["expires"]
+    # Assert download is valid
+    download = client.get(f"/api/v1/jobs/{finished_job['id']}:download", headers=headers)
+    assert download.status_code == 200
+    assert download.headers["content-type"] == "application/zip"
+    sub_folder = f"{body['text_field'].lower().replace(' ', '_')}_project"
+    with zipfile.ZipFile(io.BytesIO(download.content), "r") as archive:
+        with archive.open(f"{sub_folder}/template_file.toml") as file:
+            config = tomllib.load(file)
+    assert config["text_field"] == body["text_field"]
+
+
+@pytest.mark.parametrize("client", [{"artifacts_path": ARTIFACTS_PATH, "artifacts_size": 0, "artifacts_retention": 0}], indirect=True)
+@pytest.mark.parametrize("patch_fields_url", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("patch_cookiecutter", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
+@pytest.mark.parametrize("body", [{"text_field": "Pinned text"}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_200_download_over_size(client, finished_job, headers):
+    """Tests the job result is not evicted from a full store before the job expires."""
+    # Assert job is valid
+    assert finished_job["status"] == "done"
+    # Assert result is kept after other artifacts are evicted
+    client.app.state.artifacts.evict()
+    download = client.get(f"/api/v1/jobs/{finished_job['id']}:download", headers=headers)
+    assert download.status_code == 200
+    assert download.headers["content-type"] == "application/zip"
+
+
+@pytest.mark.parametrize("patch_fields_url", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("patch_cookiecutter", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_202_default_checkout(client, sql_session, template_uuid, headers):
+    """Tests a template without gitCheckout is submitted and built."""
+    template = sql_session.get(models.Template, template_uuid)
+    git_checkout, template.gitCheckout = template.gitCheckout, None
+    try:
+        response = client.post(f"/api/v1/project/{template_uuid}:submit", json={"text_field": "Default checkout"}, headers=headers)
+    finally:
+        template.gitCheckout = git_checkout
+    # Assert response is valid
+    assert response.status_code == 202
+    # Assert job is built from the default branch
+    for _ in range(300):
+        job = client.get(response.headers["Location"], headers=headers).json()
+        if job["finished"]:
+            break
+        time.sleep(0.1)
+    assert job["status"] == "done"
+
+
+@pytest.mark.parametrize("patch_fields_url", ["cookiecutter_1"], indirect=True)
+@pytest.mark.parametrize("patch_cookiecutter", ["repository_down"], indirect=True)
+@pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
+@pytest.mark.parametrize("body", [{"text_field": "Submitted text"}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_200_failed(client, finished_job, headers):
+    """Tests the failed job reports the error and has no download."""
+    # Assert job is valid
+    assert finished_job["status"] == "failed"
+    assert "repository_down" in finished_job["error"]
+    # Assert download is not available
+    download = client.get(f"/api/v1/jobs/{finished_job['id']}:download", headers=headers)
+    assert download.status_code == 404
+    assert "Job result not available" in download.json()["detail"][0]["msg"]
+
+
+@pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
+@pytest.mark.parametrize("body", [{"text_field": "Some text"}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["bad-token", None], indirect=True)
+def test_401_unauthorized(response):
+    """Tests the response status code is 401 and valid."""
+    # Assert response is valid
+    assert response.status_code == 401
+    # Assert header is valid
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "authentication"
+    assert message["detail"][0]["loc"] == ["header", "bearer"]
+    assert "Not authenticated" in message["detail"][0]["msg"]
+
+
+@pytest.mark.parametrize("template_uuid", ["unknown"], indirect=True)
+@pytest.mark.parametrize("body", [{"text_field": "Some text"}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_404_not_found(response):
+    """Tests the response status code is 404 and valid."""
+    # Assert response is valid
+    assert response.status_code == 404
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "not_found"
+    assert message["detail"][0]["loc"] == ["path", "uuid"]
+    assert "Template not found" in message["detail"][0]["msg"]
+
+
+@pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
+@pytest.mark.parametrize("body", [{"text_field": "% Command %"}], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_1-token"], indirect=True)
+def test_422_unsafe_characters(response):
+    """Tests the response status code is 422 and valid."""
+    # Assert response is valid
+    assert response.status_code == 422
+    # Assert message is valid
+    message = response.json()
+    assert message["detail"][0]["type"] == "value_error"
+    assert message["detail"][0]["loc"] == ["body", "text_field"]
+    assert "contains unsafe characters" in message["detail"][0]["msg"]
@@ -1,6 +1,8 @@
 """Tests for GET /api/v1/templates/{uuid} endpoint."""
 # pylint: disable=redefined-outer-name
 # pylint: disable=unused-argument
+from unittest.mock import patch
+
 import pytest
 
 
@@ -29,6 +31,21 @@ def test_200_ok(response):
     assert message["gitCheckout"] == "main"
 
 
+@pytest.mark.parametrize("template_uuid", ["uuid_1"], indirect=True)
+def test_304_not_modified(response, client, sql_session, template_uuid):
+    """Tests a cached template is revalidated without a database query."""
+    # Assert response has caching headers
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('W/"')
+    assert response.headers["Cache-Control"] == "public, no-cache"
+    # Assert revalidation does not query the database
+    headers = {"If-None-Match": f'"other", {response.headers["ETag"]}'}
+    with patch.object(sql_session, "get", side_effect=Exception("error")):
+        repeated = client.get(f"/api/v1/templates/{template_uuid}", headers=headers)
+    assert repeated.status_code == 304
+    assert repeated.content == b""
+
+
 @pytest.mark.parametrize("template_uuid", ["unknown"], indirect=True)
 def test_404_not_found(response):
     """Tests the response status code is 404 and valid."""
@@ -1,8 +1,14 @@
 """Tests for the list templates endpoint."""
 # pylint: disable=redefined-outer-name
 # pylint: disable=unused-argument
+from unittest.mock import patch
+
 import pytest
 
+from app import catalog, models, utils
+
+UUID_1 = "bced037a-a326-425d-aa03-5d3cbc9aa3d1"
+
 
 @pytest.fixture(scope="module")
 def response(client, patch_session, query, headers):
@@ -19,6 +25,22 @@ def test_200_ok_all(response):
     assert len(response.json()) == 7
 
 
+@pytest.mark.parametrize("query", [{"tags": ["python"]}], indirect=True)
+def test_304_not_modified(response, client, sql_session, query):
+    """Tests a cached listing is revalidated without a database query."""
+    # Assert response has caching headers
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('W/"')
+    assert response.headers["Cache-Control"] == "public, no-cache"
+    # Assert revalidation does not query the database
+    headers = {"If-None-Match": response.headers["ETag"]}
+    with patch.object(sql_session, "query", side_effect=Exception("error")):
+        repeated = client.get("/api/v1/templates/", params=query, headers=headers)
+    assert repeated.status_code == 304
+    assert repeated.content == b""
+    assert repeated.headers["ETag"] == response.headers["ETag"]
+
+
 @pytest.mark.parametrize("query", [{"sort_by": "-score"}, {}], indirect=True)
 def test_200_score_desc(response):
     """Tests the response status code is 200 and valid."""
@@ -71,6 +93,151 @@ def test_200_keywords(response):
     assert templates[1]["title"] == "My Template 4"
 
 
+@pytest.mark.parametrize("query", [{"sort_by": x} for x in ("-score", "+score,+title", "-title", "+id", "-id,+score", "-score,-title,+id")], indirect=True)
+def test_200_pages(response, client, query):
+    """Tests following the next links returns every template once in order."""
+    # Assert all pages but last have a link to the next one
+    templates, next_url, params = [], "/api/v1/templates/", {**query, "limit": 2}
+    while next_url:
+        page = client.get(next_url, params=params)
+        assert page.status_code == 200
+        assert len(page.json()) == 2 or "Link" not in page.headers
+        templates.extend(page.json())
+        next_url, params = page.links.get("next", {}).get("url"), None
+    # Assert pages match the unpaginated list
+    assert [x["id"] for x in templates] == [x["id"] for x in response.json()]
+
+
+@pytest.mark.parametrize("client", [{}], indirect=True)
+@pytest.mark.parametrize("query", [{"sort_by": "-score", "limit": 3}], indirect=True)
+def test_200_pages_after_rating(response, client, query, sql_session):
+    """Tests a cursor is not shifted by templates rated after the page."""
+    # Assert next page starts after last template even if it changed score
+    first = response.json()
+    sql_session.get(models.Template, first[0]["id"]).score = 0.5
+    sql_session.flush()
+    client.app.state.catalog.bump()  # As done by a rating
+    page = client.get(response.links["next"]["url"])
+    assert page.status_code == 200
+    assert first[-1]["id"] not in [x["id"] for x in page.json()]
+    assert [x["score"] for x in page.json()] == [None, None, None]
+
+
+@pytest.mark.parametrize("client", [{}], indirect=True)
+@pytest.mark.parametrize("query", [{"sort_by": "-score"}], indirect=True)
+def test_200_snapshot(response, client, sql_session, query):
+    """Tests listings are served from the snapshot until the catalog changes."""
+    # Assert repeated listing does not query the database
+    with patch.object(sql_session, "execute", side_effect=Exception("error")):
+        repeated = client.get("/api/v1/templates/", params=query)
+    assert repeated.status_code == 200
+    assert repeated.json() == response.json()
+    # Assert snapshot is rebuilt when the catalog changes
+    sql_session.get(models.Template, response.json()[-1]["id"]).score = 5.0
+    sql_session.flush()
+    client.app.state.catalog.bump()
+    changed = client.get("/api/v1/templates/", params=query)
+    assert [x["score"] for x in changed.json()[:3]] == [5.0, 5.0, 4.5]
+
+
+@pytest.mark.parametrize("client", [{}], indirect=True)
+@pytest.mark.parametrize("query", [{"sort_by": "+title,-score", "limit": 2}, {"sort_by": "-relevance", "limit": 2}], indirect=True)
+def test_200_sort_not_prebuilt(response, client, query):
+    """Tests sort orders other than the prebuilt ones are not kept."""
+    assert response.status_code == 200
+    page = client.get(response.links["next"]["url"])
+    assert page.status_code == 200
+    # Assert snapshot only keeps the prebuilt sort orders
+    snapshot = client.app.state.catalog.snapshot(None)
+    assert set(snapshot._orders) == catalog.PREBUILT_KEYS  # pylint: disable=protected-access
+
+
+@pytest.mark.parametrize("query", [{"sort_by": "+title", "next": utils.encode_cursor("+title", ["My Template 25", UUID_1])}], indirect=True)
+def test_200_cursor_title_removed(response):
+    """Tests a cursor of a title no longer in the catalog keeps its place."""
+    assert response.status_code == 200
+    assert [x["title"] for x in response.json()] == ["My Template 3", "My Template 4"]
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        {"sort_by": "+id", "next": utils.encode_cursor("+id", ["x"])},
+        {"sort_by": "+id", "next": utils.encode_cursor("+id", [1])},
+        {"sort_by": "-score", "next": utils.encode_cursor("-score", ["high", UUID_1])},
+        {"sort_by": "-score", "next": utils.encode_cursor("-score", [True, UUID_1])},
+        {"sort_by": "+title", "next": utils.encode_cursor("+title", [1, UUID_1])},
+        {"sort_by": "+title", "next": utils.encode_cursor("+title", ["My Template 1", None])},
+    ],
+    indirect=True,
+)
+def test_422_cursor_values(response):
+    """Tests a cursor with values not matching the sort fields is rejected."""
+    assert response.status_code == 422
+    message = response.json()
+    assert message["detail"][0]["type"] == "value_error"
+    assert message["detail"][0]["loc"] == ["query", "next"]
+    assert "Invalid cursor" in message["detail"][0]["msg"]
+
+
+@pytest.mark.parametrize("query", [{"limit": 2, "next": "bad_cursor"}], indirect=True)
+def test_422_bad_cursor(response):
+    """Tests the response status code is 422 and valid."""
+    assert response.status_code == 422
+    message = response.json()
+    assert message["detail"][0]["type"] == "value_error"
+    assert message["detail"][0]["loc"] == ["query", "next"]
+    assert "Invalid cursor" in message["detail"][0]["msg"]
+
+
+@pytest.mark.parametrize("query", [{"sort_by": "+title", "limit": 2}], indirect=True)
+def test_422_cursor_other_sort(response, client):
+    """Tests a cursor is only valid for the sort it was returned with."""
+    cursor = response.links["next"]["url"].split("next=")[1]
+    page = client.get("/api/v1/templates/", params={"sort_by": "-title", "next": cursor})
+    assert page.status_code == 422
+    message = page.json()
+    assert message["detail"][0]["loc"] == ["query", "next"]
+    assert "different sort_by" in message["detail"][0]["msg"]
+
+
+@pytest.mark.parametrize("query", [{"keywords": ["templ", "EXAMPLE"]}, {"keywords": ["template example"]}], indirect=True)
+def test_200_keywords_prefix(response):
+    """Tests keywords match the beginning of words and in sequence."""
+    assert response.status_code == 200
+    templates = sorted(response.json(), key=lambda x: x["title"])
+    assert [x["title"] for x in templates] == ["My Template 3", "My Template 4"]
+
+
+@pytest.mark.parametrize("query", [{"keywords": ["plate"]}, {"keywords": ["example template"]}, {"keywords": ["templ example"]}], indirect=True)
+def test_200_keywords_inside_word(response):
+    """Tests keywords do not match text inside or after other words."""
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+@pytest.mark.parametrize("query", [{"keywords": ["template"], "sort_by": "-relevance"}], indirect=True)
+def test_200_relevance(response):
+    """Tests templates are ranked by keywords in title and summary."""
+    assert response.status_code == 200
+    titles = [x["title"] for x in response.json()]
+    assert len(titles) == 7
+    assert set(titles[:2]) == {"My Template 3", "My Template 4"}  # Title and summary
+    assert set(titles[2:4]) == {"My Template 1", "My Template 2"}  # Title
+    assert all(x.startswith("DEEP-HDC") for x in titles[4:])  # Summary
+
+
+@pytest.mark.parametrize("query", [{"keywords": ["template"], "sort_by": "-relevance,+title"}], indirect=True)
+def test_200_relevance_pages(response, client, query):
+    """Tests following the next links of a ranked search."""
+    templates, next_url, params = [], "/api/v1/templates/", {**query, "limit": 3}
+    while next_url:
+        page = client.get(next_url, params=params)
+        templates.extend(page.json())
+        next_url, params = page.links.get("next", {}).get("url"), None
+    assert [x["id"] for x in templates] == [x["id"] for x in response.json()]
+
+
 @pytest.mark.parametrize("query", [{"sort_by": "bad_sort"}], indirect=True)
 def test_422_bad_sortby(response):
     """Tests the response status code is 422 and valid."""
@@ -81,6 +248,26 @@ def test_422_bad_sortby(response):
     assert "Value error, Invalid sort by option" in message["detail"][0]["msg"]
 
 
+@pytest.mark.parametrize("query", [{"sort_by": "+id,-id"}, {"sort_by": "-score,+title,+score"}], indirect=True)
+def test_422_repeated_sortby(response):
+    """Tests a sort by with a field more than once is rejected."""
+    assert response.status_code == 422
+    message = response.json()
+    assert message["detail"][0]["type"] == "value_error"
+    assert message["detail"][0]["loc"] == ["query", "sort_by"]
+    assert "Value error, Repeated sort by field" in message["detail"][0]["msg"]
+
+
+@pytest.mark.parametrize("query", [{"keywords": ["-"]}, {"keywords": ["template", "++"]}], indirect=True)
+def test_422_keywords_without_words(response):
+    """Tests keywords without words to search are rejected, not ignored."""
+    assert response.status_code == 422
+    message = response.json()
+    assert message["detail"][0]["type"] == "value_error"
+    assert message["detail"][0]["loc"][:2] == ["query", "keywords"]
+    assert "has no words to search" in message["detail"][0]["msg"]
+
+
 @pytest.mark.parametrize("patch_session", [Exception("error")], indirect=True)
 def test_500_database_error(response):
     """Tests the response status code is 500 and valid."""
@@ -1,6 +1,8 @@
 """Tests for rate_template API endpoint."""
 # pylint: disable=redefined-outer-name
 # pylint: disable=unused-argument
+from unittest.mock import patch
+
 import pytest
 
 
@@ -53,6 +55,23 @@ def test_201_created_by_user_1(response):
     assert message["score"] == 1.0
 
 
+@pytest.mark.parametrize("template_uuid", ["uuid_4"], indirect=True)
+@pytest.mark.parametrize("authorization_bearer", ["user_2-token"], indirect=True)
+def test_201_catalog_changed(client, patch_session, sql_session, template_uuid, headers):
+    """Tests a rating changes the ETag of the cached responses."""
+    # Assert cached template is not valid after rating
+    cached = client.get(f"/api/v1/templates/{template_uuid}")
+    response = client.put(f"/api/v1/templates/{template_uuid}/score", content="2", headers=headers)
+    assert response.status_code == 201
+    headers = {"If-None-Match": cached.headers["ETag"]}
+    with patch.object(sql_session, "execute", side_effect=Exception("error")):
+        repeated = client.get(f"/api/v1/templates/{template_uuid}", headers=headers)
+    assert repeated.status_code == 200
+    assert repeated.headers["ETag"] != cached.headers["ETag"]
+    # Assert score is patched into the snapshot without building it again
+    assert repeated.json()["score"] == response.json()["score"]
+
+
 @pytest.mark.parametrize("template_uuid", ["uuid_4"], indirect=True)
 @pytest.mark.parametrize("body", ["1"], indirect=True)
 @pytest.mark.parametrize("authorization_bearer", ["new_user-token"], indirect=True)
@@ -0,0 +1,84 @@
+"""Tests for the archive writers."""
+
+# pylint: disable=redefined-outer-name
+import io
+import stat
+import zipfile
+
+import pytest
+
+from app import archives
+
+FILE_MODE = stat.S_IFREG | 0o644
+
+
+@pytest.fixture(scope="module")
+def files():
+    """Returns a file map with files around the parallel deflate size limit."""
+    limit = archives.PARALLEL_MAX_SIZE
+    return {
+        "project": (None, stat.S_IFDIR | 0o755),
+        "project/empty.txt": (b"", FILE_MODE),
+        "project/small.txt": (b"Some text\n" * 100, FILE_MODE),
+        "project/script.sh": (b"#!/bin/sh\necho text\n", stat.S_IFREG | 0o755),
+        "project/data/limit.csv": (b"a,b,c\n" * (limit // 6) + b"\n" * (limit % 6), FILE_MODE),
+        "project/data/over.csv": (b"a,b,c\n" * (limit // 6) + b"\n" * (limit % 6 + 1), FILE_MODE),
+        "project/data": (None, stat.S_IFDIR | 0o755),
+    }
+
+
+@pytest.fixture
+def deflater(request):
+    """Returns a deflate pool shut down after the test."""
+    window = request.param if hasattr(request, "param") else 256 * 1024**2
+    deflater = archives.Deflater(2, window)
+    yield deflater
+    deflater.shutdown()
+
+
+def write_zip(files, level=None, deflater=None):
+    """Returns the zip archive of the file map."""
+    return b"".join(archives.stream(archives.memory_entries(files), archives.ArchiveFormat.ZIP, level, deflater))
+
+
+def members(data):
+    """Returns the zip entries attributes and contents."""
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.testzip() is None
+        attributes = ("filename", "date_time", "compress_type", "CRC", "compress_size", "file_size", "external_attr")
+        return [({k: getattr(x, k) for k in attributes}, archive.read(x)) for x in archive.infolist()]
+
+
+@pytest.mark.parametrize("level", [None, 1, 9])
+def test_parallel_same_as_serial(files, deflater, level):
+    """Tests entries deflated in parallel are valid and the same as the
+    entries written while read, at and over the parallel size limit.
+    """
+    parallel = write_zip(files, level, deflater)
+    # Assert archive is valid and deterministic
+    assert parallel == write_zip(files, level, deflater)
+    # Assert entries are the same as without parallel deflate
+    serial = write_zip(files, level)
+    assert members(parallel) == members(serial)
+    # Assert entries deflated in parallel have no data descriptor
+    with zipfile.ZipFile(io.BytesIO(parallel)) as archive:
+        flags = {x.filename: x.flag_bits & 0x08 for x in archive.infolist()}
+    assert flags["project/data/limit.csv"] == flags["project/empty.txt"] == 0
+    assert flags["project/data/over.csv"] == 0x08
+
+
+@pytest.mark.parametrize("deflater", [0], indirect=True)
+def test_parallel_window(files, deflater):
+    """Tests each entry is written before the next is deflated when the
+    window is smaller than the files.
+    """
+    submitted = []
+    submit = deflater.submit
+    deflater.submit = lambda chunks, level: submitted.append(chunks) or submit(chunks, level)
+    chunks = archives.stream(archives.memory_entries(files), archives.ArchiveFormat.ZIP, None, deflater)
+    # Assert no entry is deflated before the archive is read
+    assert not submitted
+    first = next(chunks)
+    # Assert only the empty file and the next one are deflated ahead
+    assert [b"".join(x()) for x in submitted] == [b"", files["project/script.sh"][0]]
+    assert members(first + b"".join(chunks)) == members(write_zip(files))
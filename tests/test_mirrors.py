@@ -0,0 +1,138 @@
+"""Tests for the template mirrors cache."""
+
+# pylint: disable=redefined-outer-name
+# pylint: disable=protected-access
+import os
+
+import git
+import pytest
+from cookiecutter.exceptions import RepositoryCloneFailed
+
+from app.mirrors import MirrorCache
+
+
+@pytest.fixture
+def origin(tmp_path):
+    """Returns a bare repository with a commit on the main and dev branches."""
+    work = git.Repo.init(tmp_path / "work", initial_branch="main")
+    with work.config_writer() as config:
+        config.set_value("user", "name", "Tester")
+        config.set_value("user", "email", "tester@example.com")
+    commit(work, "picture.bin", os.urandom(64 * 1024).hex())  # Not compressed
+    commit(work, "cookiecutter.json", '{"project_name": "main"}')
+    work.git.branch("dev")
+    origin = git.Repo.init(tmp_path / "origin.git", bare=True, initial_branch="main")
+    work.create_remote("origin", origin.working_dir).push(["main", "dev"])
+    return work
+
+
+@pytest.fixture
+def mirrors(request, tmp_path):
+    """Returns a mirror cache in a temporary folder."""
+    ttl, max_size = request.param if hasattr(request, "param") else (300, 2 * 1024**3)
+    return MirrorCache(f"{tmp_path / 'mirrors'}", ttl, max_size)
+
+
+def commit(work, name, content):
+    """Commits a file in the work repository and returns the commit sha."""
+    with open(f"{work.working_tree_dir}/{name}", "w", encoding="utf-8") as file:
+        file.write(content)
+    work.index.add([name])
+    return work.index.commit(f"Update {name}").hexsha
+
+
+def wait(mirrors):
+    """Waits for the background tasks of the mirror cache to finish."""
+    mirrors._executor.submit(lambda: None).result()
+
+
+def link(work):
+    """Returns the gitLink of the bare repository pushed by work."""
+    return work.remote("origin").url
+
+
+def test_first_clone(mirrors, origin):
+    """Tests the first checkout clones the repository at the ref."""
+    with mirrors.checkout(link(origin), "main") as checkout:
+        # Assert checkout is the commit of the ref
+        assert checkout.revision == origin.head.commit.hexsha
+        assert (checkout.path / "cookiecutter.json").read_text(encoding="utf-8") == '{"project_name": "main"}'
+    # Assert clone is reported in the metrics
+    metrics = mirrors.metrics()
+    assert metrics["fetches"] == 1 and metrics["bytes"] > 64 * 1024
+    assert metrics["repositories"] == [{"gitLink": link(origin), **{k: metrics[k] for k in ("fetches", "bytes", "seconds")}}]
+
+
+def test_worktree_per_revision(mirrors, origin):
+    """Tests each ref is a worktree of a single bare repository."""
+    origin.git.checkout("dev")
+    dev = commit(origin, "cookiecutter.json", '{"project_name": "dev"}')
+    origin.remote("origin").push("dev")
+    with mirrors.checkout(link(origin), "main") as main, mirrors.checkout(link(origin), "dev") as checkout:
+        # Assert each ref has its own checkout
+        assert main.path != checkout.path and checkout.revision == dev
+        assert (checkout.path / "cookiecutter.json").read_text(encoding="utf-8") == '{"project_name": "dev"}'
+    # Assert both checkouts are worktrees of the same bare repository
+    repos = list((mirrors.path / "repos").glob("*.git"))
+    assert len(repos) == 1 and len(list((repos[0] / "worktrees").iterdir())) == 2
+
+
+@pytest.mark.parametrize("mirrors", [(0, 2 * 1024**3)], indirect=True)
+def test_incremental_fetch(mirrors, origin):
+    """Tests a refresh only fetches the objects missing in the mirror."""
+    with mirrors.checkout(link(origin), "main"):
+        pass
+    wait(mirrors)
+    before = mirrors.metrics()
+    commit(origin, "cookiecutter.json", '{"project_name": "updated"}')
+    origin.remote("origin").push("main")
+    with mirrors.checkout(link(origin), "main"):
+        pass
+    wait(mirrors)
+    # Assert refresh received the new commit but not the existing files
+    metrics = mirrors.metrics()
+    assert metrics["fetches"] == before["fetches"] + 1
+    assert 0 < metrics["bytes"] - before["bytes"] < 64 * 1024
+    assert metrics["seconds"] > before["seconds"]
+
+
+@pytest.mark.parametrize("mirrors", [(0, 2 * 1024**3)], indirect=True)
+def test_refresh_after_ttl(mirrors, origin):
+    """Tests an expired checkout is refreshed in the background."""
+    with mirrors.checkout(link(origin), "main") as checkout:
+        first = checkout.revision
+    wait(mirrors)
+    updated = commit(origin, "cookiecutter.json", '{"project_name": "updated"}')
+    origin.remote("origin").push("main")
+    # Assert expired checkout is served and refreshed in the background
+    with mirrors.checkout(link(origin), "main") as checkout:
+        assert checkout.revision == first
+    wait(mirrors)
+    with mirrors.checkout(link(origin), "main") as checkout:
+        assert checkout.revision == updated
+        assert (checkout.path / "cookiecutter.json").read_text(encoding="utf-8") == '{"project_name": "updated"}'
+
+
+@pytest.mark.parametrize("mirrors", [(300, 0)], indirect=True)
+def test_eviction(mirrors, origin):
+    """Tests mirrors over the size limit are evicted unless in use."""
+    with mirrors.checkout(link(origin), "main") as checkout:
+        wait(mirrors)
+        # Assert checkout in use is not evicted
+        assert checkout.path.exists()
+    with mirrors.checkout(link(origin), "dev") as checkout:
+        wait(mirrors)
+        # Assert least recently used checkout is evicted
+        entries = [x for x in (mirrors.path / "checkouts").iterdir() if x.is_dir()]
+        assert entries == [checkout.path.parent]
+        # Assert repository with a checkout in use is kept
+        assert len(list((mirrors.path / "repos").glob("*.git"))) == 1
+
+
+def test_clone_failed(mirrors, tmp_path):
+    """Tests a bad link raises RepositoryCloneFailed and leaves no mirror."""
+    with pytest.raises(RepositoryCloneFailed):
+        with mirrors.checkout(f"{tmp_path / 'missing.git'}", "main"):
+            pass
+    # Assert failed checkout is removed
+    assert not [x for x in (mirrors.path / "checkouts").iterdir() if x.is_dir()]
@@ -0,0 +1,37 @@
+"""Tests for the default-options archives prebuilder."""
+
+# pylint: disable=redefined-outer-name
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app.prebuild import Prebuilder
+
+
+@pytest.fixture
+def prebuilder():
+    """Returns a prebuilder with a single worker allowing all templates."""
+    prebuilder = Prebuilder(1, [])
+    yield prebuilder
+    prebuilder.shutdown()
+
+
+def source(git_checkout):
+    """Returns the sources of a template at a gitCheckout."""
+    return SimpleNamespace(id="uuid_1", repoFile="my_template_1.json", gitLink="https://git.example.com/template_1", gitCheckout=git_checkout)
+
+
+def test_dedupe_revision(prebuilder):
+    """Tests builds are scheduled once per template revision."""
+    running, release, built = threading.Event(), threading.Event(), []
+    prebuilder.submit([source("blocker")], lambda x: running.set() or release.wait(5))
+    running.wait(5)
+    # Assert queued build of the same revision is not scheduled again
+    assert prebuilder.submit([source("main")], built.append) == 1
+    assert prebuilder.submit([source("main")], built.append) == 0
+    # Assert queued build of a changed revision is scheduled
+    assert prebuilder.submit([source("dev")], built.append) == 1
+    release.set()
+    prebuilder._executor.shutdown(wait=True)  # pylint: disable=protected-access
+    assert [x.gitCheckout for x in built] == ["main", "dev"]
@@ -0,0 +1,118 @@
+"""Tests for the in-memory rendering of templates."""
+
+# pylint: disable=redefined-outer-name
+import json
+import os
+import pathlib
+import shutil
+
+import pytest
+from cookiecutter.exceptions import EmptyDirNameException, UndefinedVariableInTemplate
+
+from app import rendering
+
+#: Files of the generated template, named as in the template folder
+GENERATED = {
+    "{{ cookiecutter.name }}/crlf.txt": b"{{ cookiecutter.name }}\r\nsecond line\r\n",
+    "{{ cookiecutter.name }}/{{ cookiecutter.empty }}": b"Skipped as the name is empty\n",
+    "{{ cookiecutter.name }}/a/{{ cookiecutter.name }}/nested.txt": b"Nested {{ cookiecutter.name }}\n",
+    "{{ cookiecutter.name }}/raw/{{ cookiecutter.name }}.txt": b"Copied {{ cookiecutter.name }}\n",
+    "{{ cookiecutter.name }}/copied.raw": b"Copied {{ cookiecutter.name }}\n",
+    "{{ cookiecutter.name }}/script.sh": b"#!/bin/sh\necho {{ cookiecutter.name }}\n",
+    "{{ cookiecutter.name }}/picture.bin": bytes(range(256)),
+    "{{ cookiecutter.name }}/docs/readme.txt": b"Docs of {{ cookiecutter.name }}\n",
+    "{{ cookiecutter.name }}/docs/{{ cookiecutter.empty }}": bytes(range(256)),
+}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def template_cache():
+    """Creates the compiled templates cache of the rendering process."""
+    rendering.init_worker(1024**2)
+
+
+@pytest.fixture
+def template_dir(request, tmp_path):
+    """Returns a copy of a template of tests/cookiecutters, or a generated
+    template with the cases rendered differently by cookiecutter.
+    """
+    template_dir = tmp_path / "template"
+    if request.param != "generated":
+        shutil.copytree(f"tests/cookiecutters/{request.param}", template_dir)
+        return f"{template_dir}"
+    context = {"name": "demo", "empty": "", "_copy_without_render": ["*/raw", "*.raw"]}
+    write(template_dir / "cookiecutter.json", json.dumps(context).encode())
+    for name, content in GENERATED.items():
+        write(template_dir / name, content)
+    os.chmod(template_dir / "{{ cookiecutter.name }}/script.sh", 0o755)
+    return f"{template_dir}"
+
+
+def write(path, content):
+    """Writes the content into a file creating its folders."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+
+
+def read_tree(output_dir):
+    """Returns the file map of a folder as returned by render_memory."""
+    files = {}
+    for path, dirs, names in os.walk(output_dir):
+        for name in dirs + names:
+            full_path = os.path.join(path, name)
+            content = None if name in dirs else open(full_path, "rb").read()  # pylint: disable=consider-using-with
+            files[os.path.relpath(full_path, output_dir)] = rendering.RenderedFile(content, os.stat(full_path).st_mode)
+    return files
+
+
+@pytest.mark.parametrize(
+    "template_dir, extra_context",
+    [
+        ("cookiecutter_1", {}),
+        ("cookiecutter_1", {"text_field": "Other Text", "checkbox_field": False}),
+        ("cookiecutter_3", {}),
+        ("generated", {}),
+        ("generated", {"name": "other"}),
+    ],
+    indirect=["template_dir"],
+)
+def test_same_as_cookiecutter(template_dir, tmp_path, extra_context):
+    """Tests memory renders have the paths, bytes and modes of cookiecutter."""
+    output_dir = tmp_path / "output"
+    rendering.render(template_dir, f"{output_dir}", extra_context)
+    files, cached = rendering.render_memory(template_dir, "revision", extra_context)
+    # Assert first render compiles the template
+    assert cached is False
+    assert files == read_tree(output_dir)
+    # Assert render from the compiled template is the same
+    assert rendering.render_memory(template_dir, "revision", extra_context) == (files, True)
+
+
+@pytest.mark.parametrize("template_dir", ["generated"], indirect=True)
+def test_empty_dir_name(template_dir):
+    """Tests an empty project folder name raises EmptyDirNameException."""
+    os.rename(f"{template_dir}/{{{{ cookiecutter.name }}}}", f"{template_dir}/{{{{ cookiecutter.empty }}}}")
+    with pytest.raises(EmptyDirNameException):
+        rendering.render_memory(template_dir, "revision", {})
+
+
+@pytest.mark.parametrize("template_dir", ["generated"], indirect=True)
+def test_undefined_variable(template_dir):
+    """Tests an undefined variable raises UndefinedVariableInTemplate."""
+    write(pathlib.Path(template_dir) / "{{ cookiecutter.name }}/missing.txt", b"{{ cookiecutter.missing }}\n")
+    with pytest.raises(UndefinedVariableInTemplate) as error:
+        rendering.render_memory(template_dir, "revision", {})
+    assert error.value.message == "Unable to create file 'missing.txt'"
+
+
+@pytest.mark.parametrize("template_dir", ["generated"], indirect=True)
+def test_empty_copied_file_name(template_dir):
+    """Tests a copied file with an empty rendered name is skipped, where
+    cookiecutter fails to copy it over its folder.
+    """
+    context = {"name": "demo", "empty": "", "_copy_without_render": ["*/raw", "*.raw", "docs/*"]}
+    write(pathlib.Path(template_dir) / "cookiecutter.json", json.dumps(context).encode())
+    files, _ = rendering.render_memory(template_dir, "revision", {})
+    # Assert folder and its files are kept
+    assert files["demo/docs"] == rendering.RenderedFile(None, rendering.FOLDER_MODE)
+    assert files["demo/docs/readme.txt"].content == b"Docs of {{ cookiecutter.name }}\n"
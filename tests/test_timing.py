@@ -0,0 +1,19 @@
+"""Tests for the timing of generation phases."""
+
+import logging
+import re
+
+from app.timing import Timer
+
+
+def test_log_phases(caplog):
+    """Tests the phase timings are written in the log message."""
+    timer = Timer()
+    with timer.phase("render"):
+        pass
+    timer.phases["archive"] = 0.0125
+    with caplog.at_level(logging.INFO, logger="app.timing"):
+        timer.log("uuid_1")
+    # Assert message has each phase and the total in milliseconds
+    message = caplog.records[-1].getMessage()
+    assert re.fullmatch(r"Generation of template uuid_1 timings: render=\d+\.\d archive=12\.5 total=\d+\.\d", message)